@@ -0,0 +1,150 @@
+"""
+Seeded synthetic colocalization files with the columns
+of Colocalization._IMPORT_COLUMN_NAMES.
+
+    PYTHONPATH=. python benchmark/generate.py out.tsv.gz --rows 1000000 --seed 1
+
+The same seed and row count always give the same file.
+"""
+import argparse
+import gzip
+import io
+import random
+import typing
+
+from finngen_common_data_model.colocalization import Colocalization
+
+SOURCES = ["FINNGEN", "eQTL_catalogue", "GTEx", "UKBB", "FINNGEN_QTL"]
+TISSUES = ["whole_blood", "liver", "adipose_subcutaneous", "brain_cortex", "muscle", "T-cell", "monocyte"]
+QUANTS = ["ge", "exon", "tx", "txrev", "microarray"]
+WORDS = ["disease", "chronic", "acute", "of", "the", "heart", "liver", "kidney", "disorder", "unspecified",
+         "type", "2", "diabetes", "with", "complications", "infection", "syndrome", "primary", "secondary"]
+NON_ASCII = ["é", "ä", "ö", "å", "–", "’", "µ"]
+BASES = "ACGT"
+
+CHROMOSOMES = [str(c) for c in range(1, 23)] + ["X"]
+
+
+class Generator(object):
+    """
+    Rows with realistic shapes:
+
+    credible sets: log normal sizes, mostly under 10 with a
+                   tail of a few hundred, partly overlapping
+    alleles: mostly SNVs, some indels up to 50 bases
+    descriptions: 10 to 200 characters, a few non ascii
+    quant, tissue: empty at na_rate
+    """
+
+    def __init__(self, seed: int = 0, na_rate: float = 0.3, phenotypes: int = 5000):
+        self.random = random.Random(seed)
+        self.na_rate = na_rate
+        self.phenotypes = phenotypes
+
+    def allele(self) -> str:
+        r = self.random
+        length = 1 if r.random() < 0.85 else min(50, int(r.expovariate(0.2)) + 2)
+        return "".join(r.choice(BASES) for _ in range(length))
+
+    def variant(self, chromosome: str, start: int, stop: int) -> str:
+        r = self.random
+        reference = self.allele()
+        alternate = self.allele()
+        while alternate == reference:
+            alternate = self.allele()
+        return "chr{}_{}_{}_{}".format(chromosome, r.randint(start, stop), reference, alternate)
+
+    def description(self, phenotype: int) -> str:
+        # a phenotype always has the same description
+        r = random.Random(phenotype)
+        words = []
+        length = r.randint(10, 200)
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(r.choice(WORDS))
+        if r.random() < 0.05:
+            words.append(r.choice(NON_ASCII))
+        return " ".join(words)
+
+    def optional(self, values: typing.List[str]) -> str:
+        return "" if self.random.random() < self.na_rate else self.random.choice(values)
+
+    def size(self) -> int:
+        return min(500, int(self.random.lognormvariate(1.0, 1.2)) + 1)
+
+    def credible_set(self, variants: typing.List[str]) -> str:
+        r = self.random
+        return ";".join("{},{:.4g},{:.4g}".format(v, r.random(), r.gauss(0, 0.1)) for v in variants)
+
+    def row(self) -> typing.List[str]:
+        r = self.random
+        chromosome = r.choice(CHROMOSOMES)
+        start = r.randint(1, 240000000)
+        stop = start + r.randint(100000, 1500000)
+        size1 = self.size()
+        size2 = self.size()
+        inter = r.randint(0, min(size1, size2))
+        variants = list(dict.fromkeys(self.variant(chromosome, start, stop) for _ in range(size1 + size2 - inter)))
+        cs1 = variants[:size1]
+        cs2 = variants[len(variants) - size2:]
+        phenotype1 = r.randrange(self.phenotypes)
+        phenotype2 = r.randrange(self.phenotypes)
+        return [r.choice(SOURCES),
+                r.choice(SOURCES),
+                "PHENO{}".format(phenotype1),
+                self.description(phenotype1),
+                "ENSG{:011d}".format(phenotype2),
+                self.description(phenotype2),
+                self.optional(QUANTS),
+                self.optional(QUANTS),
+                self.optional(TISSUES),
+                self.optional(TISSUES),
+                self.variant(chromosome, start, stop),
+                self.variant(chromosome, start, stop),
+                chromosome,
+                str(start),
+                str(stop),
+                "{:.6g}".format(r.random()),
+                "{:.6g}".format(r.random()),
+                "",
+                str(len(cs1)),
+                str(len(cs2)),
+                str(len(set(cs1) & set(cs2))),
+                self.credible_set(cs1),
+                self.credible_set(cs2),
+                r.choice(SOURCES)]
+
+    def rows(self, count: int) -> typing.Iterator[typing.List[str]]:
+        for _ in range(count):
+            yield self.row()
+
+
+def write(path: str, rows: int, seed: int = 0, na_rate: float = 0.3) -> str:
+    """
+    Write a file with a header, gzipped if the path ends
+    with .gz.
+
+    :param path: output path
+    :param rows: number of rows
+    :param seed: random seed
+    :param na_rate: fraction of empty optional values
+    :return: path
+    """
+    with open(path, "wb") as raw:
+        if path.endswith(".gz"):
+            # no name or timestamp in the gzip header so files are reproducible
+            raw = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        with io.TextIOWrapper(raw, encoding="utf-8") as out:
+            out.write("\t".join(Colocalization.cvs_column_names()) + "\n")
+            for row in Generator(seed, na_rate).rows(rows):
+                out.write("\t".join(row) + "\n")
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="write a synthetic colocalization file")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--na-rate", type=float, default=0.3)
+    arguments = parser.parse_args()
+    write(arguments.path, arguments.rows, arguments.seed, arguments.na_rate)
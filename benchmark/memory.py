@@ -0,0 +1,86 @@
+"""
+Memory per colocalization of the plain and slotted
+classes.
+
+    PYTHONPATH=. python benchmark/memory.py [rows] [variants]
+
+variants is the size of each credible set, lower it to
+fit a million rows in memory.  Rows are converted to the
+slotted classes as they are parsed so the plain rows are
+never all held at once.  Each measurement runs in a
+forked process.  tracemalloc needs about as much memory
+again as the rows it traces.
+"""
+import multiprocessing
+import sys
+import tracemalloc
+
+import attr
+
+from finngen_common_data_model.colocalization import Colocalization, to_slotted
+from finngen_common_data_model.genomics import interned_variants
+
+
+def row(i: int, variants: int = 10):
+    overlap = variants // 2
+    variants1 = ";".join("{}_{}_A_G,0.01,0.1".format(i % 22 + 1, 1000 * i + j) for j in range(variants))
+    variants2 = ";".join("{}_{}_A_G,0.02,0.2".format(i % 22 + 1, 1000 * i + j)
+                         for j in range(overlap, overlap + variants))
+    return ["source1", "source2",
+            "phenotype{}".format(i % 1000), "description of phenotype {}".format(i % 1000),
+            "phenotype{}".format(i % 777), "description of phenotype {}".format(i % 777),
+            "", "", "tissue1", "tissue2",
+            "{}_{}_A_G".format(i % 22 + 1, 1000 * i), "{}_{}_A_G".format(i % 22 + 1, 1000 * i + 5),
+            str(i % 22 + 1), str(1000 * i), str(1000 * i + 500),
+            "0.5", "0.25", "", "10", "10", "5",
+            variants1, variants2, "source2"]
+
+
+def load(rows: int, slotted: bool, variants: int):
+    memo = {}
+    with interned_variants():
+        if slotted:
+            return [to_slotted(Colocalization.from_list(1, row(i, variants)), memo) for i in range(rows)]
+        return [Colocalization.from_list(1, row(i, variants)) for i in range(rows)]
+
+
+def measure_traced(rows: int, slotted: bool, variants: int = 10) -> float:
+    tracemalloc.start()
+    colocalizations = load(rows, slotted, variants)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del colocalizations
+    return size / rows
+
+
+def measure(rows: int, slotted: bool, variants: int = 10) -> float:
+    # a fresh process per measurement so each starts from an empty heap
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        return pool.apply(measure_traced, (rows, slotted, variants))
+
+
+def measure_objects(make, count: int = 100000) -> float:
+    """
+    Bytes per object, not counting the values it refers to.
+    """
+    tracemalloc.start()
+    objects = [make() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    variants = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    colocalization = Colocalization.from_list(1, row(0, variants))
+    for plain in [colocalization.locus_id1, colocalization.locus, colocalization.variants[0], colocalization]:
+        slotted = to_slotted(plain)
+        print("{} plain {:.0f} bytes slotted {:.0f} bytes".format(type(plain).__name__,
+                                                                  measure_objects(lambda: attr.evolve(plain)),
+                                                                  measure_objects(lambda: attr.evolve(slotted))))
+    plain = measure(rows, False, variants)
+    slotted = measure(rows, True, variants)
+    print("rows {} variants {} plain {:.0f} bytes/row slotted {:.0f} bytes/row ({:.0%})".format(
+        rows, variants, plain, slotted, slotted / plain))
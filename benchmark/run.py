@@ -0,0 +1,232 @@
+"""
+Throughput, latency percentiles and peak memory of the
+parsing and serializing stages on generated files.
+
+    PYTHONPATH=. python benchmark/run.py --rows 1000 100000 --output results.json
+    PYTHONPATH=. python benchmark/run.py --rows 1000 100000 --compare results.json
+
+Files are written by generate.py into --data (kept between
+runs).  Every stage streams the file so memory does not
+grow with the row count, except the memory pass which
+keeps up to --memory-rows colocalizations.  The
+construction stages are run a second time inside
+data.trusted, as <stage>_trusted, to show the cost of the
+attrs validators.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate  # noqa: E402
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization, \
+    read_colocalizations  # noqa: E402
+from finngen_common_data_model.data import trusted  # noqa: E402
+from finngen_common_data_model.genomics import Variant  # noqa: E402
+from finngen_common_data_model.serialize import to_json  # noqa: E402
+
+REL = 1
+COLUMN = {name: i for i, name in enumerate(Colocalization.cvs_column_names())}
+
+
+def colocalization(fields: typing.List[str]) -> Colocalization:
+    return Colocalization.from_list(REL, fields)
+
+
+# stage name, untimed preparation of a row, timed call
+STAGES = [("variant_from_str", lambda fields: fields[COLUMN["locus_id1"]], Variant.from_str),
+          ("causal_variant_from_list",
+           lambda fields: (fields[COLUMN["vars1_info"]], fields[COLUMN["vars2_info"]]),
+           lambda x: CausalVariant.from_list(REL, *x)),
+          ("colocalization_from_list", lambda fields: fields, colocalization),
+          ("json_rep", colocalization, lambda c: c.json_rep()),
+          ("to_json", colocalization, to_json)]
+
+# stages also run without validators
+TRUSTED_STAGES = ("variant_from_str", "causal_variant_from_list", "colocalization_from_list")
+
+
+def all_stages() -> typing.Iterator[typing.Tuple[str, typing.Callable, typing.Callable, typing.Callable]]:
+    """
+    :return: stage name, preparation, call and context to run the stage in
+    """
+    for name, prepare, call in STAGES:
+        yield name, prepare, call, contextlib.nullcontext
+        if name in TRUSTED_STAGES:
+            yield name + "_trusted", prepare, call, trusted
+
+
+def data_file(directory: str, rows: int, seed: int) -> str:
+    path = os.path.join(directory, "colocalization_{}_{}.tsv".format(rows, seed))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        partial = path + ".partial"
+        generate.write(partial, rows, seed)
+        os.replace(partial, path)
+    return path
+
+
+def read_rows(path: str) -> typing.Iterator[typing.List[str]]:
+    with open(path, encoding="utf-8") as handle:
+        handle.readline()
+        for line in handle:
+            yield line.rstrip("\n").split("\t")
+
+
+def summary(latencies: np.ndarray, seconds: float) -> typing.Dict[str, float]:
+    """
+    :param latencies: nanoseconds per call
+    :param seconds: wall clock time of the stage
+    :return: throughput and latency percentiles in microseconds
+    """
+    p50, p90, p99, p999 = np.percentile(latencies, [50, 90, 99, 99.9]) / 1000 if len(latencies) else [0.0] * 4
+    return {"count": len(latencies),
+            "seconds": seconds,
+            "per_second": len(latencies) / seconds if seconds > 0 else 0.0,
+            "p50_us": float(p50),
+            "p90_us": float(p90),
+            "p99_us": float(p99),
+            "p999_us": float(p999),
+            "max_us": float(latencies.max()) / 1000 if len(latencies) else 0.0}
+
+
+def run_stage(path: str, rows: int, prepare, call) -> typing.Dict[str, float]:
+    latencies = np.empty(rows, dtype=np.int64)
+    clock = time.perf_counter_ns
+    count = 0
+    start = time.perf_counter()
+    for fields in read_rows(path):
+        value = prepare(fields)
+        before = clock()
+        call(value)
+        latencies[count] = clock() - before
+        count += 1
+    seconds = time.perf_counter() - start
+    latencies = latencies[:count]
+    result = summary(latencies, float(latencies.sum()) / 1e9)
+    result["wall_seconds"] = seconds
+    return result
+
+
+def run_stage_memory(path: str, rows: int, prepare, call) -> int:
+    """
+    Peak traced memory of a stage when results are
+    discarded as they are produced.
+    """
+    tracemalloc.start()
+    for fields in read_rows(path):
+        call(prepare(fields))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run_read(path: str) -> typing.Dict[str, float]:
+    start = time.perf_counter()
+    count = sum(1 for _ in read_colocalizations(REL, path))
+    seconds = time.perf_counter() - start
+    return {"count": count,
+            "seconds": seconds,
+            "per_second": count / seconds if seconds > 0 else 0.0,
+            "bytes_per_second": os.path.getsize(path) / seconds if seconds > 0 else 0.0}
+
+
+def run_retained_memory(path: str, rows: int) -> typing.Dict[str, float]:
+    """
+    Memory of keeping rows colocalizations in a list.
+    """
+    tracemalloc.start()
+    colocalizations = []
+    for fields in read_rows(path):
+        if len(colocalizations) == rows:
+            break
+        colocalizations.append(colocalization(fields))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": len(colocalizations),
+            "bytes": current,
+            "peak_bytes": peak,
+            "bytes_per_row": current / len(colocalizations) if colocalizations else 0.0}
+
+
+def run(rows: int, seed: int, directory: str, memory_rows: int, stages: typing.List[str]) -> typing.Dict:
+    path = data_file(directory, rows, seed)
+    result = {"rows": rows, "seed": seed, "file_bytes": os.path.getsize(path), "stages": {}}
+    for name, prepare, call, context in all_stages():
+        if stages and name not in stages:
+            continue
+        with context():
+            stage = run_stage(path, rows, prepare, call)
+            if memory_rows and rows <= memory_rows:
+                # tracemalloc slows everything down so it gets its own pass
+                stage["peak_bytes"] = run_stage_memory(path, rows, prepare, call)
+        result["stages"][name] = stage
+        print("{:>10} {:<34} {:>12.0f}/s p50 {:>9.1f}us p99 {:>9.1f}us".format(rows,
+                                                                             name,
+                                                                             stage["per_second"],
+                                                                             stage["p50_us"],
+                                                                             stage["p99_us"]))
+    if not stages or "read_colocalizations" in stages:
+        result["stages"]["read_colocalizations"] = run_read(path)
+        print("{:>10} {:<34} {:>12.0f}/s".format(rows, "read_colocalizations",
+                                                 result["stages"]["read_colocalizations"]["per_second"]))
+    if memory_rows:
+        result["memory"] = run_retained_memory(path, memory_rows)
+        print("{:>10} {:<34} {:>12.0f} bytes/row".format(rows, "memory", result["memory"]["bytes_per_row"]))
+    return result
+
+
+def environment() -> typing.Dict[str, str]:
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "numpy": np.__version__,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def compare(baseline: typing.Dict, current: typing.Dict) -> None:
+    """
+    Print the throughput of each stage relative to a
+    baseline run, above 1 is faster.
+    """
+    previous = {(r["rows"], name): stage
+                for r in baseline["results"]
+                for name, stage in r["stages"].items()}
+    for r in current["results"]:
+        for name, stage in r["stages"].items():
+            before = previous.get((r["rows"], name))
+            if before and before["per_second"] > 0:
+                print("{:>10} {:<34} {:>6.2f}x".format(r["rows"], name, stage["per_second"] / before["per_second"]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="benchmark parsing and serializing colocalizations")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default=os.path.join("benchmark", "data"))
+    parser.add_argument("--memory-rows", type=int, default=100000,
+                        help="rows kept for the memory measurement, 0 to skip")
+    parser.add_argument("--stage", action="append", default=[], help="only run these stages")
+    parser.add_argument("--output", help="write results as json")
+    parser.add_argument("--compare", help="json results of an earlier run")
+    arguments = parser.parse_args()
+
+    results = {"environment": environment(),
+               "results": [run(rows, arguments.seed, arguments.data, arguments.memory_rows, arguments.stage)
+                           for rows in arguments.rows]}
+    if arguments.output:
+        with open(arguments.output, "w") as out:
+            json.dump(results, out, indent=2)
+    if arguments.compare:
+        with open(arguments.compare) as baseline:
+            compare(json.load(baseline), results)
@@ -0,0 +1,192 @@
+import typing
+
+import numpy as np
+
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization, CredibleSet, \
+    LazyCausalVariants
+
+# order of membership_codes, the count columns are named after them
+MEMBERSHIP_COLUMNS = ("count_none", "count_cs1", "count_cs2", "count_both")
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def credible_set(variants: typing.Union[typing.List[CausalVariant], LazyCausalVariants, CredibleSet]) -> CredibleSet:
+    """
+    The credible set of a colocalization as a CredibleSet,
+    an undecoded credible set is parsed without creating
+    causal variants.
+
+    :param variants: colocalization.variants
+    :return: credible set
+    """
+    if isinstance(variants, CredibleSet):
+        return variants
+    if isinstance(variants, LazyCausalVariants) and not variants.is_decoded():
+        return CredibleSet.from_strs(variants.rel, variants.variant1_str, variants.variant2_str)
+    return CredibleSet.from_causal_variants(variants)
+
+
+def nvl_id(value: typing.Optional[int]) -> int:
+    return -1 if value is None else value
+
+
+def causal_variant_columns(colocalizations: typing.Sequence[Colocalization]) -> typing.Dict[str, np.ndarray]:
+    """
+    The causal variants of all colocalizations as flat
+    columns, e.g. for pip distributions.  owner is the
+    index of the colocalization a row belongs to.
+
+    :param colocalizations: colocalizations
+    :return: owner, pip1, beta1, pip2, beta2, membership (codes of CredibleSet.membership_codes)
+    """
+    sets = [credible_set(c.variants) for c in colocalizations]
+    sizes = np.array([len(s) for s in sets], dtype=np.int64)
+
+    def concatenate(name):
+        return np.concatenate([getattr(s, name) for s in sets]) if sets else np.empty(0)
+
+    return {"owner": np.repeat(np.arange(len(sets)), sizes),
+            "pip1": concatenate("pip1"),
+            "beta1": concatenate("beta1"),
+            "pip2": concatenate("pip2"),
+            "beta2": concatenate("beta2"),
+            "membership": np.concatenate([s.membership_codes() for s in sets]) if sets else np.empty(0, np.int8)}
+
+
+def colocalization_statistics(colocalizations: typing.Iterable[Colocalization],
+                              variants: typing.Optional[typing.Dict[str, np.ndarray]] = None) \
+        -> typing.Dict[str, np.ndarray]:
+    """
+    Credible set statistics with one row per
+    colocalization, as a dict of equal length columns
+    that can be passed to pandas.DataFrame.
+
+    cs_size_1, cs_size_2, cs_size: as in Colocalization.json_rep
+    count_none, count_cs1, count_cs2, count_both: variants per membership_cs label
+    max_pip1, max_pip2: largest pip in each set, NaN for an empty set
+
+    :param colocalizations: colocalizations
+    :param variants: causal_variant_columns of the colocalizations if already computed
+    :return: columns
+    """
+    colocalizations = list(colocalizations)
+    n = len(colocalizations)
+    if variants is None:
+        variants = causal_variant_columns(colocalizations)
+    owner = variants["owner"]
+
+    counts = np.bincount(4 * owner + variants["membership"], minlength=4 * n).reshape(n, 4)
+    max_pip1 = np.full(n, np.nan)
+    max_pip2 = np.full(n, np.nan)
+    np.fmax.at(max_pip1, owner, variants["pip1"])
+    np.fmax.at(max_pip2, owner, variants["pip2"])
+
+    columns = {"colocalization_id": np.array([nvl_id(c.colocalization_id) for c in colocalizations], dtype=np.int64),
+               "source1": np.array([c.source1 for c in colocalizations], dtype=object),
+               "source2": np.array([c.source2 for c in colocalizations], dtype=object),
+               "phenotype1": np.array([c.phenotype1 for c in colocalizations], dtype=object),
+               "phenotype2": np.array([c.phenotype2 for c in colocalizations], dtype=object),
+               "clpp": np.array([c.clpp for c in colocalizations], dtype=np.float64),
+               "clpa": np.array([c.clpa for c in colocalizations], dtype=np.float64)}
+    for i, name in enumerate(MEMBERSHIP_COLUMNS):
+        columns[name] = counts[:, i]
+    columns["cs_size_1"] = counts[:, 1] + counts[:, 3]
+    columns["cs_size_2"] = counts[:, 2] + counts[:, 3]
+    columns["cs_size"] = counts.sum(axis=1)
+    columns["max_pip1"] = max_pip1
+    columns["max_pip2"] = max_pip2
+    return columns
+
+
+def group_codes(columns: typing.Dict[str, np.ndarray],
+                by: typing.Sequence[str]) -> typing.Tuple[np.ndarray, typing.Dict[str, np.ndarray]]:
+    """
+    Number the distinct combinations of the by columns.
+
+    :param columns: columns
+    :param by: names of the columns to group by, at least one
+    :return: group of each row, key columns with one row per group
+    """
+    uniques = []
+    codes = []
+    for name in by:
+        unique, inverse = np.unique(columns[name], return_inverse=True)
+        uniques.append(unique)
+        codes.append(inverse.reshape(-1))
+    combined, group = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+    keys = {name: unique[combined[:, i]] for i, (name, unique) in enumerate(zip(by, uniques))}
+    return group.reshape(-1), keys
+
+
+def grouped_quantiles(group: np.ndarray,
+                      values: np.ndarray,
+                      groups: int,
+                      quantiles: typing.Sequence[float]) -> np.ndarray:
+    """
+    Quantiles of values within each group, NaN values are
+    ignored.  Interpolates as numpy.quantile does by default.
+
+    :param group: group of each value
+    :param values: values
+    :param groups: number of groups
+    :param quantiles: quantiles in [0, 1]
+    :return: array of shape (groups, len(quantiles)), NaN for a group without values
+    """
+    keep = ~np.isnan(values)
+    group = group[keep]
+    values = values[keep]
+    order = np.lexsort((values, group))
+    values = values[order]
+    counts = np.bincount(group, minlength=groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    result = np.full((groups, len(quantiles)), np.nan)
+    present = counts > 0
+    for j, q in enumerate(quantiles):
+        position = starts[present] + q * (counts[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result[present, j] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+    return result
+
+
+def group_statistics(colocalizations: typing.Iterable[Colocalization],
+                     by: typing.Sequence[str] = ("source1", "phenotype1"),
+                     quantiles: typing.Sequence[float] = DEFAULT_QUANTILES) -> typing.Dict[str, np.ndarray]:
+    """
+    Credible set statistics with one row per distinct
+    value of the by columns, e.g. per source and
+    phenotype over a release.
+
+    count: number of colocalizations
+    cs_size_1, cs_size_2, cs_size, count_*: summed over the group
+    max_pip1, max_pip2: largest pip in the group
+    clpp_q<q>, clpa_q<q>, pip1_q<q>, pip2_q<q>: quantiles e.g. clpp_q0.5
+
+    :param colocalizations: colocalizations
+    :param by: columns of colocalization_statistics to group by
+    :param quantiles: quantiles to compute
+    :return: columns
+    """
+    colocalizations = list(colocalizations)
+    variants = causal_variant_columns(colocalizations)
+    rows = colocalization_statistics(colocalizations, variants)
+    group, result = group_codes(rows, by)
+    groups = len(result[by[0]])
+
+    result["count"] = np.bincount(group, minlength=groups)
+    for name in MEMBERSHIP_COLUMNS + ("cs_size_1", "cs_size_2", "cs_size"):
+        result[name] = np.bincount(group, weights=rows[name], minlength=groups).astype(np.int64)
+    for name in ("max_pip1", "max_pip2"):
+        result[name] = np.full(groups, np.nan)
+        np.fmax.at(result[name], group, rows[name])
+
+    variant_group = group[variants["owner"]]
+    for name, group_of, values in (("clpp", group, rows["clpp"]),
+                                   ("clpa", group, rows["clpa"]),
+                                   ("pip1", variant_group, variants["pip1"]),
+                                   ("pip2", variant_group, variants["pip2"])):
+        values = grouped_quantiles(group_of, values, groups, quantiles)
+        for j, q in enumerate(quantiles):
+            result["{}_q{}".format(name, q)] = values[:, j]
+    return result
@@ -0,0 +1,203 @@
+import typing
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization
+from finngen_common_data_model.genomics import Locus, Variant
+from finngen_common_data_model.loader import causal_variant_values, colocalization_values
+
+
+def variant_fields(prefix: str) -> typing.List[pa.Field]:
+    return [pa.field("{}chromosome".format(prefix), pa.int8()),
+            pa.field("{}position".format(prefix), pa.int32()),
+            pa.field("{}ref".format(prefix), pa.string()),
+            pa.field("{}alt".format(prefix), pa.string())]
+
+
+CAUSAL_VARIANT_TYPE = pa.struct([pa.field("rel", pa.int16()),
+                                 pa.field("causal_variant_id", pa.int64()),
+                                 pa.field("pip1", pa.float64()),
+                                 pa.field("pip2", pa.float64()),
+                                 pa.field("beta1", pa.float64()),
+                                 pa.field("beta2", pa.float64()),
+                                 *variant_fields("variant_")])
+
+# same columns as Colocalization.columns() with the
+# credible set as a list of causal variants
+SCHEMA = pa.schema([pa.field("rel", pa.int16()),
+                    pa.field("colocalization_id", pa.int64()),
+                    pa.field("source1", pa.string()),
+                    pa.field("source2", pa.string()),
+                    pa.field("phenotype1", pa.string()),
+                    pa.field("phenotype1_description", pa.string()),
+                    pa.field("phenotype2", pa.string()),
+                    pa.field("phenotype2_description", pa.string()),
+                    pa.field("quant1", pa.string()),
+                    pa.field("quant2", pa.string()),
+                    pa.field("tissue1", pa.string()),
+                    pa.field("tissue2", pa.string()),
+                    *variant_fields("locus_id1_"),
+                    *variant_fields("locus_id2_"),
+                    pa.field("chromosome", pa.int8()),
+                    pa.field("start", pa.int32()),
+                    pa.field("stop", pa.int32()),
+                    pa.field("clpp", pa.float64()),
+                    pa.field("clpa", pa.float64()),
+                    pa.field("len_cs1", pa.int32()),
+                    pa.field("len_cs2", pa.int32()),
+                    pa.field("len_inter", pa.int32()),
+                    pa.field("source2_displayname", pa.string()),
+                    pa.field("variants", pa.list_(CAUSAL_VARIANT_TYPE))])
+
+
+def to_arrow(colocalizations: typing.Iterable[Colocalization]) -> pa.Table:
+    """
+    Convert colocalizations to an arrow table with
+    SCHEMA.
+
+    :param colocalizations: colocalizations
+    :return: arrow table
+    """
+    columns = {name: [] for name in SCHEMA.names}
+    for colocalization in colocalizations:
+        values = colocalization_values(colocalization, colocalization.colocalization_id)
+        values["variants"] = [causal_variant_values(cv, colocalization.colocalization_id, cv.causal_variant_id)
+                              for cv in colocalization.variants]
+        for cv in values["variants"]:
+            # implied by the parent row
+            del cv["colocalization_id"]
+        for name, column in columns.items():
+            column.append(values[name])
+    return pa.table(columns, schema=SCHEMA)
+
+
+def variant_from_row(prefix: str, row: typing.Dict[str, typing.Any]) -> typing.Optional[Variant]:
+    chromosome = row["{}chromosome".format(prefix)]
+    if chromosome is None:
+        return None
+    return Variant(chromosome=chromosome,
+                   position=row["{}position".format(prefix)],
+                   reference=row["{}ref".format(prefix)],
+                   alternate=row["{}alt".format(prefix)])
+
+
+def colocalization_from_row(row: typing.Dict[str, typing.Any]) -> Colocalization:
+    variants = [CausalVariant(rel=cv["rel"],
+                              pip1=cv["pip1"],
+                              beta1=cv["beta1"],
+                              pip2=cv["pip2"],
+                              beta2=cv["beta2"],
+                              causal_variant_id=cv["causal_variant_id"],
+                              variant=variant_from_row("variant_", cv))
+                for cv in row["variants"]]
+    return Colocalization(rel=row["rel"],
+                          source1=row["source1"],
+                          source2=row["source2"],
+                          phenotype1=row["phenotype1"],
+                          phenotype1_description=row["phenotype1_description"],
+                          phenotype2=row["phenotype2"],
+                          phenotype2_description=row["phenotype2_description"],
+                          quant1=row["quant1"],
+                          quant2=row["quant2"],
+                          tissue1=row["tissue1"],
+                          tissue2=row["tissue2"],
+                          locus_id1=variant_from_row("locus_id1_", row),
+                          locus_id2=variant_from_row("locus_id2_", row),
+                          locus=Locus(row["chromosome"], row["start"], row["stop"]),
+                          clpp=row["clpp"],
+                          clpa=row["clpa"],
+                          len_cs1=row["len_cs1"],
+                          len_cs2=row["len_cs2"],
+                          len_inter=row["len_inter"],
+                          source2_displayname=row["source2_displayname"],
+                          variants=variants,
+                          colocalization_id=row["colocalization_id"])
+
+
+def from_arrow(table: pa.Table) -> typing.Iterator[Colocalization]:
+    """
+    Convert an arrow table with SCHEMA back to
+    colocalizations, one record batch at a time.
+
+    :param table: arrow table
+    :return: iterator of colocalizations
+    """
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield colocalization_from_row(row)
+
+
+def write_parquet(colocalizations: typing.Iterable[Colocalization],
+                  path,
+                  row_group_size: int = 64 * 1024,
+                  sort: bool = True) -> None:
+    """
+    Write colocalizations to a parquet file.  Sorting
+    by locus keeps row group statistics tight so region
+    queries can skip most row groups.
+
+    :param colocalizations: colocalizations
+    :param path: output path
+    :param row_group_size: rows per row group
+    :param sort: sort rows by chromosome and start
+    :return: None
+    """
+    table = to_arrow(colocalizations)
+    if sort:
+        table = table.sort_by([("chromosome", "ascending"), ("start", "ascending")])
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+
+def filters(region: typing.Optional[typing.Union[str, Locus]] = None,
+            min_clpp: typing.Optional[float] = None) -> typing.Optional[typing.List[typing.Tuple]]:
+    """
+    Parquet filters for loci overlapping a region and a
+    minimum clpp.
+
+    :param region: locus or region string e.g. 15:78464464-78864464
+    :param min_clpp: smallest clpp to keep
+    :return: filters for pyarrow.parquet.read_table
+    """
+    result = []
+    if region is not None:
+        locus = Locus.from_str(region) if isinstance(region, str) else region
+        result += [("chromosome", "=", locus.chromosome),
+                   ("start", "<=", locus.stop),
+                   ("stop", ">=", locus.start)]
+    if min_clpp is not None:
+        result.append(("clpp", ">=", min_clpp))
+    return result or None
+
+
+def read_parquet(path,
+                 columns: typing.Optional[typing.List[str]] = None,
+                 region: typing.Optional[typing.Union[str, Locus]] = None,
+                 min_clpp: typing.Optional[float] = None) -> pa.Table:
+    """
+    Read a parquet file written by write_parquet.  Only
+    the requested columns are read and row groups whose
+    statistics cannot match the region or clpp bound are
+    skipped.
+
+    :param path: input path
+    :param columns: columns to read, all if None
+    :param region: locus or region string e.g. 15:78464464-78864464
+    :param min_clpp: smallest clpp to keep
+    :return: arrow table
+    """
+    return pq.read_table(path, columns=columns, filters=filters(region, min_clpp))
+
+
+def read_colocalizations_parquet(path,
+                                 region: typing.Optional[typing.Union[str, Locus]] = None,
+                                 min_clpp: typing.Optional[float] = None) -> typing.Iterator[Colocalization]:
+    """
+    Read colocalizations from a parquet file.
+
+    :param path: input path
+    :param region: locus or region string e.g. 15:78464464-78864464
+    :param min_clpp: smallest clpp to keep
+    :return: iterator of colocalizations
+    """
+    return from_arrow(read_parquet(path, region=region, min_clpp=min_clpp))
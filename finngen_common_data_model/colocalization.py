@@ -1,33 +1,33 @@
 import abc
 import attr
+import collections.abc
 import typing
 import attr
+import numpy as np
 from attr.validators import instance_of
 from sqlalchemy import Table, MetaData, create_engine, Column, Integer, String, Float, Text
 from finngen_common_data_model.genomics import *
 from finngen_common_data_model.data import *
+from finngen_common_data_model.dictionary import DICTIONARY_FIELDS, StringDictionary
 
 
-@attr.s
-class CausalVariant(JSONifiable, Kwargs):
+def variant_from_str(text: str) -> typing.Optional[Variant]:
     """
-    Causual variant DTO
-
-    pip1, beta1
-    pip2, beta2
+    Variant.from_str looked up on each call, so the
+    import schemas see a replaced Variant.from_str e.g.
+    the timed one of instrumentation.
 
+    :param text: variant string
+    :return: variant
     """
-    rel = attr.ib(validator=instance_of(int))
-    
-    pip1 = attr.ib(validator=attr.validators.optional(instance_of(float)))
-    beta1 = attr.ib(validator=attr.validators.optional(instance_of(float)))
-
-    pip2 = attr.ib(validator=attr.validators.optional(instance_of(float)))
-    beta2 = attr.ib(validator=attr.validators.optional(instance_of(float)))
+    return Variant.from_str(text)
 
-    causal_variant_id = attr.ib(validator=attr.validators.optional(instance_of(int)), default=None)
 
-    variant = attr.ib(instance_of(Variant))
+class CausalVariantMethods(JSONifiable, Kwargs):
+    """
+    Methods of CausalVariant and SlottedCausalVariant.
+    """
+    __slots__ = ()
 
     # id : note this is skipped as it is managed by SQL Alchemy
 
@@ -49,7 +49,7 @@ class CausalVariant(JSONifiable, Kwargs):
 
         :return: kwargs
         """
-        return {x: self.__dict__[x] for x in ["rel",
+        return {x: getattr(self, x) for x in ["rel",
                                               "variant",
                                               "pip1",
                                               "beta1",
@@ -178,6 +178,47 @@ class CausalVariant(JSONifiable, Kwargs):
         causal_variants = sorted(causal_variants, key=CausalVariant.sort_key)
         return causal_variants
 
+    # column name, converter, values read as None
+    _IMPORT_SCHEMA = (('variant', variant_from_str, REQUIRED),
+                      ('pip1', float, NULL),
+                      ('beta1', float, NULL),
+                      ('pip2', float, NULL),
+                      ('beta2', float, NULL))
+
+    @staticmethod
+    def decoder(columns: typing.Optional[typing.Sequence[str]] = None) -> RowDecoder:
+        """
+        Row decoder for causal variant rows whose columns
+        are in the given order.
+
+        :param columns: column names, defaults to variant, pip1, beta1, pip2, beta2
+        :return: decoder to pass to from_row
+        """
+        return RowDecoder(CausalVariant._IMPORT_SCHEMA, columns)
+
+    @staticmethod
+    def from_row(rel: int,
+                 line: typing.List[str],
+                 decoder: typing.Optional[RowDecoder] = None,
+                 causal_variant_id: typing.Optional[int] = None) -> "CausalVariant":
+        """
+        Create a causal variant from a row of data.
+
+        :param rel: release
+        :param line: string array with values
+        :param decoder: decoder for the column order
+        :param causal_variant_id: causal variant id
+        :return: causal variant
+        """
+        variant, pip1, beta1, pip2, beta2 = (decoder or CausalVariant.decoder()).decode(line)
+        return CausalVariant(rel=rel,
+                             pip1=pip1,
+                             beta1=beta1,
+                             pip2=pip2,
+                             beta2=beta2,
+                             causal_variant_id=causal_variant_id,
+                             variant=variant)
+
     @staticmethod
     def columns(prefix: typing.Optional[str] = None) -> typing.List[Column]:
         """
@@ -198,13 +239,12 @@ class CausalVariant(JSONifiable, Kwargs):
             *Variant.columns('{}variant_'.format(prefix), nullable=False)
         ]
 
-    @staticmethod
     def __composite_values__(self):
         """
         These are artifacts needed for composition by sqlalchemy.
         Returns a tuple containing the constructor args.
 
-        :return: tuple (chromosome, start, stop)
+        :return: tuple (variant, pip1, pip2, beta1, beta2)
         """
         return self.variant, self.pip1, self.pip2, self.beta1, self.beta2
 
@@ -214,77 +254,359 @@ class CausalVariant(JSONifiable, Kwargs):
 
 
 @attr.s
-class Colocalization(Kwargs, JSONifiable):
+class CausalVariant(CausalVariantMethods):
     """
-    DTO for colocalization.
-
-
-    https://github.com/FINNGEN/colocalization/blob/master/docs/data_dictionary.txt
+    Causual variant DTO
 
-    Note : the column order is defined here.  This column order determines
-    how data is loaded.
+    pip1, beta1
+    pip2, beta2
 
     """
     rel = attr.ib(validator=instance_of(int))
     
-    source1 = attr.ib(validator=instance_of(str))
-    source2 = attr.ib(validator=instance_of(str))
+    pip1 = attr.ib(validator=attr.validators.optional(instance_of(float)))
+    beta1 = attr.ib(validator=attr.validators.optional(instance_of(float)))
 
-    phenotype1 = attr.ib(validator=instance_of(str))
-    phenotype1_description = attr.ib(validator=instance_of(str))
+    pip2 = attr.ib(validator=attr.validators.optional(instance_of(float)))
+    beta2 = attr.ib(validator=attr.validators.optional(instance_of(float)))
 
-    phenotype2 = attr.ib(validator=instance_of(str))
-    phenotype2_description = attr.ib(validator=instance_of(str))
+    causal_variant_id = attr.ib(validator=attr.validators.optional(instance_of(int)), default=None)
 
-    quant1 = attr.ib(validator=attr.validators.optional(instance_of(str)))
-    quant2 = attr.ib(validator=attr.validators.optional(instance_of(str)))
+    variant = attr.ib(instance_of(Variant))
 
-    tissue1 = attr.ib(validator=attr.validators.optional(instance_of(str)))
-    tissue2 = attr.ib(validator=attr.validators.optional(instance_of(str)))
 
-    locus_id1 = attr.ib(validator=instance_of(Variant))
-    locus_id2 = attr.ib(validator=instance_of(Variant))
+class LazyCausalVariants(collections.abc.Sequence):
+    """
+    Credible set kept as the vars1_info and vars2_info
+    strings.  The causal variants are decoded with
+    CausalVariant.from_list on first access and cached.
+    The credible set sizes only need the strings split.
 
-    locus = attr.ib(validator=instance_of(Locus))
+    Compares equal to the list of causal variants it
+    decodes to.
+    """
+    __slots__ = ('rel', 'variant1_str', 'variant2_str', '_decoded')
 
-    clpp = attr.ib(validator=instance_of(float))
-    clpa = attr.ib(validator=instance_of(float))
+    def __init__(self, rel: int, variant1_str: str, variant2_str: str):
+        self.rel = rel
+        self.variant1_str = variant1_str
+        self.variant2_str = variant2_str
+        self._decoded = None
 
-    len_cs1 = attr.ib(validator=instance_of(int))
-    len_cs2 = attr.ib(validator=instance_of(int))
-    len_inter = attr.ib(validator=instance_of(int))
+    def decoded(self) -> typing.List[CausalVariant]:
+        """
+        The causal variants, decoding them if needed.
 
-    source2_displayname = attr.ib(validator=instance_of(str))
+        :return: list of causal variants
+        """
+        if self._decoded is None:
+            self._decoded = CausalVariant.from_list(self.rel, self.variant1_str, self.variant2_str)
+        return self._decoded
 
-    variants = attr.ib(validator=attr.validators.deep_iterable(member_validator=instance_of(CausalVariant),
-                                                               iterable_validator=instance_of(typing.List)))
+    def is_decoded(self) -> bool:
+        return self._decoded is not None
 
-    colocalization_id = attr.ib(validator=attr.validators.optional(instance_of(int)), default=None)
+    @staticmethod
+    def keys(variant_str: str) -> typing.Set[str]:
+        return {x.split(",", 1)[0] for x in variant_str.split(";")}
+
+    def cs_size_1(self) -> int:
+        """
+        Number of variants in the first credible set.
+
+        :return: size of first credible set
+        """
+        if self._decoded is not None:
+            return sum(c.count_cs1() for c in self._decoded)
+        return len(LazyCausalVariants.keys(self.variant1_str))
+
+    def cs_size_2(self) -> int:
+        """
+        Number of variants in the second credible set.
+
+        :return: size of second credible set
+        """
+        if self._decoded is not None:
+            return sum(c.count_cs2() for c in self._decoded)
+        return len(LazyCausalVariants.keys(self.variant2_str))
+
+    def cs_size(self) -> int:
+        """
+        Number of variants in either credible set.
+
+        :return: number of causal variants
+        """
+        return len(self)
+
+    def __len__(self) -> int:
+        if self._decoded is not None:
+            return len(self._decoded)
+        return len(LazyCausalVariants.keys(self.variant1_str) | LazyCausalVariants.keys(self.variant2_str))
+
+    def __getitem__(self, index):
+        return self.decoded()[index]
+
+    def __iter__(self) -> typing.Iterator[CausalVariant]:
+        return iter(self.decoded())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyCausalVariants):
+            return self.decoded() == other.decoded()
+        if isinstance(other, list):
+            return self.decoded() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.decoded())
+
+
+class CredibleSet(collections.abc.Sequence):
+    """
+    Credible set stored as columns instead of a list of
+    causal variants.
+
+    rel: release, shared by every member
+    variants: VariantArray in Variant.sort_key order
+    pip1, beta1, pip2, beta2: float arrays, NaN for missing
+    causal_variant_id: int64 array, -1 for missing, or None
+
+    The membership methods work on the whole set at once.
+    Iterating or indexing with an integer creates causal
+    variants, so it can stand in for the list.  A pip or
+    beta that is itself NaN reads back as None.
+    """
+    __slots__ = ('rel', 'variants', 'pip1', 'beta1', 'pip2', 'beta2', 'causal_variant_id')
+
+    MEMBERSHIP_LABELS = np.array(['None', 'CS1', 'CS2', 'Both'], dtype=object)
+
+    def __init__(self,
+                 rel: int,
+                 variants: VariantArray,
+                 pip1: np.ndarray,
+                 beta1: np.ndarray,
+                 pip2: np.ndarray,
+                 beta2: np.ndarray,
+                 causal_variant_id: typing.Optional[np.ndarray] = None,
+                 dtype=np.float64):
+        self.rel = rel
+        self.variants = variants
+        self.pip1 = np.asarray(pip1, dtype=dtype)
+        self.beta1 = np.asarray(beta1, dtype=dtype)
+        self.pip2 = np.asarray(pip2, dtype=dtype)
+        self.beta2 = np.asarray(beta2, dtype=dtype)
+        self.causal_variant_id = None if causal_variant_id is None else np.asarray(causal_variant_id,
+                                                                                   dtype=np.int64)
+
+    @staticmethod
+    def from_causal_variants(causal_variants: typing.Iterable[CausalVariant], dtype=np.float64) -> "CredibleSet":
+        """
+        Build from causal variants, which must share a
+        release.  The order is kept.
+
+        :param causal_variants: causal variants
+        :param dtype: float dtype of the pip and beta arrays
+        :return: credible set
+        """
+        causal_variants = list(causal_variants)
+        rels = {c.rel for c in causal_variants}
+        if len(rels) > 1:
+            raise ValueError("causal variants from more than one release : {}".format(sorted(rels)))
+        # None becomes NaN
+        columns = np.array([(c.pip1, c.beta1, c.pip2, c.beta2) for c in causal_variants],
+                           dtype=dtype).reshape(-1, 4)
+        ids = [c.causal_variant_id for c in causal_variants]
+        return CredibleSet(rels.pop() if rels else None,
+                           VariantArray.from_variants(c.variant for c in causal_variants),
+                           columns[:, 0], columns[:, 1], columns[:, 2], columns[:, 3],
+                           None if all(i is None for i in ids) else [-1 if i is None else i for i in ids],
+                           dtype)
+
+    @staticmethod
+    def from_strs(rel: int, variant1_str: str, variant2_str: str, dtype=np.float64) -> "CredibleSet":
+        """
+        Parse the vars1_info and vars2_info strings straight
+        into columns, the result is equal to what
+        CausalVariant.from_list returns.
+
+        :param rel: release
+        :param variant1_str: variant 1
+        :param variant2_str: variant 2
+        :param dtype: float dtype of the pip and beta arrays
+        :return: credible set
+        """
+        values = {}
+        for column, variant_str in ((0, variant1_str), (2, variant2_str)):
+            for x in variant_str.split(";"):
+                variant, pip, beta = x.split(",")
+                row = values.get(variant)
+                if row is None:
+                    row = values[variant] = [np.nan] * 4
+                row[column] = float(pip)
+                row[column + 1] = float(beta)
+        variants = VariantArray.from_strs(values.keys())
+        columns = np.array(list(values.values()), dtype=dtype).reshape(-1, 4)
+        order = variants.argsort()
+        columns = columns[order]
+        return CredibleSet(rel, variants[order], columns[:, 0], columns[:, 1], columns[:, 2], columns[:, 3], dtype=dtype)
+
+    def has_cs1(self) -> np.ndarray:
+        """
+        :return: boolean array, true where there is a first credible set
+        """
+        return ~(np.isnan(self.pip1) | np.isnan(self.beta1))
+
+    def has_cs2(self) -> np.ndarray:
+        """
+        :return: boolean array, true where there is a second credible set
+        """
+        return ~(np.isnan(self.pip2) | np.isnan(self.beta2))
+
+    def count_cs(self) -> np.ndarray:
+        """
+        :return: int8 array of the number of credible sets (0 - 2)
+        """
+        return self.has_cs1().astype(np.int8) + self.has_cs2().astype(np.int8)
+
+    def membership_codes(self) -> np.ndarray:
+        """
+        :return: int8 array, 0 None, 1 CS1, 2 CS2, 3 Both
+        """
+        return self.has_cs1().astype(np.int8) + 2 * self.has_cs2().astype(np.int8)
+
+    def membership_cs(self) -> np.ndarray:
+        """
+        :return: array of 'Both' , 'CS1' , 'CS2', 'None'
+        """
+        return CredibleSet.MEMBERSHIP_LABELS[self.membership_codes()]
+
+    def cs_size_1(self) -> int:
+        return int(np.count_nonzero(self.has_cs1()))
+
+    def cs_size_2(self) -> int:
+        return int(np.count_nonzero(self.has_cs2()))
+
+    def cs_size(self) -> int:
+        return len(self)
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def __getitem__(self, index):
+        """
+        An integer index creates a causal variant, anything
+        else numpy accepts as an index returns a credible
+        set.
+        """
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("credible set index out of range")
+
+            def value(column):
+                x = column[index]
+                return None if np.isnan(x) else float(x)
+
+            causal_variant_id = None
+            if self.causal_variant_id is not None and self.causal_variant_id[index] >= 0:
+                causal_variant_id = int(self.causal_variant_id[index])
+            return CausalVariant(rel=self.rel,
+                                 pip1=value(self.pip1),
+                                 beta1=value(self.beta1),
+                                 pip2=value(self.pip2),
+                                 beta2=value(self.beta2),
+                                 causal_variant_id=causal_variant_id,
+                                 variant=self.variants[index])
+        return CredibleSet(self.rel,
+                           self.variants[index],
+                           self.pip1[index],
+                           self.beta1[index],
+                           self.pip2[index],
+                           self.beta2[index],
+                           None if self.causal_variant_id is None else self.causal_variant_id[index],
+                           self.pip1.dtype)
+
+    def __iter__(self) -> typing.Iterator[CausalVariant]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_list(self) -> typing.List[CausalVariant]:
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CredibleSet, LazyCausalVariants, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "CredibleSet(rel={}, size={})".format(self.rel, len(self))
+
+
+_causal_variants_validator = attr.validators.deep_iterable(member_validator=instance_of(CausalVariantMethods),
+                                                           iterable_validator=instance_of(typing.List))
+
+
+def causal_variants_validator(instance, attribute, value):
+    """
+    Accept a list of causal variants, a credible set
+    that has not been decoded yet or a CredibleSet.
+    """
+    if not isinstance(value, (LazyCausalVariants, CredibleSet)):
+        _causal_variants_validator(instance, attribute, value)
 
-    _IMPORT_COLUMN_NAMES = ('source1',
-                            'source2',
-                            'pheno1',
-                            'pheno1_description',
-                            'pheno2',
-                            'pheno2_description',
-                            'quant1',
-                            'quant2',
-                            'tissue1',
-                            'tissue2',
-                            'locus_id1',
-                            'locus_id2',
-                            'chrom',
-                            'start',
-                            'stop',
-                            'clpp',
-                            'clpa',
-                            'vars',
-                            'len_cs1',
-                            'len_cs2',
-                            'len_inter',
-                            'vars1_info',
-                            'vars2_info',
-                            'source2_displayname')
+
+class ColocalizationMethods(Kwargs, JSONifiable):
+    """
+    Methods of Colocalization and SlottedColocalization.
+    """
+    __slots__ = ()
+
+    # column name, converter, values read as None
+    # the converter of skipped columns is None
+    _IMPORT_SCHEMA = (('source1', str, NULL),
+                      ('source2', str, NULL),
+                      ('pheno1', only_ascii, NULL),
+                      ('pheno1_description', only_ascii, NULL),
+                      ('pheno2', only_ascii, NULL),
+                      ('pheno2_description', only_ascii, NULL),
+                      ('quant1', str, NULL),
+                      ('quant2', str, NULL),
+                      ('tissue1', str, NULL),
+                      ('tissue2', str, NULL),
+                      ('locus_id1', variant_from_str, NULL),
+                      ('locus_id2', variant_from_str, NULL),
+                      ('chrom', string_to_chromosome, NULL),
+                      ('start', int, NA),
+                      ('stop', int, NA),
+                      ('clpp', float, NULL),
+                      ('clpa', float, NULL),
+                      ('vars', None, NULL),
+                      ('len_cs1', int, NA),
+                      ('len_cs2', int, NA),
+                      ('len_inter', int, NA),
+                      ('vars1_info', str, NULL),
+                      ('vars2_info', str, NULL),
+                      ('source2_displayname', str, NULL))
+
+    _IMPORT_COLUMN_NAMES = tuple(name for name, _, _ in _IMPORT_SCHEMA)
+
+    _IMPORT_DECODER = RowDecoder(_IMPORT_SCHEMA)
+
+    # attribute of each import column, where the names differ
+    _IMPORT_ATTRIBUTES = dict(zip(_IMPORT_COLUMN_NAMES, _IMPORT_COLUMN_NAMES),
+                              pheno1='phenotype1',
+                              pheno1_description='phenotype1_description',
+                              pheno2='phenotype2',
+                              pheno2_description='phenotype2_description',
+                              chrom='chromosome')
+
+    # columns of the DICTIONARY_FIELDS, see Colocalization.decoder
+    _INTERNED_COLUMNS = frozenset(name for name, attribute in _IMPORT_ATTRIBUTES.items()
+                                  if attribute in DICTIONARY_FIELDS)
 
     @staticmethod
     def cvs_column_names() -> typing.List[str]:
@@ -312,13 +634,28 @@ class Colocalization(Kwargs, JSONifiable):
         return c
 
     def json_rep(self):
-        d = self.__dict__
-        d["locus_id1"] = str(d["locus_id1"]) if self.locus_id1 else None
-        d["locus_id2"] = str(d["locus_id2"]) if self.locus_id2 else None
-        d["cs_size_1"] = sum(map(lambda c: c.count_cs1(), self.variants))
-        d["cs_size_2"] = sum(map(lambda c: c.count_cs2(), self.variants))
-        d["cs_size"] = 0 if self.variants is None else len(self.variants)
-        d["variants"] = list(map(lambda c: c.json_rep(), self.variants))
+        """
+        Returns the json representation of the
+        object.  The credible set sizes are counted
+        in the same pass that converts the variants,
+        the object itself is not modified.
+
+        :return: json
+        """
+        d = attr.asdict(self, recurse=False)
+        d["locus_id1"] = str(self.locus_id1) if self.locus_id1 else None
+        d["locus_id2"] = str(self.locus_id2) if self.locus_id2 else None
+        cs_size_1 = 0
+        cs_size_2 = 0
+        variants = []
+        for c in self.variants or []:
+            cs_size_1 += c.count_cs1()
+            cs_size_2 += c.count_cs2()
+            variants.append(c.json_rep())
+        d["cs_size_1"] = cs_size_1
+        d["cs_size_2"] = cs_size_2
+        d["cs_size"] = len(variants)
+        d["variants"] = variants
         return d
 
     @staticmethod
@@ -328,7 +665,10 @@ class Colocalization(Kwargs, JSONifiable):
     @staticmethod
     def from_list(rel : str,
                   line: typing.List[str],
-                  colocalization_id=None) -> "Colocalization":
+                  colocalization_id=None,
+                  decoder: typing.Optional[RowDecoder] = None,
+                  lazy: bool = False,
+                  compact: bool = False) -> "Colocalization":
         """
         Constructor method used to create colocalization from
         a row of data.
@@ -342,54 +682,112 @@ class Colocalization(Kwargs, JSONifiable):
 
         :param colocalization_id: colocalization id
         :param line: string array with value
+        :param decoder: decoder for a different column order, see Colocalization.decoder
+        :param lazy: keep the credible set undecoded until first accessed
+        :param compact: store the credible set as a CredibleSet
         :return: colocalization object
         """
-        variants = CausalVariant.from_list(rel,
-                                           nvl(line[21], str),
-                                           nvl(line[22], str))
+        decoder = decoder or Colocalization._IMPORT_DECODER
+        (source1, source2,
+         phenotype1, phenotype1_description,
+         phenotype2, phenotype2_description,
+         quant1, quant2,
+         tissue1, tissue2,
+         locus_id1, locus_id2,
+         chromosome, start, stop,
+         clpp, clpa,
+         len_cs1, len_cs2, len_inter,
+         vars1_info, vars2_info,
+         source2_displayname) = decoder.decode(line)
+
+        if lazy:
+            variants = LazyCausalVariants(rel, vars1_info, vars2_info)
+        elif compact:
+            variants = CredibleSet.from_strs(rel, vars1_info, vars2_info)
+        else:
+            variants = CausalVariant.from_list(rel, vars1_info, vars2_info)
+
+        colocalization = Colocalization(rel=rel,
 
-        colocalization = Colocalization(rel = rel,
-                                        
-                                        source1=nvl(line[0], str),
-                                        source2=nvl(line[1], str),
+                                        source1=source1,
+                                        source2=source2,
 
-                                        phenotype1=nvl(line[2], only_ascii),
-                                        phenotype1_description=nvl(line[3], only_ascii),
+                                        phenotype1=phenotype1,
+                                        phenotype1_description=phenotype1_description,
 
-                                        phenotype2=nvl(line[4], only_ascii),
-                                        phenotype2_description=nvl(line[5], only_ascii),
+                                        phenotype2=phenotype2,
+                                        phenotype2_description=phenotype2_description,
 
-                                        quant1=nvl(line[6], str),
-                                        quant2=nvl(line[7], str),
+                                        quant1=quant1,
+                                        quant2=quant2,
 
-                                        tissue1=nvl(line[8], str),
-                                        tissue2=nvl(line[9], str),
+                                        tissue1=tissue1,
+                                        tissue2=tissue2,
 
-                                        locus_id1=nvl(line[10], Variant.from_str),
-                                        locus_id2=nvl(line[11], Variant.from_str),
+                                        locus_id1=locus_id1,
+                                        locus_id2=locus_id2,
 
-                                        locus=Locus(nvl(line[12], string_to_chromosome),  # chromosome
-                                                    nvl(line[13], na(int)),  # start
-                                                    nvl(line[14], na(int))),  # stop
+                                        locus=Locus(chromosome, start, stop),
 
-                                        clpp=nvl(line[15], float),
-                                        clpa=nvl(line[16], float),
-                                        # var line[17]
-                                        len_cs1=nvl(line[18], na(int)),
-                                        len_cs2=nvl(line[19], na(int)),
-                                        len_inter=nvl(line[20], na(int)),
+                                        clpp=clpp,
+                                        clpa=clpa,
 
-                                        source2_displayname=nvl(line[23], str),
+                                        len_cs1=len_cs1,
+                                        len_cs2=len_cs2,
+                                        len_inter=len_inter,
+
+                                        source2_displayname=source2_displayname,
 
                                         variants=variants,
 
                                         colocalization_id=colocalization_id)
-        return colocalization
+        return validate_sample(colocalization)
+
+    @staticmethod
+    def decoder(columns: typing.Optional[typing.Sequence[str]] = None,
+                strings: typing.Optional[StringDictionary] = None) -> RowDecoder:
+        """
+        Row decoder for rows whose columns are in the given
+        order, e.g. a file header.
+
+        With strings the sources, phenotypes, descriptions,
+        quants, tissues and display name are interned, rows
+        with the same value share one string and each
+        distinct value is converted once.
+
+        :param columns: import column names
+        :param strings: dictionary to intern string columns into
+        :return: decoder to pass to from_list
+        """
+        schema = Colocalization._IMPORT_SCHEMA
+        if strings is not None:
+            interned = Colocalization._INTERNED_COLUMNS
+            schema = [(name, strings.interning(f) if name in interned else f, nulls) for name, f, nulls in schema]
+        return RowDecoder(schema, columns)
+
+    @staticmethod
+    def projection(fields: typing.Iterable[str],
+                   columns: typing.Optional[typing.Sequence[str]] = None) -> RowDecoder:
+        """
+        Row decoder that only decodes some columns, use
+        decode_record or decode_str to get a named tuple
+        of the fields.
+
+        :param fields: import column names to decode e.g. chrom, start, stop, clpp
+        :param columns: import column names in row order
+        :return: decoder
+        """
+        return RowDecoder(Colocalization._IMPORT_SCHEMA, columns, fields, "ColocalizationRecord")
 
     @staticmethod
-    def from_str(rel : str, text: str, delimiter="\t") -> "Colocalization":
+    def from_str(rel : str,
+                 text: str,
+                 delimiter="\t",
+                 lazy: bool = False,
+                 compact: bool = False,
+                 decoder: typing.Optional[RowDecoder] = None) -> "Colocalization":
         line = text.split(delimiter)
-        return Colocalization.from_list(rel, line)
+        return Colocalization.from_list(rel, line, decoder=decoder, lazy=lazy, compact=compact)
 
     @staticmethod
     def columns(prefix: typing.Optional[str] = None) -> typing.List[Column]:
@@ -426,4 +824,202 @@ class Colocalization(Kwargs, JSONifiable):
                 Column('{}len_inter'.format(prefix), Integer, unique=False, nullable=False),
 
                 Column('{}source2_displayname'.format(prefix), String(1000), unique=False, nullable=True)]
+
+
+@attr.s
+class Colocalization(ColocalizationMethods):
+    """
+    DTO for colocalization.
+
+
+    https://github.com/FINNGEN/colocalization/blob/master/docs/data_dictionary.txt
+
+    Note : the column order is defined here.  This column order determines
+    how data is loaded.
+
+    """
+    rel = attr.ib(validator=instance_of(int))
     
+    source1 = attr.ib(validator=instance_of(str))
+    source2 = attr.ib(validator=instance_of(str))
+
+    phenotype1 = attr.ib(validator=instance_of(str))
+    phenotype1_description = attr.ib(validator=instance_of(str))
+
+    phenotype2 = attr.ib(validator=instance_of(str))
+    phenotype2_description = attr.ib(validator=instance_of(str))
+
+    quant1 = attr.ib(validator=attr.validators.optional(instance_of(str)))
+    quant2 = attr.ib(validator=attr.validators.optional(instance_of(str)))
+
+    tissue1 = attr.ib(validator=attr.validators.optional(instance_of(str)))
+    tissue2 = attr.ib(validator=attr.validators.optional(instance_of(str)))
+
+    locus_id1 = attr.ib(validator=instance_of(VariantMethods))
+    locus_id2 = attr.ib(validator=instance_of(VariantMethods))
+
+    locus = attr.ib(validator=instance_of(LocusMethods))
+
+    clpp = attr.ib(validator=instance_of(float))
+    clpa = attr.ib(validator=instance_of(float))
+
+    len_cs1 = attr.ib(validator=instance_of(int))
+    len_cs2 = attr.ib(validator=instance_of(int))
+    len_inter = attr.ib(validator=instance_of(int))
+
+    source2_displayname = attr.ib(validator=instance_of(str))
+
+    # list of causal variants, LazyCausalVariants or CredibleSet
+    variants = attr.ib(validator=causal_variants_validator)
+
+    colocalization_id = attr.ib(validator=attr.validators.optional(instance_of(int)), default=None)
+
+
+# slotted siblings without an instance __dict__, see to_slotted
+SlottedCausalVariant = slotted(CausalVariant)
+SlottedColocalization = slotted(Colocalization)
+
+SLOTTED_CLASSES = {Variant: SlottedVariant,
+                   Locus: SlottedLocus,
+                   CausalVariant: SlottedCausalVariant,
+                   Colocalization: SlottedColocalization}
+
+
+def to_slotted(value, memo: typing.Optional[typing.Dict[typing.Any, typing.Any]] = None):
+    """
+    Convert a colocalization, causal variant, variant or
+    locus, or a list of them, to the slotted classes.
+    Pass the same memo across calls to share one slotted
+    variant per distinct variant.  A credible set that
+    has not been decoded yet is kept as is.
+
+    :param value: value to convert
+    :param memo: converted variants to their replacement
+    :return: slotted value
+    """
+    return convert_attrs(value, SLOTTED_CLASSES, memo)
+
+
+def check_header(header: typing.List[str]) -> None:
+    """
+    Check that a header row matches the import
+    column names.
+
+    :param header: header fields
+    :return: None, raises ValueError on mismatch
+    """
+    expected = Colocalization.cvs_column_names()
+    if header != expected:
+        raise ValueError("unexpected header : expected {} found {}".format(expected, header))
+
+
+def read_colocalizations(rel: int,
+                         source,
+                         delimiter: str = "\t",
+                         header: bool = True,
+                         lazy: bool = False,
+                         compact: bool = False,
+                         strings: typing.Optional[StringDictionary] = None) -> typing.Iterator[Colocalization]:
+    """
+    Stream colocalizations from a file.  The file can
+    be plain text or gzipped, rows are parsed one at a
+    time so memory use does not depend on file size.
+
+    :param rel: release
+    :param source: path or file object
+    :param delimiter: column delimiter
+    :param header: if the first line is a header to check
+    :param lazy: keep credible sets undecoded until first accessed
+    :param compact: store credible sets as CredibleSet
+    :param strings: dictionary to intern repeated strings into, see Colocalization.decoder
+    :return: iterator of colocalizations
+    """
+    decoder = None if strings is None else Colocalization.decoder(strings=strings)
+    with open_text(source) as handle:
+        if header:
+            check_header(handle.readline().rstrip("\r\n").split(delimiter))
+        for line in handle:
+            line = line.rstrip("\r\n")
+            if line:
+                yield Colocalization.from_str(rel, line, delimiter, lazy, compact, decoder)
+
+
+def read_colocalization_offsets(rel: int,
+                                path,
+                                offset: int = 0,
+                                delimiter: str = "\t",
+                                header: bool = True,
+                                lazy: bool = False) -> typing.Iterator[typing.Tuple[Colocalization, int]]:
+    """
+    Stream colocalizations from a file starting at a
+    byte offset, with the offset of the line after each
+    one so a reader can be restarted where it stopped.
+
+    :param rel: release
+    :param path: path to a plain or gzipped file
+    :param offset: offset of the first line to read, 0 for the start of the file
+    :param delimiter: column delimiter
+    :param header: if the first line is a header to check
+    :param lazy: keep credible sets undecoded until first accessed
+    :return: iterator of (colocalization, offset after it)
+    """
+    with open_bytes(path) as handle:
+        if header:
+            line = handle.readline()
+            check_header(line.decode("utf-8").rstrip("\r\n").split(delimiter))
+            offset = max(offset, len(line))
+        handle.seek(offset)
+        for line in handle:
+            offset += len(line)
+            text = line.decode("utf-8").rstrip("\r\n")
+            if text:
+                yield Colocalization.from_str(rel, text, delimiter, lazy), offset
+
+
+def read_colocalization_chunks(rel: int,
+                               source,
+                               chunk_size: int,
+                               delimiter: str = "\t",
+                               header: bool = True,
+                               lazy: bool = False,
+                               compact: bool = False,
+                               strings: typing.Optional[StringDictionary] = None) -> typing.Iterator[typing.List[Colocalization]]:
+    """
+    Stream colocalizations from a file in lists of
+    chunk_size rows, e.g. for batch inserts.
+
+    :param rel: release
+    :param source: path or file object
+    :param chunk_size: rows per chunk
+    :param delimiter: column delimiter
+    :param header: if the first line is a header to check
+    :param lazy: keep credible sets undecoded until first accessed
+    :param compact: store credible sets as CredibleSet
+    :param strings: dictionary to intern repeated strings into
+    :return: iterator of lists of colocalizations
+    """
+    return chunked(read_colocalizations(rel, source, delimiter, header, lazy, compact, strings), chunk_size)
+
+
+def read_colocalization_records(source,
+                                fields: typing.Iterable[str],
+                                delimiter: str = "\t",
+                                header: bool = True) -> typing.Iterator[typing.Tuple]:
+    """
+    Stream named tuples of some columns of a file, the
+    other columns are not decoded.  Columns are located
+    by the header so their order does not matter.
+
+    :param source: path or file object
+    :param fields: import column names to decode e.g. chrom, start, stop, clpp
+    :param delimiter: column delimiter
+    :param header: if the first line is a header
+    :return: iterator of records
+    """
+    with open_text(source) as handle:
+        columns = handle.readline().rstrip("\r\n").split(delimiter) if header else None
+        decoder = Colocalization.projection(fields, columns)
+        for line in handle:
+            line = line.rstrip("\r\n")
+            if line:
+                yield decoder.decode_str(line, delimiter)
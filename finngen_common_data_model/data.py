@@ -1,8 +1,18 @@
 import abc
+import collections
+import contextlib
+import gzip
+import io
+import itertools
+import os
 import typing
 
+import attr
+
 X = typing.TypeVar('X')
 
+GZIP_MAGIC = b'\x1f\x8b'
+
 
 def nvl(value: typing.Optional[str],
         f: typing.Callable[[str], X]) -> typing.Optional[X]:
@@ -30,14 +40,346 @@ def na(f: typing.Callable[[str], X]) -> typing.Callable[[str], X]:
     return lambda value: None if value == 'NA' or value == 'na' else f(value)
 
 
+# values read as None by a column
+NULL = frozenset([""])
+NA = frozenset(["", "NA", "na"])
+REQUIRED = frozenset()
+
+
+def compile_converter(f: typing.Callable[[str], X],
+                      nulls: typing.FrozenSet[str] = NULL) -> typing.Callable[[typing.Optional[str]], typing.Optional[X]]:
+    """
+    Build a converter with the semantics of nvl, or of
+    nvl and na when nulls is NA, without creating any
+    closures per value.
+
+    :param f: function from string to type X
+    :param nulls: strings converted to None, with REQUIRED f is used as is
+    :return: converter
+    """
+    if not nulls:
+        return f
+    if nulls == NULL:
+        return lambda value: None if value is None or value == "" else f(value)
+    return lambda value: None if value is None or value in nulls else f(value)
+
+
+class RowDecoder(object):
+    """
+    Decodes rows of strings using a schema of
+    (column name, converter, nulls) entries.  A converter
+    of None skips the column.  One converter per column is
+    compiled when the decoder is built, decode then only
+    applies them.
+
+    The columns argument gives the order of the columns
+    in the rows, e.g. a file header, it defaults to the
+    schema order.  With fields only those columns are
+    decoded, the others are never converted.
+    """
+
+    def __init__(self,
+                 schema: typing.Sequence[typing.Tuple[str, typing.Optional[typing.Callable[[str], typing.Any]], typing.FrozenSet[str]]],
+                 columns: typing.Optional[typing.Sequence[str]] = None,
+                 fields: typing.Optional[typing.Iterable[str]] = None,
+                 name: str = "Record"):
+        columns = list(columns) if columns is not None else [column for column, _, _ in schema]
+        index = {column: i for i, column in enumerate(columns)}
+        known = {column for column, f, _ in schema if f is not None}
+        wanted = known if fields is None else set(fields)
+        if not wanted <= known:
+            raise ValueError("unknown fields : {}".format(sorted(wanted - known)))
+        self.fields = []
+        self.plan = []
+        for column, f, nulls in schema:
+            if column not in wanted:
+                continue
+            if column not in index:
+                raise ValueError("missing column : {}".format(column))
+            self.fields.append(column)
+            self.plan.append((index[column], compile_converter(f, nulls)))
+        # columns that have to be split off a line
+        self.size = max((i for i, _ in self.plan), default=-1) + 1
+        self.record = collections.namedtuple(name, self.fields)
+
+    def decode(self, line: typing.Sequence[typing.Optional[str]]) -> typing.List[typing.Any]:
+        """
+        Decode a row.
+
+        :param line: row of strings
+        :return: converted values in schema order
+        """
+        return [convert(line[i]) for i, convert in self.plan]
+
+    def decode_record(self, line: typing.Sequence[typing.Optional[str]]) -> typing.Tuple:
+        """
+        Decode a row into a named tuple of the fields.
+
+        :param line: row of strings
+        :return: record
+        """
+        return self.record(*[convert(line[i]) for i, convert in self.plan])
+
+    def decode_str(self, text: str, delimiter: str = "\t") -> typing.Tuple:
+        """
+        Decode a line into a named tuple of the fields.
+        The line is only split as far as the last decoded
+        column.
+
+        :param text: line
+        :param delimiter: column delimiter
+        :return: record
+        """
+        return self.decode_record(text.split(delimiter, self.size))
+
+
 def only_ascii(value: str) -> str:
     """
-    Remove non-ascci characters.
+    Remove non-ascci characters.  Values that are already
+    ascii, nearly all of them, are returned as is.
+    """
+    if value.isascii():
+        return value
+    return value.encode("ascii", "ignore").decode("ascii")
+
+
+def only_ascii_column(values: typing.Iterable[typing.Optional[str]],
+                      memo: typing.Optional[typing.Dict[str, str]] = None) -> typing.List[typing.Optional[str]]:
+    """
+    only_ascii over a column of values, e.g. phenotype
+    descriptions, which repeat across rows.  Each distinct
+    value is cleaned once and repeats share the cleaned
+    string.  Pass the same memo to share across columns or
+    calls.  None is kept as None.
+
+    :param values: column
+    :param memo: value to cleaned value
+    :return: cleaned column
+    """
+    memo = {} if memo is None else memo
+    result = []
+    for value in values:
+        cleaned = memo.get(value)
+        if cleaned is None and value is not None:
+            cleaned = memo[value] = only_ascii(value)
+        result.append(cleaned)
+    return result
+
+
+def chunked(iterable: typing.Iterable[X], size: int) -> typing.Iterator[typing.List[X]]:
+    """
+    Split an iterable into lists of at most size
+    elements.  The last list may be shorter.
+
+    :param iterable: values to split
+    :param size: maximum size of each list
+    :return: iterator of lists
+    """
+    if size < 1:
+        raise ValueError("chunk size must be positive : {}".format(size))
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+@contextlib.contextmanager
+def open_text(source, encoding: str = "utf-8") -> typing.Iterator[typing.TextIO]:
+    """
+    Open a path or file object for reading text.  Gzip
+    content is detected by its magic number and decompressed
+    on the fly.  File objects passed in by the caller are
+    not closed.
+
+    :param source: path, text file object or binary file object
+    :param encoding: text encoding
+    :return: text file object
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, "rb") as raw:
+            magic = raw.read(len(GZIP_MAGIC))
+        opener = gzip.open if magic == GZIP_MAGIC else open
+        with opener(source, "rt", encoding=encoding) as handle:
+            yield handle
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        if hasattr(source, "peek"):
+            magic = source.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)]
+        else:
+            magic = source.read(len(GZIP_MAGIC))
+            source.seek(-len(magic), io.SEEK_CUR)
+        if magic == GZIP_MAGIC:
+            with io.TextIOWrapper(gzip.GzipFile(fileobj=source), encoding=encoding) as handle:
+                yield handle
+        else:
+            handle = io.TextIOWrapper(source, encoding=encoding)
+            try:
+                yield handle
+            finally:
+                # leave the callers file object open
+                handle.detach()
+
+
+@contextlib.contextmanager
+def open_bytes(path) -> typing.Iterator[typing.BinaryIO]:
+    """
+    Open a path for reading bytes, decompressing gzip
+    content.  Offsets from tell and seek are positions in
+    the decompressed content, seeking a gzip file
+    decompresses up to the offset.
+
+    :param path: path
+    :return: binary file object
+    """
+    with open(path, "rb") as raw:
+        magic = raw.read(len(GZIP_MAGIC))
+        raw.seek(0)
+        if magic == GZIP_MAGIC:
+            with gzip.GzipFile(fileobj=raw) as handle:
+                yield handle
+        else:
+            yield raw
+
+
+_validation_sample = None
+_validation_count = 0
+
+
+@contextlib.contextmanager
+def trusted(sample: typing.Optional[int] = None):
+    """
+    Construct objects without running their attrs
+    validators, for data that has already been validated
+    upstream.  With sample set every sample'th row passed
+    to validate_sample, starting with the first, is still
+    fully validated.
+
+    The switch is process wide, it is not thread local.
+
+    :param sample: validate one row in sample, None to never validate
+    :return: None
+    """
+    global _validation_sample, _validation_count
+    if sample is not None and sample < 1:
+        raise ValueError("sample must be at least 1 : {}".format(sample))
+    previous = attr.validators.get_disabled(), _validation_sample, _validation_count
+    attr.validators.set_disabled(True)
+    _validation_sample, _validation_count = sample, 0
+    try:
+        yield
+    finally:
+        disabled, _validation_sample, _validation_count = previous
+        attr.validators.set_disabled(disabled)
+
+
+def validate(value) -> None:
+    """
+    Run the attrs validators of an object and of the
+    attrs objects and lists of them it holds, even
+    inside a trusted block.
+
+    :param value: object to validate
+    :return: None, raises on an invalid value
+    """
+    disabled = attr.validators.get_disabled()
+    attr.validators.set_disabled(False)
+    try:
+        stack = [value]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, list):
+                stack.extend(value)
+            elif attr.has(type(value)):
+                attr.validate(value)
+                stack.extend(getattr(value, a.name) for a in attr.fields(type(value)))
+    finally:
+        attr.validators.set_disabled(disabled)
+
+
+def validate_sample(value: X) -> X:
+    """
+    Validate value if it is the sampled row of a
+    trusted block.
+
+    :param value: row
+    :return: value
+    """
+    global _validation_count
+    if _validation_sample is not None:
+        _validation_count += 1
+        if _validation_count % _validation_sample == 1 % _validation_sample:
+            validate(value)
+    return value
+
+
+def slotted(cls: typing.Type[X], name: typing.Optional[str] = None, **kwargs) -> typing.Type[X]:
+    """
+    Slotted sibling of an attrs class.  The attributes
+    of cls are redeclared on a new class with the same
+    bases, so the methods are shared through the bases
+    and the instances have no __dict__ as long as every
+    base defines __slots__.  It is not a subclass of cls,
+    and attrs equality also compares classes, so a slotted
+    instance is not equal to an instance of cls with the
+    same values.
+
+    :param cls: attrs class whose methods live in slotted bases
+    :param name: name of the class, defaults to Slotted + cls name
+    :param kwargs: further arguments to attr.s e.g. frozen, cache_hash
+    :return: slotted class
+    """
+    these = {a.name: attr.ib(default=a.default,
+                             validator=a.validator,
+                             repr=a.repr,
+                             eq=a.eq,
+                             order=a.order,
+                             hash=a.hash,
+                             init=a.init,
+                             metadata=a.metadata,
+                             type=a.type,
+                             converter=a.converter,
+                             kw_only=a.kw_only)
+             for a in attr.fields(cls)}
+    sibling = type(name or "Slotted" + cls.__name__, cls.__bases__, {"__module__": cls.__module__, "__doc__": cls.__doc__})
+    return attr.s(these=these, slots=True, **kwargs)(sibling)
+
+
+def convert_attrs(value, classes: typing.Dict[type, type], memo: typing.Optional[typing.Dict[typing.Any, typing.Any]] = None):
+    """
+    Copy a tree of attrs objects and lists, replacing
+    objects whose class is a key of classes with an
+    instance of the mapped class.  Hashable objects e.g.
+    frozen variants are memoized by value, so equal ones
+    are converted once and share the replacement.  The
+    memo holds them as keys, objects are never looked up
+    by id as an id can be reused once its object is freed.
+
+    :param value: value to convert
+    :param classes: class to replacement class
+    :param memo: converted hashable objects to their replacement
+    :return: converted value
     """
-    return "".join(char for char in value if ord(char) < 128)
+    memo = {} if memo is None else memo
+    if isinstance(value, list):
+        return [convert_attrs(v, classes, memo) for v in value]
+    target = classes.get(type(value))
+    if target is None:
+        return value
+    hashable = type(value).__hash__ is not None
+    converted = memo.get(value) if hashable else None
+    if converted is None:
+        converted = target(**{a.name.lstrip("_"): convert_attrs(getattr(value, a.name), classes, memo)
+                              for a in attr.fields(type(value)) if a.init})
+        if hashable:
+            memo[value] = converted
+    return converted
 
 
 class JSONifiable(object):
+    __slots__ = ()
+
     @abc.abstractmethod
     def json_rep(self):
         """
@@ -47,6 +389,8 @@ class JSONifiable(object):
 
 
 class Kwargs(object):
+    __slots__ = ()
+
     @abc.abstractmethod
     def kwargs_rep(self) -> typing.Dict[str, typing.Any]:
         """
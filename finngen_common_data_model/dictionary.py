@@ -0,0 +1,160 @@
+import typing
+
+import numpy as np
+
+# string fields of a colocalization with few distinct values
+DICTIONARY_FIELDS = ("source1", "source2",
+                     "phenotype1", "phenotype1_description",
+                     "phenotype2", "phenotype2_description",
+                     "quant1", "quant2",
+                     "tissue1", "tissue2",
+                     "source2_displayname")
+
+
+class StringDictionary(object):
+    """
+    Distinct strings numbered in order of first
+    appearance.  Each value is stored once, intern returns
+    that copy so rows holding the same value share it.
+    """
+
+    MISSING = -1
+
+    def __init__(self, values: typing.Iterable[str] = ()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.codes
+
+    def encode(self, value: str) -> int:
+        """
+        Code of a value, adding it if it is new.
+
+        :param value: string
+        :return: code
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: typing.Optional[str]) -> int:
+        """
+        Code of a value without adding it.
+
+        :param value: string
+        :return: code or MISSING
+        """
+        return self.codes.get(value, StringDictionary.MISSING)
+
+    def decode(self, code: int) -> typing.Optional[str]:
+        return None if code == StringDictionary.MISSING else self.values[code]
+
+    def intern(self, value: typing.Optional[str]) -> typing.Optional[str]:
+        """
+        The stored copy of a value, adding it if it is new.
+
+        :param value: string
+        :return: stored string, None for None
+        """
+        if value is None:
+            return None
+        return self.values[self.encode(value)]
+
+    def interning(self, f: typing.Callable[[str], str]) -> typing.Callable[[str], str]:
+        """
+        Converter applying f and interning the result.  f
+        is called once per distinct input.
+
+        :param f: converter e.g. only_ascii
+        :return: converter
+        """
+        converted = {}
+
+        def convert(value: str) -> str:
+            result = converted.get(value)
+            if result is None:
+                result = converted[value] = self.intern(f(value))
+            return result
+
+        return convert
+
+
+class DictionaryColumn(object):
+    """
+    Column of strings stored as int32 codes into a
+    StringDictionary, None is StringDictionary.MISSING.
+    Equality filters compare codes.
+    """
+
+    def __init__(self, codes: np.ndarray, dictionary: StringDictionary):
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.dictionary = dictionary
+
+    @staticmethod
+    def from_values(values: typing.Iterable[typing.Optional[str]],
+                    dictionary: typing.Optional[StringDictionary] = None) -> "DictionaryColumn":
+        """
+        :param values: strings or None
+        :param dictionary: dictionary to extend, a new one if None
+        :return: column
+        """
+        dictionary = StringDictionary() if dictionary is None else dictionary
+        encode = dictionary.encode
+        return DictionaryColumn([StringDictionary.MISSING if value is None else encode(value) for value in values],
+                                dictionary)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> typing.Optional[str]:
+        return self.dictionary.decode(int(self.codes[index]))
+
+    def to_list(self) -> typing.List[typing.Optional[str]]:
+        values = self.dictionary.values
+        return [None if code == StringDictionary.MISSING else values[code] for code in self.codes.tolist()]
+
+    def equal(self, value: typing.Optional[str], positions: typing.Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        :param value: string or None
+        :param positions: rows to compare, all rows if None
+        :return: boolean mask of the rows equal to value
+        """
+        codes = self.codes if positions is None else self.codes[positions]
+        code = StringDictionary.MISSING if value is None else self.dictionary.code(value)
+        if value is not None and code == StringDictionary.MISSING:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def isin(self, values: typing.Iterable[typing.Optional[str]]) -> np.ndarray:
+        """
+        :param values: strings or None
+        :return: boolean mask of rows equal to any of values
+        """
+        codes = {StringDictionary.MISSING if value is None else self.dictionary.code(value) for value in values
+                 if value is None or value in self.dictionary}
+        return np.isin(self.codes, list(codes))
+
+
+def dictionary_columns(colocalizations: typing.Sequence,
+                       fields: typing.Sequence[str] = DICTIONARY_FIELDS,
+                       dictionary: typing.Optional[StringDictionary] = None) -> typing.Dict[str, DictionaryColumn]:
+    """
+    Dictionary encode string fields of colocalizations,
+    all columns share one dictionary.
+
+    :param colocalizations: colocalizations
+    :param fields: fields to encode
+    :param dictionary: dictionary to extend, a new one if None
+    :return: field to column
+    """
+    dictionary = StringDictionary() if dictionary is None else dictionary
+    return {name: DictionaryColumn.from_values([getattr(c, name) for c in colocalizations], dictionary)
+            for name in fields}
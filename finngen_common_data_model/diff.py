@@ -0,0 +1,149 @@
+import collections
+import hashlib
+import typing
+
+import attr
+
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization
+
+# fields of a colocalization that are not content
+IGNORED_FIELDS = frozenset(["rel", "colocalization_id", "variants"])
+
+# fields identifying a colocalization across releases
+DEFAULT_KEY_FIELDS = ("source1", "source2",
+                      "phenotype1", "phenotype2",
+                      "quant1", "quant2",
+                      "tissue1", "tissue2",
+                      "locus_id1", "locus_id2")
+
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+ADDED = "added"
+REMOVED = "removed"
+
+
+def canonical(value) -> str:
+    """
+    Text of a field value for fingerprinting, floats use
+    repr so every bit is kept.
+    """
+    if value is None:
+        return "\x00"
+    if isinstance(value, float):
+        return repr(value)
+    if attr.has(type(value)):
+        return ":".join(canonical(v) for v in attr.astuple(value, recurse=False))
+    return str(value)
+
+
+def causal_variant_fingerprint(causal_variant: CausalVariant) -> str:
+    """
+    Canonical text of a causal variant without rel and
+    causal_variant_id.
+    """
+    cv = causal_variant
+    return "\x1f".join(canonical(v) for v in (cv.variant, cv.pip1, cv.beta1, cv.pip2, cv.beta2))
+
+
+def fingerprint(colocalization: Colocalization) -> bytes:
+    """
+    Content hash of a colocalization and its causal
+    variants.  rel and the ids are left out and the
+    variants are hashed in sorted order, so the same row
+    in two releases has the same fingerprint.
+
+    :param colocalization: colocalization
+    :return: 16 byte digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for a in attr.fields(type(colocalization)):
+        if a.name not in IGNORED_FIELDS:
+            digest.update(canonical(getattr(colocalization, a.name)).encode("utf-8"))
+            digest.update(b"\x1e")
+    for text in sorted(causal_variant_fingerprint(cv) for cv in colocalization.variants):
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.digest()
+
+
+def key_function(fields: typing.Sequence[str] = DEFAULT_KEY_FIELDS) -> typing.Callable[[Colocalization], typing.Tuple]:
+    """
+    :param fields: colocalization fields identifying a row
+    :return: function from a colocalization to its key
+    """
+    return lambda colocalization: tuple(canonical(getattr(colocalization, name)) for name in fields)
+
+
+@attr.s
+class Change(object):
+    """
+    Classification of a row of the new release.
+
+    status: UNCHANGED, CHANGED, ADDED or REMOVED
+    key: key of the row
+    colocalization: row of the new release, None if removed
+    previous_id: colocalization_id of the row in the old release, None if added
+    """
+    status = attr.ib()
+    key = attr.ib()
+    colocalization = attr.ib(default=None)
+    previous_id = attr.ib(default=None)
+
+
+def diff(old: typing.Iterable[Colocalization],
+         new: typing.Iterable[Colocalization],
+         key: typing.Optional[typing.Callable[[Colocalization], typing.Tuple]] = None) -> typing.Iterator[Change]:
+    """
+    Compare two releases.  Only the key, fingerprint and
+    id of each old row are kept, the new release is
+    streamed and classified as it is read, rows of the
+    old release that were not matched are reported as
+    removed at the end.  Rows sharing a key are matched
+    on their fingerprint first.
+
+    previous_id is the colocalization_id of the old row,
+    to apply the changes with ColocalizationLoader.load_changes
+    the old release has to carry the ids of the rows in the
+    database, e.g. as set when it was loaded.
+
+    :param old: colocalizations of the old release
+    :param new: colocalizations of the new release
+    :param key: function identifying a row, see key_function
+    :return: iterator of changes
+    """
+    key = key or key_function()
+    index = collections.defaultdict(list)
+    for colocalization in old:
+        index[key(colocalization)].append((fingerprint(colocalization), colocalization.colocalization_id))
+
+    for colocalization in new:
+        k = key(colocalization)
+        entries = index.get(k)
+        if not entries:
+            yield Change(ADDED, k, colocalization)
+            continue
+        digest = fingerprint(colocalization)
+        match = next((i for i, (d, _) in enumerate(entries) if d == digest), None)
+        if match is None:
+            _, previous_id = entries.pop(0)
+            yield Change(CHANGED, k, colocalization, previous_id)
+        else:
+            _, previous_id = entries.pop(match)
+            yield Change(UNCHANGED, k, colocalization, previous_id)
+        if not entries:
+            del index[k]
+
+    for k, entries in index.items():
+        for _, previous_id in entries:
+            yield Change(REMOVED, k, None, previous_id)
+
+
+def summary(changes: typing.Iterable[Change]) -> typing.Dict[str, int]:
+    """
+    :param changes: changes
+    :return: number of changes of each status
+    """
+    counts = {UNCHANGED: 0, CHANGED: 0, ADDED: 0, REMOVED: 0}
+    for change in changes:
+        counts[change.status] += 1
+    return counts
@@ -1,12 +1,16 @@
+import contextlib
+import functools
 import typing
 import re
+import zlib
 import typing
 
 import attr
+import numpy as np
 from attr.validators import instance_of
-from sqlalchemy import Column, Integer, String, SmallInteger
+from sqlalchemy import BigInteger, Column, Integer, String, SmallInteger
 
-from .data import JSONifiable, Kwargs
+from .data import JSONifiable, Kwargs, slotted
 
 CHROMOSOME_MAP = {'X': 23, 'Y': 24, 'M': 25, 'MT': 25,
                   '1': 1, '2': 2, '3': 3, '4': 4, '5': 5,
@@ -21,23 +25,11 @@ def string_to_chromosome(chromosome):
 
 
 # Variant
-@attr.s(frozen=True)
-class Variant(JSONifiable, Kwargs):
+class VariantMethods(JSONifiable, Kwargs):
     """
-
-    DTO containing variant information
-
+    Methods of Variant and SlottedVariant.
     """
-    chromosome = attr.ib(validator=instance_of(int))
-
-    @chromosome.validator
-    def chromosome_in_range(self, attribute, value):
-        if not 1 <= value < 26:
-            raise ValueError("value out of bounds")
-
-    position = attr.ib(validator=instance_of(int))
-    reference = attr.ib(validator=instance_of(str))
-    alternate = attr.ib(validator=instance_of(str))
+    __slots__ = ()
 
     PARSER = re.compile(r'''^(chr)?
                              (?P<chromosome>( M | MT | X | Y |
@@ -65,8 +57,75 @@ class Variant(JSONifiable, Kwargs):
         return str(Variant.from_str(text))
     
 
+    @staticmethod
+    def is_nucleotides(text: str) -> bool:
+        """
+        Check if a string is 1 to 1000 nucleotides, the
+        non-symbolic allele case of PARSER.
+
+        :param text: allele
+        :return: true if allele only contains A, T, G, C
+        """
+        return 0 < len(text) <= 1000 and not text.strip("ATGC")
+
+    @staticmethod
+    def from_fragments(fragments: typing.List[str]) -> typing.Optional[typing.Tuple[int, int, str, str]]:
+        """
+        Fast path for parsing a variant that has already
+        been split on a separator.  Only plain nucleotide
+        alleles are handled, None is returned for anything
+        else so the caller can fall back to PARSER.
+
+        :param fragments: chromosome, position, reference, alternate
+        :return: tuple (chromosome, position, reference, alternate) or None
+        """
+        if len(fragments) != 4:
+            return None
+        chromosome, position, reference, alternate = fragments
+        if chromosome.startswith("chr"):
+            chromosome = chromosome[3:]
+        if chromosome not in CHROMOSOME_MAP or \
+           not position.isdecimal() or \
+           not Variant.is_nucleotides(reference) or \
+           not Variant.is_nucleotides(alternate):
+            return None
+        return CHROMOSOME_MAP[chromosome], int(position), reference, alternate
+
     @staticmethod
     def from_str(text: str) -> typing.Optional["Variant"]:
+        """
+        Parse a variant, going through the interning cache
+        when it is enabled.
+
+        :param text: variant string
+        :return: variant
+        """
+        if _variant_cache is not None:
+            return _variant_cache(text)
+        return Variant.parse_str(text)
+
+    @staticmethod
+    def parse_str(text: str) -> typing.Optional["Variant"]:
+        chromosome, position, reference, alternate = Variant.parse_fields(text)
+        return Variant(chromosome=chromosome,
+                       position=position,
+                       reference=reference,
+                       alternate=alternate)
+
+    @staticmethod
+    def parse_fields(text: str) -> typing.Tuple[int, int, str, str]:
+        """
+        Parse a variant string into its fields without
+        constructing a variant.
+
+        :param text: variant string
+        :return: tuple (chromosome, position, reference, alternate)
+        """
+        # the common chr:pos:ref:alt and chr_pos_ref_alt forms
+        # are split directly, everything else goes through PARSER
+        fields = Variant.from_fragments(text.split(":")) or Variant.from_fragments(text.split("_"))
+        if fields is not None:
+            return fields
         fragments = Variant.PARSER.match(text)
         if fragments is None:
             raise Exception(text)
@@ -75,10 +134,28 @@ class Variant(JSONifiable, Kwargs):
             # We'd like to represent chromosomes as integers,
             # X should be mapped to 23, Y to 24 and M or MT to 25.
 
-            return Variant(chromosome=string_to_chromosome(fragments.group('chromosome')),
-                           position=int(fragments.group('position')),
-                           reference=fragments.group('reference'),
-                           alternate=fragments.group('alternate'))
+            return (string_to_chromosome(fragments.group('chromosome')),
+                    int(fragments.group('position')),
+                    fragments.group('reference'),
+                    fragments.group('alternate'))
+
+    @staticmethod
+    def from_strs(texts: typing.Iterable[str]) -> typing.List[typing.Union["Variant", Exception]]:
+        """
+        Parse a batch of variants.  A string that cannot be
+        parsed does not abort the batch, the exception
+        from_str would have raised is returned in its place.
+
+        :param texts: variant strings
+        :return: list of variants or exceptions in input order
+        """
+        result = []
+        for text in texts:
+            try:
+                result.append(Variant.from_str(text))
+            except Exception as e:
+                result.append(e)
+        return result
 
     def __str__(self) -> str:
         return "{chromosome}:{position}:{reference}:{alternate}".format(chromosome=self.chromosome,
@@ -87,10 +164,10 @@ class Variant(JSONifiable, Kwargs):
                                                                         alternate=self.alternate)
 
     def json_rep(self):
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
 
     def kwargs_rep(self) -> typing.Dict[str, typing.Any]:
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
 
     @staticmethod
     def sort_key(v):
@@ -117,25 +194,558 @@ class Variant(JSONifiable, Kwargs):
         return self.chromosome, self.position, self.reference, self.alternate
 
 
-# 
-@attr.s
-class Locus(JSONifiable, Kwargs):
+@attr.s(frozen=True)
+class Variant(VariantMethods):
     """
-        Chromosome coordinate range
 
-        chromosome: chromosome
-        start: start of range
-        stop: end of range
+    DTO containing variant information
+
     """
-    chromosome = attr.ib(validator=attr.validators.and_(instance_of(int)))
+    chromosome = attr.ib(validator=instance_of(int))
 
     @chromosome.validator
     def chromosome_in_range(self, attribute, value):
         if not 1 <= value < 26:
             raise ValueError("value out of bounds")
 
-    start = attr.ib(validator=instance_of(int))
-    stop = attr.ib(validator=instance_of(int))
+    position = attr.ib(validator=instance_of(int))
+    reference = attr.ib(validator=instance_of(str))
+    alternate = attr.ib(validator=instance_of(str))
+
+
+# Variant without an instance __dict__ and with a cached hash
+SlottedVariant = slotted(Variant, frozen=True, cache_hash=True)
+
+_variant_cache = None
+
+
+def enable_variant_interning(maxsize: typing.Optional[int] = 2 ** 20) -> None:
+    """
+    Route Variant.from_str through a LRU cache keyed on
+    the variant string, so repeated variants are parsed
+    once and share one (frozen) Variant instance.
+
+    :param maxsize: number of variants to keep, None for unbounded
+    :return: None
+    """
+    global _variant_cache
+    _variant_cache = functools.lru_cache(maxsize=maxsize)(Variant.parse_str)
+
+
+def disable_variant_interning() -> None:
+    """
+    Turn off variant interning and release the cache.
+    """
+    global _variant_cache
+    _variant_cache = None
+
+
+def variant_interning_info() -> typing.Optional[typing.Dict[str, typing.Optional[int]]]:
+    """
+    Hit and miss statistics of the variant cache.
+
+    :return: dict with hits, misses, maxsize, size or None if disabled
+    """
+    if _variant_cache is None:
+        return None
+    info = _variant_cache.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "maxsize": info.maxsize, "size": info.currsize}
+
+
+@contextlib.contextmanager
+def interned_variants(maxsize: typing.Optional[int] = 2 ** 20):
+    """
+    Enable variant interning for the duration of a block,
+    restoring the previous cache afterwards.
+
+    :param maxsize: number of variants to keep, None for unbounded
+    :return: None
+    """
+    global _variant_cache
+    previous = _variant_cache
+    enable_variant_interning(maxsize)
+    try:
+        yield
+    finally:
+        _variant_cache = previous
+
+
+class VariantArray(object):
+    """
+    Columnar container of variants.
+
+    chromosome: int8 array
+    position: int32 array
+    reference, alternate: int32 codes into alleles
+
+    alleles holds each distinct allele once in sorted
+    order, so comparing codes is the same as comparing
+    the allele strings.  Variant objects are only created
+    when an element is indexed.
+    """
+    KEY_DTYPE = np.dtype([('chromosome', np.int8),
+                          ('position', np.int32),
+                          ('reference', np.int64),
+                          ('alternate', np.int64)])
+
+    def __init__(self,
+                 chromosome: np.ndarray,
+                 position: np.ndarray,
+                 reference: np.ndarray,
+                 alternate: np.ndarray,
+                 alleles: np.ndarray):
+        self.chromosome = np.asarray(chromosome, dtype=np.int8)
+        self.position = np.asarray(position, dtype=np.int32)
+        self.reference = np.asarray(reference, dtype=np.int32)
+        self.alternate = np.asarray(alternate, dtype=np.int32)
+        self.alleles = alleles
+
+    @staticmethod
+    def from_fields(fields: typing.Iterable[typing.Tuple[int, int, str, str]]) -> "VariantArray":
+        """
+        Build from (chromosome, position, reference, alternate)
+        tuples.
+
+        :param fields: variant fields
+        :return: variant array
+        """
+        fields = list(fields)
+        n = len(fields)
+        if n == 0:
+            return VariantArray([], [], [], [], np.array([], dtype=object))
+        chromosome, position, reference, alternate = zip(*fields)
+        alleles = np.array(reference + alternate, dtype=object)
+        alleles, codes = np.unique(alleles, return_inverse=True)
+        return VariantArray(chromosome, position, codes[:n], codes[n:], alleles)
+
+    @staticmethod
+    def from_variants(variants: typing.Iterable[Variant]) -> "VariantArray":
+        """
+        Build from variant objects.
+
+        :param variants: variants
+        :return: variant array
+        """
+        return VariantArray.from_fields(Variant.sort_key(v) for v in variants)
+
+    @staticmethod
+    def from_strs(texts: typing.Iterable[str]) -> "VariantArray":
+        """
+        Build by parsing variant strings, no intermediate
+        variant objects are created.
+
+        :param texts: variant strings
+        :return: variant array
+        """
+        return VariantArray.from_fields(map(Variant.parse_fields, texts))
+
+    @staticmethod
+    def concatenate(arrays: typing.Sequence["VariantArray"]) -> "VariantArray":
+        """
+        Join variant arrays end to end, the alleles are
+        merged and the codes remapped.
+
+        :param arrays: variant arrays
+        :return: variant array
+        """
+        if not arrays:
+            return VariantArray.from_fields([])
+        offsets = np.cumsum([0] + [len(a.alleles) for a in arrays[:-1]])
+        alleles, codes = np.unique(np.concatenate([a.alleles for a in arrays]), return_inverse=True)
+        codes = codes.reshape(-1)
+        return VariantArray(np.concatenate([a.chromosome for a in arrays]),
+                            np.concatenate([a.position for a in arrays]),
+                            codes[np.concatenate([a.reference + o for a, o in zip(arrays, offsets)])],
+                            codes[np.concatenate([a.alternate + o for a, o in zip(arrays, offsets)])],
+                            alleles)
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def __getitem__(self, index):
+        """
+        An integer index materializes a variant, anything
+        else numpy accepts as an index (slice, mask, index
+        array) returns a variant array sharing the alleles.
+        """
+        if isinstance(index, (int, np.integer)):
+            chromosome, position, reference, alternate = self.fields(index)
+            return Variant(chromosome=chromosome, position=position, reference=reference, alternate=alternate)
+        return VariantArray(self.chromosome[index],
+                            self.position[index],
+                            self.reference[index],
+                            self.alternate[index],
+                            self.alleles)
+
+    def fields(self, index: int) -> typing.Tuple[int, int, str, str]:
+        """
+        Fields of one element without creating a variant.
+
+        :param index: index
+        :return: tuple (chromosome, position, reference, alternate)
+        """
+        return (int(self.chromosome[index]),
+                int(self.position[index]),
+                self.alleles[self.reference[index]],
+                self.alleles[self.alternate[index]])
+
+    def __iter__(self) -> typing.Iterator[Variant]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_variants(self) -> typing.List[Variant]:
+        return list(self)
+
+    def argsort(self) -> np.ndarray:
+        """
+        Indices that sort the array in Variant.sort_key order.
+
+        :return: index array
+        """
+        return np.lexsort((self.alternate, self.reference, self.position, self.chromosome))
+
+    def sort(self) -> "VariantArray":
+        return self[self.argsort()]
+
+    @staticmethod
+    def make_keys(chromosome, position, reference, alternate) -> np.ndarray:
+        keys = np.empty(len(position), dtype=VariantArray.KEY_DTYPE)
+        keys['chromosome'] = chromosome
+        keys['position'] = position
+        keys['reference'] = reference
+        keys['alternate'] = alternate
+        return keys
+
+    def keys(self) -> np.ndarray:
+        """
+        Structured array of (chromosome, position, reference,
+        alternate) that compares in Variant.sort_key order.
+        Allele codes are doubled, see query_keys.
+
+        :return: structured array
+        """
+        return VariantArray.make_keys(self.chromosome,
+                                      self.position,
+                                      2 * self.reference.astype(np.int64),
+                                      2 * self.alternate.astype(np.int64))
+
+    def unique(self) -> "VariantArray":
+        """
+        Sorted array without duplicate variants.
+
+        :return: variant array
+        """
+        ordered = self.sort()
+        keep = np.ones(len(ordered), dtype=bool)
+        keep[1:] = ((ordered.chromosome[1:] != ordered.chromosome[:-1]) |
+                    (ordered.position[1:] != ordered.position[:-1]) |
+                    (ordered.reference[1:] != ordered.reference[:-1]) |
+                    (ordered.alternate[1:] != ordered.alternate[:-1]))
+        return ordered[keep]
+
+    def query_keys(self, variants: typing.Union["VariantArray", typing.Iterable[Variant]]) -> np.ndarray:
+        """
+        Keys for variants from another source in terms of
+        this arrays alleles.  Codes are doubled so an allele
+        missing from this array gets the odd code between
+        its neighbours and still compares correctly.
+
+        :param variants: variants to encode
+        :return: structured array
+        """
+        if not isinstance(variants, VariantArray):
+            variants = VariantArray.from_variants(variants)
+
+        def recode(codes):
+            alleles = variants.alleles[codes]
+            rank = np.searchsorted(self.alleles, alleles).astype(np.int64)
+            found = rank < len(self.alleles)
+            found[found] = self.alleles[rank[found]] == alleles[found]
+            return np.where(found, 2 * rank, 2 * rank - 1)
+
+        return VariantArray.make_keys(variants.chromosome,
+                                      variants.position,
+                                      recode(variants.reference),
+                                      recode(variants.alternate))
+
+    def searchsorted(self,
+                     variants: typing.Union["VariantArray", typing.Iterable[Variant]],
+                     side: str = 'left') -> np.ndarray:
+        """
+        Find insertion points for variants, this array
+        must be sorted.
+
+        :param variants: variants to find
+        :param side: 'left' or 'right' as in numpy.searchsorted
+        :return: index array
+        """
+        return np.searchsorted(self.keys(), self.query_keys(variants), side=side)
+
+    def lookup(self, variants: typing.Union["VariantArray", typing.Iterable[Variant]]) -> np.ndarray:
+        """
+        Index of each variant in this sorted array or -1
+        if it is not present.
+
+        :param variants: variants to find
+        :return: index array
+        """
+        left = self.searchsorted(variants, 'left')
+        right = self.searchsorted(variants, 'right')
+        return np.where(left < right, left, -1)
+
+
+class VariantKeyTable(object):
+    """
+    Packs variants into non negative 64 bit integer keys.
+
+    bits 58..62 chromosome
+    bits 26..57 position
+    bits 0..25  alleles
+
+    Alleles of up to five A, C, G, T bases are stored
+    inline: bit 25 is 0, the reference is in bits 12..23
+    and the alternate in bits 0..11, each as base 5 digits
+    (A=1, C=2, G=3, T=4, 0 past the end).  Inline keys
+    compare in Variant.sort_key order, which covers SNVs
+    and short indels.
+
+    Other alleles set bit 25 and store a crc32 of the
+    alleles in bits 0..24.  These are recorded in a side
+    table, collisions are resolved by probing to the next
+    free value, so hashed keys need the table that made
+    them to be decoded.  At the same position hashed keys
+    sort after inline keys and in no particular order
+    among themselves.
+
+    A hashed key depends on the order variants were added,
+    it is only portable together with its table.  Store
+    the table next to the keys, with save / load for files
+    or to_rows / from_rows and columns for a database side
+    table.
+    """
+    CHROMOSOME_SHIFT = 58
+    POSITION_SHIFT = 26
+    POSITION_MASK = (1 << 32) - 1
+    HASHED = 1 << 25
+    HASH_MASK = HASHED - 1
+    REFERENCE_SHIFT = 12
+    ALLELE_MASK = (1 << 12) - 1
+    INLINE_LENGTH = 5
+    BASES = "ACGT"
+
+    def __init__(self):
+        self.hashed = {}
+        self.hashed_keys = {}
+
+    @staticmethod
+    def from_rows(rows: typing.Iterable[typing.Tuple[int, str, str]]) -> "VariantKeyTable":
+        """
+        Rebuild a table from the rows of to_rows.
+
+        :param rows: (key, reference, alternate)
+        :return: key table
+        """
+        table = VariantKeyTable()
+        for key, reference, alternate in rows:
+            key = int(key)
+            if not key & VariantKeyTable.HASHED:
+                raise ValueError("not a hashed variant key : {}".format(key))
+            fields = (key >> VariantKeyTable.CHROMOSOME_SHIFT,
+                      (key >> VariantKeyTable.POSITION_SHIFT) & VariantKeyTable.POSITION_MASK,
+                      reference,
+                      alternate)
+            table.hashed[key] = fields
+            table.hashed_keys[fields] = key
+        return table
+
+    def to_rows(self) -> typing.List[typing.Tuple[int, str, str]]:
+        """
+        The hashed variants in key order, the chromosome and
+        position are part of the key.
+
+        :return: (key, reference, alternate)
+        """
+        return [(key, reference, alternate) for key, (_, _, reference, alternate) in sorted(self.hashed.items())]
+
+    @staticmethod
+    def columns(prefix: typing.Optional[str] = None) -> typing.List[Column]:
+        """
+        Columns of a side table holding the rows of to_rows.
+        """
+        prefix = prefix if prefix is not None else ""
+        return [Column('{}variant_key'.format(prefix), BigInteger, primary_key=True, autoincrement=False),
+                Column('{}ref'.format(prefix), String(1000), nullable=False),
+                Column('{}alt'.format(prefix), String(1000), nullable=False)]
+
+    def arrays(self) -> typing.Dict[str, np.ndarray]:
+        """
+        The hashed variants as arrays, e.g. to store with
+        np.savez next to arrays of keys.
+
+        :return: hashed_keys and hashed_alleles arrays
+        """
+        rows = self.to_rows()
+        return {"hashed_keys": np.array([key for key, _, _ in rows], dtype=np.int64),
+                "hashed_alleles": np.array(["{}\t{}".format(reference, alternate) for _, reference, alternate in rows],
+                                           dtype=str)}
+
+    @staticmethod
+    def from_arrays(hashed_keys: np.ndarray, hashed_alleles: np.ndarray) -> "VariantKeyTable":
+        """
+        Rebuild a table from the arrays of arrays.
+        """
+        return VariantKeyTable.from_rows((key, *alleles.split("\t"))
+                                         for key, alleles in zip(hashed_keys.tolist(), hashed_alleles.tolist()))
+
+    def save(self, path) -> None:
+        """
+        Save to a numpy .npz file.
+
+        :param path: output path
+        :return: None
+        """
+        np.savez(path, **self.arrays())
+
+    @staticmethod
+    def load(path) -> "VariantKeyTable":
+        """
+        Load a table written by save.
+
+        :param path: path
+        :return: key table
+        """
+        with np.load(path) as data:
+            return VariantKeyTable.from_arrays(data['hashed_keys'], data['hashed_alleles'])
+
+    @staticmethod
+    def allele_code(allele: str) -> int:
+        """
+        Inline code of an allele or -1 if it does not fit.
+
+        :param allele: allele
+        :return: code
+        """
+        if len(allele) > VariantKeyTable.INLINE_LENGTH or not Variant.is_nucleotides(allele):
+            return -1
+        code = 0
+        for i in range(VariantKeyTable.INLINE_LENGTH):
+            code = code * 5 + (VariantKeyTable.BASES.index(allele[i]) + 1 if i < len(allele) else 0)
+        return code
+
+    @staticmethod
+    def allele_from_code(code: int) -> str:
+        digits = []
+        for _ in range(VariantKeyTable.INLINE_LENGTH):
+            code, digit = divmod(code, 5)
+            digits.append(digit)
+        return "".join(VariantKeyTable.BASES[d - 1] for d in reversed(digits) if d)
+
+    @staticmethod
+    def locus_key(chromosome: int, position: int) -> int:
+        if not 0 <= position <= VariantKeyTable.POSITION_MASK:
+            raise ValueError("position out of bounds : {}".format(position))
+        return (chromosome << VariantKeyTable.CHROMOSOME_SHIFT) | (position << VariantKeyTable.POSITION_SHIFT)
+
+    def encode_fields(self, chromosome: int, position: int, reference: str, alternate: str) -> int:
+        locus_key = VariantKeyTable.locus_key(chromosome, position)
+        reference_code = VariantKeyTable.allele_code(reference)
+        alternate_code = VariantKeyTable.allele_code(alternate)
+        if reference_code >= 0 and alternate_code >= 0:
+            return locus_key | (reference_code << VariantKeyTable.REFERENCE_SHIFT) | alternate_code
+        fields = (chromosome, position, reference, alternate)
+        key = self.hashed_keys.get(fields)
+        if key is None:
+            code = zlib.crc32("{}\t{}".format(reference, alternate).encode("utf-8")) & VariantKeyTable.HASH_MASK
+            while locus_key | VariantKeyTable.HASHED | code in self.hashed:
+                code = (code + 1) & VariantKeyTable.HASH_MASK
+            key = locus_key | VariantKeyTable.HASHED | code
+            self.hashed[key] = fields
+            self.hashed_keys[fields] = key
+        return key
+
+    def encode(self, variant: Variant) -> int:
+        """
+        Key of a variant, hashed alleles are added to
+        the side table.
+
+        :param variant: variant
+        :return: key
+        """
+        return self.encode_fields(*Variant.sort_key(variant))
+
+    def decode_fields(self, key: int) -> typing.Tuple[int, int, str, str]:
+        key = int(key)
+        if key & VariantKeyTable.HASHED:
+            fields = self.hashed.get(key)
+            if fields is None:
+                raise KeyError("unknown variant key : {}".format(key))
+            return fields
+        return (key >> VariantKeyTable.CHROMOSOME_SHIFT,
+                (key >> VariantKeyTable.POSITION_SHIFT) & VariantKeyTable.POSITION_MASK,
+                VariantKeyTable.allele_from_code((key >> VariantKeyTable.REFERENCE_SHIFT) & VariantKeyTable.ALLELE_MASK),
+                VariantKeyTable.allele_from_code(key & VariantKeyTable.ALLELE_MASK))
+
+    def decode(self, key: int) -> Variant:
+        """
+        Variant of a key.
+
+        :param key: key
+        :return: variant
+        """
+        chromosome, position, reference, alternate = self.decode_fields(key)
+        return Variant(chromosome=chromosome, position=position, reference=reference, alternate=alternate)
+
+    def encode_array(self, variants: VariantArray) -> np.ndarray:
+        """
+        Keys of a variant array as an int64 array.  Alleles
+        are encoded once per distinct allele, only variants
+        with hashed alleles are handled one at a time.
+
+        :param variants: variant array
+        :return: int64 array of keys
+        """
+        codes = np.array([VariantKeyTable.allele_code(a) for a in variants.alleles], dtype=np.int64)
+        reference = codes[variants.reference]
+        alternate = codes[variants.alternate]
+        position = variants.position.astype(np.int64)
+        if np.any(position < 0):
+            raise ValueError("position out of bounds")
+        keys = ((variants.chromosome.astype(np.int64) << VariantKeyTable.CHROMOSOME_SHIFT) |
+                (position << VariantKeyTable.POSITION_SHIFT) |
+                (reference << VariantKeyTable.REFERENCE_SHIFT) |
+                alternate)
+        for i in np.flatnonzero((reference < 0) | (alternate < 0)):
+            keys[i] = self.encode_fields(*variants.fields(i))
+        return keys
+
+    def decode_array(self, keys: np.ndarray) -> VariantArray:
+        """
+        Variant array of int64 keys.
+
+        :param keys: keys
+        :return: variant array
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        chromosome = keys >> VariantKeyTable.CHROMOSOME_SHIFT
+        position = (keys >> VariantKeyTable.POSITION_SHIFT) & VariantKeyTable.POSITION_MASK
+        reference = (keys >> VariantKeyTable.REFERENCE_SHIFT) & VariantKeyTable.ALLELE_MASK
+        alternate = keys & VariantKeyTable.ALLELE_MASK
+        decoded = {code: VariantKeyTable.allele_from_code(code) for code in np.unique(np.concatenate((reference, alternate)))}
+        reference = np.array([decoded[code] for code in reference], dtype=object)
+        alternate = np.array([decoded[code] for code in alternate], dtype=object)
+        for i in np.flatnonzero(keys & VariantKeyTable.HASHED):
+            _, _, reference[i], alternate[i] = self.decode_fields(keys[i])
+        n = len(keys)
+        alleles, codes = np.unique(np.concatenate((reference, alternate)), return_inverse=True)
+        return VariantArray(chromosome, position, codes[:n], codes[n:], alleles)
+
+
+# 
+class LocusMethods(JSONifiable, Kwargs):
+    """
+    Methods of Locus and SlottedLocus.
+    """
+    __slots__ = ()
 
     PARSER = re.compile(r'''^(chr)?
                              (?P<chromosome>( M | MT | X | Y |
@@ -189,10 +799,10 @@ class Locus(JSONifiable, Kwargs):
                                                     stop=self.stop)
 
     def json_rep(self):
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
 
     def kwargs_rep(self) -> typing.Dict[str, typing.Any]:
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
 
     @staticmethod
     def columns(prefix: typing.Optional[str] = None) -> typing.List[Column]:
@@ -209,3 +819,27 @@ class Locus(JSONifiable, Kwargs):
         :return: tuple (chromosome, start, stop)
         """
         return self.chromosome, self.start, self.stop
+
+
+@attr.s
+class Locus(LocusMethods):
+    """
+        Chromosome coordinate range
+
+        chromosome: chromosome
+        start: start of range
+        stop: end of range
+    """
+    chromosome = attr.ib(validator=attr.validators.and_(instance_of(int)))
+
+    @chromosome.validator
+    def chromosome_in_range(self, attribute, value):
+        if not 1 <= value < 26:
+            raise ValueError("value out of bounds")
+
+    start = attr.ib(validator=instance_of(int))
+    stop = attr.ib(validator=instance_of(int))
+
+
+# Locus without an instance __dict__
+SlottedLocus = slotted(Locus)
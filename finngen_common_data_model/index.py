@@ -0,0 +1,339 @@
+import typing
+
+import numpy as np
+
+from finngen_common_data_model.analytics import credible_set
+from finngen_common_data_model.colocalization import Colocalization, ColocalizationMethods
+from finngen_common_data_model.data import chunked
+from finngen_common_data_model.genomics import Locus, Variant, VariantArray, VariantKeyTable
+
+X = typing.TypeVar('X')
+
+
+def item_locus(item: typing.Union[Colocalization, Locus, typing.Tuple]) -> Locus:
+    """
+    Locus of a colocalization, of a record with chrom,
+    start and stop fields, or a locus itself.
+
+    :param item: colocalization, record or locus
+    :return: locus
+    """
+    if isinstance(item, ColocalizationMethods):
+        return item.locus
+    if hasattr(item, "chrom"):
+        return Locus(item.chrom, item.start, item.stop)
+    return item
+
+
+class IntervalTree(object):
+    """
+    Implicit augmented interval tree over closed intervals
+    on one chromosome.
+
+    Intervals are sorted by start and laid out as an in
+    order binary tree: the node at index i on level k has
+    children i - 2^(k-1) and i + 2^(k-1).  max_stop[i] is
+    the largest stop in the subtree of i.  Overlap queries
+    take O(log n + k).
+    """
+
+    # subtrees at or below this level are scanned linearly
+    SCAN_LEVEL = 2
+
+    def __init__(self, starts: np.ndarray, stops: np.ndarray, indices: np.ndarray):
+        order = np.lexsort((stops, starts))
+        self.starts = np.asarray(starts, dtype=np.int64)[order]
+        self.stops = np.asarray(stops, dtype=np.int64)[order]
+        self.indices = np.asarray(indices, dtype=np.int64)[order]
+        self.max_stop = self.stops.copy()
+        n = len(self.starts)
+        self.max_level = 0
+        while (1 << (self.max_level + 1)) <= n:
+            self.max_level += 1
+        for k in range(1, self.max_level + 1):
+            nodes = np.arange((1 << k) - 1, n, 1 << (k + 1))
+            lo = nodes - ((1 << k) - 1)
+            hi = np.minimum(nodes + (1 << k), n)
+            bounds = np.empty(2 * len(nodes), dtype=np.int64)
+            bounds[0::2] = lo
+            bounds[1::2] = hi
+            # reduceat also reduces the gaps between subtrees, drop them
+            self.max_stop[nodes] = np.maximum.reduceat(self.stops, bounds[bounds < n])[0::2]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlap(self, start: int, stop: int) -> typing.List[int]:
+        """
+        Indices of intervals overlapping [start, stop].
+
+        :param start: start of region
+        :param stop: end of region
+        :return: list of indices
+        """
+        starts, stops, max_stop, n = self.starts, self.stops, self.max_stop, len(self.starts)
+        result = []
+        if n == 0:
+            return result
+        # stack of (level, node, visited left)
+        stack = [(self.max_level, (1 << self.max_level) - 1, False)]
+        while stack:
+            k, x, visited = stack.pop()
+            if k <= IntervalTree.SCAN_LEVEL:
+                i = x - ((1 << k) - 1)
+                end = min(x + (1 << k), n)
+                while i < end and starts[i] <= stop:
+                    if stops[i] >= start:
+                        result.append(i)
+                    i += 1
+            elif not visited:
+                y = x - (1 << (k - 1))
+                stack.append((k, x, True))
+                if y >= n or max_stop[y] >= start:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] <= stop:
+                if stops[x] >= start:
+                    result.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return self.indices[result].tolist()
+
+
+class LocusIndex(typing.Generic[X]):
+    """
+    Per chromosome interval index over loci.  Each locus
+    is stored with a value, e.g. the colocalization it
+    belongs to, and queries return the values in input
+    order.
+    """
+
+    def __init__(self, loci: typing.Iterable[Locus], values: typing.Optional[typing.Iterable[X]] = None):
+        loci = list(loci)
+        self.values = loci if values is None else list(values)
+        if len(self.values) != len(loci):
+            raise ValueError("expected {} values found {}".format(len(loci), len(self.values)))
+        chromosomes = np.array([locus.chromosome for locus in loci], dtype=np.int8)
+        self.starts = np.array([locus.start for locus in loci], dtype=np.int64)
+        self.stops = np.array([locus.stop for locus in loci], dtype=np.int64)
+        self.trees = {}
+        for chromosome in np.unique(chromosomes):
+            indices = np.flatnonzero(chromosomes == chromosome)
+            self.trees[int(chromosome)] = IntervalTree(self.starts[indices], self.stops[indices], indices)
+
+    @staticmethod
+    def build(items: typing.Iterable[typing.Union[Colocalization, Locus, typing.Tuple]]) -> "LocusIndex":
+        """
+        Index colocalizations by their locus, records of
+        read_colocalization_records by chrom, start and
+        stop, or loci by themselves.
+
+        :param items: colocalizations, records or loci
+        :return: locus index
+        """
+        items = list(items)
+        return LocusIndex([item_locus(item) for item in items], items)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def overlap_indices(self, chromosome: int, start: int, stop: int) -> typing.List[int]:
+        """
+        Input positions of loci overlapping a region, in
+        input order.
+
+        :param chromosome: chromosome
+        :param start: start of region
+        :param stop: end of region
+        :return: sorted list of indices
+        """
+        tree = self.trees.get(chromosome)
+        return [] if tree is None else sorted(tree.overlap(start, stop))
+
+    def overlap(self, chromosome: int, start: int, stop: int) -> typing.List[X]:
+        """
+        Values whose locus overlaps [start, stop].
+
+        :param chromosome: chromosome
+        :param start: start of region
+        :param stop: end of region
+        :return: values
+        """
+        return [self.values[i] for i in self.overlap_indices(chromosome, start, stop)]
+
+    def within(self, chromosome: int, start: int, stop: int) -> typing.List[X]:
+        """
+        Values whose locus lies inside [start, stop].
+
+        :param chromosome: chromosome
+        :param start: start of region
+        :param stop: end of region
+        :return: values
+        """
+        return [self.values[i] for i in self.overlap_indices(chromosome, start, stop)
+                if start <= self.starts[i] and self.stops[i] <= stop]
+
+    def containing(self, chromosome: int, start: int, stop: int) -> typing.List[X]:
+        """
+        Values whose locus contains [start, stop].
+
+        :param chromosome: chromosome
+        :param start: start of region
+        :param stop: end of region
+        :return: values
+        """
+        return [self.values[i] for i in self.overlap_indices(chromosome, start, stop)
+                if self.starts[i] <= start and stop <= self.stops[i]]
+
+    def at(self, variant: Variant) -> typing.List[X]:
+        """
+        Values whose locus contains the position of a variant.
+
+        :param variant: variant
+        :return: values
+        """
+        return self.overlap(variant.chromosome, variant.position, variant.position)
+
+    def query(self, region: typing.Union[str, Locus]) -> typing.List[X]:
+        """
+        Values whose locus overlaps a region.
+
+        :param region: locus or region string e.g. 15:78464464-78864464
+        :return: values
+        """
+        locus = Locus.from_str(region) if isinstance(region, str) else region
+        return self.overlap(locus.chromosome, locus.start, locus.stop)
+
+
+class VariantIndex(object):
+    """
+    Inverted index from causal variant to the
+    colocalizations whose credible set contains it.
+
+    keys: sorted int64 VariantKeyTable keys of the distinct variants
+    offsets: postings of keys[i] are postings[offsets[i]:offsets[i + 1]]
+    postings: structured array of posting_dtype() ordered by
+              key then colocalization_id, NaN for a missing
+              pip or beta
+
+    Lookups are a binary search and return a view of the
+    postings.
+    """
+
+    @staticmethod
+    def posting_dtype(dtype=np.float64) -> np.dtype:
+        return np.dtype([('colocalization_id', np.int64),
+                         ('pip1', dtype),
+                         ('beta1', dtype),
+                         ('pip2', dtype),
+                         ('beta2', dtype)])
+
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray, postings: np.ndarray, table: VariantKeyTable):
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self.table = table
+
+    @staticmethod
+    def build(colocalizations: typing.Iterable[Colocalization],
+              chunk_size: int = 100000,
+              dtype=np.float64) -> "VariantIndex":
+        """
+        Build from a stream of colocalizations, e.g.
+        read_colocalizations(..., compact=True), processed
+        chunk_size at a time.  A colocalization without an
+        id is posted under its position in the stream.
+
+        :param colocalizations: colocalizations
+        :param chunk_size: colocalizations per chunk
+        :param dtype: float dtype of the pips and betas, e.g. float32 to halve their size
+        :return: variant index
+        """
+        posting_dtype = VariantIndex.posting_dtype(dtype)
+        table = VariantKeyTable()
+        keys = []
+        postings = []
+        position = 0
+        for chunk in chunked(colocalizations, chunk_size):
+            sets = [credible_set(c.variants) for c in chunk]
+            ids = [position + i if c.colocalization_id is None else c.colocalization_id for i, c in enumerate(chunk)]
+            position += len(chunk)
+            sizes = [len(s) for s in sets]
+            keys.append(table.encode_array(VariantArray.concatenate([s.variants for s in sets])))
+            chunk_postings = np.empty(sum(sizes), dtype=posting_dtype)
+            chunk_postings['colocalization_id'] = np.repeat(np.array(ids, dtype=np.int64), sizes)
+            for name in ('pip1', 'beta1', 'pip2', 'beta2'):
+                chunk_postings[name] = np.concatenate([getattr(s, name) for s in sets]) if sets else []
+            postings.append(chunk_postings)
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+        postings = np.concatenate(postings) if postings else np.empty(0, dtype=posting_dtype)
+        order = np.lexsort((postings['colocalization_id'], keys))
+        keys = keys[order]
+        postings = postings[order]
+        unique, starts = np.unique(keys, return_index=True)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        return VariantIndex(unique, offsets, postings, table)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def key(self, variant: Variant) -> typing.Optional[int]:
+        """
+        Key of a variant without adding it to the key
+        table, None for hashed alleles the table has not
+        seen.
+
+        :param variant: variant
+        :return: key
+        """
+        fields = Variant.sort_key(variant)
+        reference_code = VariantKeyTable.allele_code(fields[2])
+        alternate_code = VariantKeyTable.allele_code(fields[3])
+        if reference_code < 0 or alternate_code < 0:
+            return self.table.hashed_keys.get(fields)
+        return self.table.encode_fields(*fields)
+
+    def lookup(self, variant: typing.Union[Variant, int]) -> np.ndarray:
+        """
+        Postings of a variant or key.
+
+        :param variant: variant or key
+        :return: view of the postings, empty if the variant is not in any credible set
+        """
+        key = variant if isinstance(variant, (int, np.integer)) else self.key(variant)
+        if key is not None:
+            i = np.searchsorted(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                return self.postings[self.offsets[i]:self.offsets[i + 1]]
+        return self.postings[:0]
+
+    def colocalization_ids(self, variant: typing.Union[Variant, int]) -> np.ndarray:
+        return self.lookup(variant)['colocalization_id']
+
+    def variants(self) -> VariantArray:
+        """
+        The distinct variants in key order.
+
+        :return: variant array
+        """
+        return self.table.decode_array(self.keys)
+
+    def save(self, path) -> None:
+        """
+        Save to a numpy .npz file, the key table is saved
+        with it.
+
+        :param path: output path
+        :return: None
+        """
+        np.savez(path, keys=self.keys, offsets=self.offsets, postings=self.postings, **self.table.arrays())
+
+    @staticmethod
+    def load(path) -> "VariantIndex":
+        """
+        Load an index written by save.
+
+        :param path: path
+        :return: variant index
+        """
+        with np.load(path) as data:
+            table = VariantKeyTable.from_arrays(data['hashed_keys'], data['hashed_alleles'])
+            return VariantIndex(data['keys'], data['offsets'], data['postings'], table)
@@ -0,0 +1,222 @@
+import contextlib
+import cProfile
+import functools
+import pstats
+import time
+import typing
+
+from finngen_common_data_model import serialize
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization, CredibleSet
+from finngen_common_data_model.data import RowDecoder
+from finngen_common_data_model.genomics import Variant
+
+
+class Instrumentation(object):
+    """
+    Timers and counters of the parse and serialize stages.
+
+    stages: name to calls, errors and seconds, times of a
+            stage include the stages it calls.  decode covers
+            the column converters of RowDecoder, e.g. only_ascii
+            and the locus_id variants
+    counters:
+      rows: colocalizations decoded
+      variants: causal variants of the decoded colocalizations
+      na_values: decoded values that were missing
+      parse_errors: failed parses, counted once by the outermost stage
+
+    With profile_every set one in that many calls of the
+    top level stages runs under cProfile, see profile_stats.
+    """
+
+    def __init__(self, profile_every: typing.Optional[int] = None):
+        self.profile_every = profile_every
+        self.profiler = cProfile.Profile() if profile_every else None
+        self.profiled = 0
+        self.depth = 0
+        self.stages = {}
+        self.counters = {"rows": 0, "variants": 0, "na_values": 0, "parse_errors": 0}
+
+    def stage(self, name: str) -> typing.Dict[str, typing.Any]:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {"calls": 0, "errors": 0, "seconds": 0.0}
+        return stage
+
+    def wrap(self, name: str, f: typing.Callable, parse: bool = False, profile: bool = False) -> typing.Callable:
+        """
+        Time calls of f as the named stage.
+
+        :param name: stage name
+        :param f: function
+        :param parse: count exceptions as parse errors
+        :param profile: sample calls with cProfile
+        :return: wrapped function
+        """
+        stage = self.stage(name)
+        clock = time.perf_counter
+        sample = profile and self.profiler is not None
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            stage["calls"] += 1
+            profiling = sample and self.depth == 0 and stage["calls"] % self.profile_every == 0
+            self.depth += 1
+            if profiling:
+                self.profiled += 1
+                self.profiler.enable()
+            start = clock()
+            try:
+                return f(*args, **kwargs)
+            except Exception:
+                stage["errors"] += 1
+                if parse and self.depth == 1:
+                    self.counters["parse_errors"] += 1
+                raise
+            finally:
+                stage["seconds"] += clock() - start
+                if profiling:
+                    self.profiler.disable()
+                self.depth -= 1
+
+        return wrapper
+
+    def profile_stats(self) -> typing.Optional[pstats.Stats]:
+        """
+        Profile of the sampled calls, e.g.
+        profile_stats().sort_stats('cumulative').print_stats(20)
+
+        :return: stats or None if nothing was sampled
+        """
+        if self.profiler is None or self.profiled == 0:
+            return None
+        return pstats.Stats(self.profiler)
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {"stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "counters": dict(self.counters),
+                "profiled_calls": self.profiled}
+
+    def prometheus(self, prefix: str = "finngen_cdm") -> str:
+        """
+        The timers and counters in the prometheus text
+        exposition format.
+
+        :param prefix: metric name prefix
+        :return: text
+        """
+        lines = []
+
+        def metric(name, help, samples):
+            lines.append("# HELP {}_{} {}".format(prefix, name, help))
+            lines.append("# TYPE {}_{} counter".format(prefix, name))
+            for labels, value in samples:
+                lines.append("{}_{}{} {}".format(prefix, name, labels, value))
+
+        for key, help in (("calls", "Calls of a stage."),
+                          ("errors", "Calls of a stage that raised."),
+                          ("seconds", "Time spent in a stage including the stages it calls.")):
+            metric("stage_{}_total".format(key),
+                   help,
+                   [('{{stage="{}"}}'.format(name), stage[key]) for name, stage in sorted(self.stages.items())])
+        for name, value in self.counters.items():
+            metric("{}_total".format(name), "Count of {}.".format(name.replace("_", " ")), [("", value)])
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for stage in self.stages.values():
+            stage.update(calls=0, errors=0, seconds=0.0)
+        for name in self.counters:
+            self.counters[name] = 0
+        if self.profiler is not None:
+            self.profiler = cProfile.Profile()
+            self.profiled = 0
+
+
+_instrumentation = None
+# (owner, attribute name, original value) of everything replaced
+_originals = []
+
+
+def _replace(owner, name: str, value) -> None:
+    # replace on the class defining the attribute e.g. ColocalizationMethods
+    owner = next(klass for klass in getattr(owner, "__mro__", [owner]) if name in klass.__dict__)
+    _originals.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, value)
+
+
+def enable_instrumentation(profile_every: typing.Optional[int] = None) -> Instrumentation:
+    """
+    Replace the hot path functions with timed versions.
+    Nothing is wrapped while disabled so there is no
+    cost, callers holding a direct reference to a function
+    e.g. from an earlier `from ... import to_json` are not
+    instrumented.
+
+    :param profile_every: profile one in this many top level calls
+    :return: instrumentation collecting the statistics
+    """
+    global _instrumentation
+    disable_instrumentation()
+    instrumentation = Instrumentation(profile_every)
+    counters = instrumentation.counters
+
+    from_list = instrumentation.wrap("colocalization_from_list", Colocalization.from_list, parse=True, profile=True)
+
+    def colocalization_from_list(*args, **kwargs):
+        colocalization = from_list(*args, **kwargs)
+        counters["rows"] += 1
+        counters["variants"] += len(colocalization.variants)
+        return colocalization
+
+    decode = instrumentation.wrap("decode", RowDecoder.decode, parse=True)
+
+    def row_decode(self, line):
+        values = decode(self, line)
+        counters["na_values"] += values.count(None)
+        return values
+
+    _replace(Variant, "from_str", staticmethod(instrumentation.wrap("variant_from_str", Variant.from_str, parse=True)))
+    _replace(CausalVariant, "from_list",
+             staticmethod(instrumentation.wrap("causal_variant_from_list", CausalVariant.from_list, parse=True)))
+    _replace(CredibleSet, "from_strs",
+             staticmethod(instrumentation.wrap("credible_set_from_strs", CredibleSet.from_strs, parse=True)))
+    _replace(Colocalization, "from_list",
+             staticmethod(functools.wraps(Colocalization.from_list)(colocalization_from_list)))
+    _replace(RowDecoder, "decode", functools.wraps(RowDecoder.decode)(row_decode))
+    _replace(Colocalization, "json_rep", instrumentation.wrap("json_rep", Colocalization.json_rep, profile=True))
+    _replace(serialize, "to_json", instrumentation.wrap("to_json", serialize.to_json, profile=True))
+    _instrumentation = instrumentation
+    return instrumentation
+
+
+def disable_instrumentation() -> None:
+    """
+    Restore the original functions.
+    """
+    global _instrumentation
+    while _originals:
+        owner, name, value = _originals.pop()
+        setattr(owner, name, value)
+    _instrumentation = None
+
+
+def instrumentation() -> typing.Optional[Instrumentation]:
+    """
+    :return: the active instrumentation or None if disabled
+    """
+    return _instrumentation
+
+
+@contextlib.contextmanager
+def instrumented(profile_every: typing.Optional[int] = None):
+    """
+    Enable instrumentation for the duration of a block.
+
+    :param profile_every: profile one in this many top level calls
+    :return: instrumentation
+    """
+    try:
+        yield enable_instrumentation(profile_every)
+    finally:
+        disable_instrumentation()
@@ -0,0 +1,401 @@
+import io
+import time
+import typing
+
+import attr
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, MetaData, SmallInteger, String, Table, func
+
+from finngen_common_data_model.colocalization import CausalVariant, Colocalization, read_colocalization_offsets
+from finngen_common_data_model.data import chunked
+from finngen_common_data_model.diff import ADDED, CHANGED, REMOVED, Change
+from finngen_common_data_model.genomics import Variant
+
+
+@attr.s
+class LoadStatistics(object):
+    """
+    Summary of a load.
+
+    colocalizations: colocalization rows written
+    causal_variants: causal variant rows written
+    seconds: wall clock time of the load
+    """
+    colocalizations = attr.ib(default=0)
+    causal_variants = attr.ib(default=0)
+    seconds = attr.ib(default=0.0)
+
+    def rows_per_second(self) -> float:
+        rows = self.colocalizations + self.causal_variants
+        return rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@attr.s
+class Checkpoint(object):
+    """
+    Position of a file load, written in the same
+    transaction as each batch.
+
+    source: name of the file being loaded
+    rel: release
+    byte_offset: offset of the first line not loaded yet
+    colocalization_id: last colocalization id assigned
+    causal_variant_id: last causal variant id assigned
+    rows: colocalizations loaded from the file
+    """
+    source = attr.ib()
+    rel = attr.ib()
+    byte_offset = attr.ib(default=0)
+    colocalization_id = attr.ib(default=0)
+    causal_variant_id = attr.ib(default=0)
+    rows = attr.ib(default=0)
+
+
+def variant_values(prefix: str, variant: typing.Optional[Variant]) -> typing.Dict[str, typing.Any]:
+    values = variant.__composite_values__() if variant is not None else (None, None, None, None)
+    return dict(zip(["{}chromosome".format(prefix),
+                     "{}position".format(prefix),
+                     "{}ref".format(prefix),
+                     "{}alt".format(prefix)], values))
+
+
+def colocalization_values(colocalization: Colocalization, colocalization_id: int) -> typing.Dict[str, typing.Any]:
+    """
+    Flatten a colocalization into the columns of
+    Colocalization.columns().
+
+    :param colocalization: colocalization
+    :param colocalization_id: id to assign
+    :return: column name to value
+    """
+    c = colocalization
+    return {"rel": c.rel,
+            "colocalization_id": colocalization_id,
+            "source1": c.source1,
+            "source2": c.source2,
+            "phenotype1": c.phenotype1,
+            "phenotype1_description": c.phenotype1_description,
+            "phenotype2": c.phenotype2,
+            "phenotype2_description": c.phenotype2_description,
+            "quant1": c.quant1,
+            "quant2": c.quant2,
+            "tissue1": c.tissue1,
+            "tissue2": c.tissue2,
+            **variant_values("locus_id1_", c.locus_id1),
+            **variant_values("locus_id2_", c.locus_id2),
+            **dict(zip(["chromosome", "start", "stop"], c.locus.__composite_values__())),
+            "clpp": c.clpp,
+            "clpa": c.clpa,
+            "len_cs1": c.len_cs1,
+            "len_cs2": c.len_cs2,
+            "len_inter": c.len_inter,
+            "source2_displayname": c.source2_displayname}
+
+
+def causal_variant_values(causal_variant: CausalVariant,
+                          colocalization_id: int,
+                          causal_variant_id: int) -> typing.Dict[str, typing.Any]:
+    """
+    Flatten a causal variant into the columns of
+    CausalVariant.columns() and the colocalization_id
+    of its parent.
+
+    :param causal_variant: causal variant
+    :param colocalization_id: id of parent colocalization
+    :param causal_variant_id: id to assign
+    :return: column name to value
+    """
+    cv = causal_variant
+    return {"colocalization_id": colocalization_id,
+            "rel": cv.rel,
+            "causal_variant_id": causal_variant_id,
+            "pip1": cv.pip1,
+            "pip2": cv.pip2,
+            "beta1": cv.beta1,
+            "beta2": cv.beta2,
+            **variant_values("variant_", cv.variant)}
+
+
+def copy_text(value) -> str:
+    """
+    Encode a value for the postgres COPY text format.
+
+    :param value: value
+    :return: encoded value
+    """
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class ColocalizationLoader(object):
+    """
+    Bulk loader for colocalizations and their causal
+    variants.
+
+    Tables are defined from Colocalization.columns() and
+    CausalVariant.columns(), the causal variant table has
+    an extra colocalization_id column referencing its
+    colocalization.  Ids are assigned by the loader
+    continuing from the largest id already in the table.
+    Rows are inserted in batches with executemany, on
+    postgres with psycopg2 COPY is used instead.
+
+    load_file commits each batch together with a
+    Checkpoint row in the checkpoint table, so a load
+    that dies can be restarted and continues where the
+    last committed batch ended with the same ids.
+    """
+
+    def __init__(self,
+                 engine,
+                 batch_size: int = 10000,
+                 colocalization_table: str = "colocalization",
+                 causal_variant_table: str = "causal_variant",
+                 checkpoint_table: str = "colocalization_checkpoint"):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.metadata = MetaData()
+        self.colocalization = Table(colocalization_table,
+                                    self.metadata,
+                                    *Colocalization.columns())
+        self.causal_variant = Table(causal_variant_table,
+                                    self.metadata,
+                                    Column('colocalization_id',
+                                           Integer,
+                                           ForeignKey('{}.colocalization_id'.format(colocalization_table)),
+                                           index=True,
+                                           nullable=False),
+                                    *CausalVariant.columns())
+        self.checkpoint = Table(checkpoint_table,
+                                self.metadata,
+                                Column('source', String(1000), primary_key=True),
+                                Column('rel', SmallInteger, nullable=False),
+                                Column('byte_offset', BigInteger, nullable=False),
+                                Column('colocalization_id', Integer, nullable=False),
+                                Column('causal_variant_id', Integer, nullable=False),
+                                Column('rows', BigInteger, nullable=False))
+
+    def create_tables(self) -> None:
+        self.metadata.create_all(self.engine)
+
+    def next_ids(self, connection) -> typing.Tuple[int, int]:
+        """
+        Next free colocalization and causal variant ids.
+
+        :param connection: connection
+        :return: tuple (colocalization_id, causal_variant_id)
+        """
+        colocalization_id = connection.execute(func.max(self.colocalization.c.colocalization_id).select()).scalar()
+        causal_variant_id = connection.execute(func.max(self.causal_variant.c.causal_variant_id).select()).scalar()
+        return (colocalization_id or 0) + 1, (causal_variant_id or 0) + 1
+
+    def rows(self,
+             colocalizations: typing.List[Colocalization],
+             colocalization_id: int,
+             causal_variant_id: int) -> typing.Tuple[typing.List[dict], typing.List[dict]]:
+        """
+        Flatten a batch of colocalizations, assigning ids
+        starting from the given values.
+
+        :param colocalizations: batch
+        :param colocalization_id: first colocalization id
+        :param causal_variant_id: first causal variant id
+        :return: colocalization rows, causal variant rows
+        """
+        colocalization_rows = []
+        causal_variant_rows = []
+        for colocalization in colocalizations:
+            colocalization_rows.append(colocalization_values(colocalization, colocalization_id))
+            for causal_variant in colocalization.variants:
+                causal_variant_rows.append(causal_variant_values(causal_variant, colocalization_id, causal_variant_id))
+                causal_variant_id += 1
+            colocalization_id += 1
+        return colocalization_rows, causal_variant_rows
+
+    def insert(self, connection, table: Table, rows: typing.List[dict]) -> None:
+        if not rows:
+            return
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+            names = [c.name for c in table.columns]
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(copy_text(row[name]) for name in names))
+                buffer.write("\n")
+            buffer.seek(0)
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert("COPY {} ({}) FROM STDIN".format(table.name, ", ".join(names)), buffer)
+            finally:
+                cursor.close()
+        else:
+            connection.execute(table.insert(), rows)
+
+    def insert_batch(self,
+                     connection,
+                     batch: typing.List[Colocalization],
+                     colocalization_id: int,
+                     causal_variant_id: int) -> typing.Tuple[int, int]:
+        """
+        Insert a batch of colocalizations.
+
+        :param connection: connection
+        :param batch: colocalizations
+        :param colocalization_id: first colocalization id
+        :param causal_variant_id: first causal variant id
+        :return: number of colocalization and causal variant rows written
+        """
+        colocalization_rows, causal_variant_rows = self.rows(batch, colocalization_id, causal_variant_id)
+        self.insert(connection, self.colocalization, colocalization_rows)
+        self.insert(connection, self.causal_variant, causal_variant_rows)
+        return len(colocalization_rows), len(causal_variant_rows)
+
+    def load(self, colocalizations: typing.Iterable[Colocalization]) -> LoadStatistics:
+        """
+        Load colocalizations in one transaction.
+
+        :param colocalizations: colocalizations e.g. from read_colocalizations
+        :return: load statistics
+        """
+        statistics = LoadStatistics()
+        start = time.perf_counter()
+        with self.engine.begin() as connection:
+            colocalization_id, causal_variant_id = self.next_ids(connection)
+            for batch in chunked(colocalizations, self.batch_size):
+                colocalization_count, causal_variant_count = self.insert_batch(connection,
+                                                                               batch,
+                                                                               colocalization_id,
+                                                                               causal_variant_id)
+                colocalization_id += colocalization_count
+                causal_variant_id += causal_variant_count
+                statistics.colocalizations += colocalization_count
+                statistics.causal_variants += causal_variant_count
+        statistics.seconds = time.perf_counter() - start
+        return statistics
+
+    def read_checkpoint(self, connection, source: str) -> typing.Optional[Checkpoint]:
+        row = connection.execute(self.checkpoint.select().where(self.checkpoint.c.source == source)).fetchone()
+        if row is None:
+            return None
+        # columns are in the order of the attributes
+        return Checkpoint(*row)
+
+    def write_checkpoint(self, connection, checkpoint: Checkpoint) -> None:
+        connection.execute(self.checkpoint.delete().where(self.checkpoint.c.source == checkpoint.source))
+        connection.execute(self.checkpoint.insert(), [attr.asdict(checkpoint)])
+
+    def clear_checkpoint(self, source: str) -> None:
+        """
+        Forget the checkpoint of a source so the next
+        load_file starts from the beginning.
+
+        :param source: name of the file
+        :return: None
+        """
+        with self.engine.begin() as connection:
+            connection.execute(self.checkpoint.delete().where(self.checkpoint.c.source == source))
+
+    def load_file(self,
+                  rel: int,
+                  path,
+                  source: typing.Optional[str] = None,
+                  delimiter: str = "\t",
+                  header: bool = True) -> LoadStatistics:
+        """
+        Load a colocalization file committing every batch
+        with a checkpoint.  If the source has a checkpoint
+        reading starts at its byte offset and ids continue
+        from it, otherwise ids continue from the largest in
+        the tables.  Loading a file whose checkpoint is at
+        the end loads nothing.
+
+        :param rel: release
+        :param path: path to a plain or gzipped file
+        :param source: name of the checkpoint, defaults to the path
+        :param delimiter: column delimiter
+        :param header: if the first line is a header to check
+        :return: load statistics of this run
+        """
+        source = str(path) if source is None else source
+        statistics = LoadStatistics()
+        start = time.perf_counter()
+        with self.engine.connect() as connection:
+            checkpoint = self.read_checkpoint(connection, source)
+            if checkpoint is None:
+                colocalization_id, causal_variant_id = self.next_ids(connection)
+                checkpoint = Checkpoint(source, rel, 0, colocalization_id - 1, causal_variant_id - 1, 0)
+            elif checkpoint.rel != rel:
+                raise ValueError("checkpoint of {} is for release {} not {}".format(source, checkpoint.rel, rel))
+        rows = read_colocalization_offsets(rel, path, checkpoint.byte_offset, delimiter, header)
+        for batch in chunked(rows, self.batch_size):
+            with self.engine.begin() as connection:
+                colocalization_count, causal_variant_count = self.insert_batch(connection,
+                                                                               [c for c, _ in batch],
+                                                                               checkpoint.colocalization_id + 1,
+                                                                               checkpoint.causal_variant_id + 1)
+                checkpoint = attr.evolve(checkpoint,
+                                         byte_offset=batch[-1][1],
+                                         colocalization_id=checkpoint.colocalization_id + colocalization_count,
+                                         causal_variant_id=checkpoint.causal_variant_id + causal_variant_count,
+                                         rows=checkpoint.rows + colocalization_count)
+                self.write_checkpoint(connection, checkpoint)
+            statistics.colocalizations += colocalization_count
+            statistics.causal_variants += causal_variant_count
+        statistics.seconds = time.perf_counter() - start
+        return statistics
+
+    def delete(self, connection, colocalization_ids: typing.List[int]) -> None:
+        """
+        Delete colocalizations and their causal variants.
+
+        :param connection: connection
+        :param colocalization_ids: ids to delete
+        :return: None
+        """
+        for ids in chunked(colocalization_ids, self.batch_size):
+            connection.execute(self.causal_variant.delete().where(self.causal_variant.c.colocalization_id.in_(ids)))
+            connection.execute(self.colocalization.delete().where(self.colocalization.c.colocalization_id.in_(ids)))
+
+    def load_changes(self, changes: typing.Iterable[Change]) -> LoadStatistics:
+        """
+        Write the difference between two releases, see
+        diff.diff, in one transaction.  Added and changed
+        rows are inserted with new ids, removed and the old
+        version of changed rows are deleted by their
+        previous_id.  Unchanged rows are left as they are.
+
+        The old release passed to diff.diff has to carry the
+        colocalization_id of the rows in the tables, rows
+        read from a file have none.  A changed or removed row
+        without a previous_id raises ValueError and nothing
+        is written.
+
+        :param changes: changes from diff.diff
+        :return: load statistics of the inserted rows
+        """
+        statistics = LoadStatistics()
+        start = time.perf_counter()
+        deleted = []
+
+        def inserted():
+            for change in changes:
+                if change.status in (CHANGED, REMOVED):
+                    if change.previous_id is None:
+                        raise ValueError("{} row without previous_id : {}".format(change.status, change.key))
+                    deleted.append(change.previous_id)
+                if change.status in (ADDED, CHANGED):
+                    yield change.colocalization
+
+        with self.engine.begin() as connection:
+            colocalization_id, causal_variant_id = self.next_ids(connection)
+            for batch in chunked(inserted(), self.batch_size):
+                colocalization_count, causal_variant_count = self.insert_batch(connection,
+                                                                               batch,
+                                                                               colocalization_id,
+                                                                               causal_variant_id)
+                colocalization_id += colocalization_count
+                causal_variant_id += causal_variant_count
+                statistics.colocalizations += colocalization_count
+                statistics.causal_variants += causal_variant_count
+            self.delete(connection, deleted)
+        statistics.seconds = time.perf_counter() - start
+        return statistics
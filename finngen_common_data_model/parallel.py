@@ -0,0 +1,118 @@
+import collections
+import concurrent.futures
+import os
+import typing
+
+from finngen_common_data_model.colocalization import Colocalization, check_header
+from finngen_common_data_model.data import GZIP_MAGIC
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def byte_ranges(path, chunk_size: int = DEFAULT_CHUNK_SIZE, header: bool = True) -> typing.List[typing.Tuple[int, int]]:
+    """
+    Split a file into contiguous (start, end) byte ranges
+    of roughly chunk_size bytes.  Every range ends on a
+    line boundary so each range can be parsed on its own.
+
+    :param path: path to an uncompressed file
+    :param chunk_size: target bytes per range
+    :param header: if the first line is a header to skip
+    :return: list of byte ranges
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk size must be positive : {}".format(chunk_size))
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = len(f.readline()) if header else 0
+        while start < size:
+            f.seek(start + chunk_size)
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_byte_range(rel: int,
+                     path,
+                     start: int,
+                     end: int,
+                     delimiter: str = "\t") -> typing.List[Colocalization]:
+    """
+    Parse the colocalizations in a byte range of a file.
+
+    :param rel: release
+    :param path: path to an uncompressed file
+    :param start: first byte of range
+    :param end: byte after the range
+    :param delimiter: column delimiter
+    :return: list of colocalizations
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    # split on newline only as byte_ranges does, splitlines also splits on e.g. \x1c
+    lines = (line.rstrip("\r") for line in text.split("\n"))
+    return [Colocalization.from_str(rel, line, delimiter) for line in lines if line]
+
+
+def parse_colocalizations(rel: int,
+                          path,
+                          workers: typing.Optional[int] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          ordered: bool = True,
+                          delimiter: str = "\t",
+                          header: bool = True) -> typing.Iterator[Colocalization]:
+    """
+    Parse a colocalization file using a pool of worker
+    processes.  The file is split into line aligned byte
+    ranges which are parsed independently.  At most two
+    ranges per worker are in flight, so memory use is
+    bounded by the chunk size rather than the file size.
+
+    Gzipped files cannot be split and are rejected, use
+    read_colocalizations for those.
+
+    :param rel: release
+    :param path: path to an uncompressed file
+    :param workers: number of processes, defaults to cpu count
+    :param chunk_size: target bytes per range
+    :param ordered: yield in file order, otherwise in completion order
+    :param delimiter: column delimiter
+    :param header: if the first line is a header to check
+    :return: iterator of colocalizations
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+    if first.startswith(GZIP_MAGIC):
+        raise ValueError("cannot split gzipped file : {}".format(path))
+    if header:
+        check_header(first.decode("utf-8").rstrip("\r\n").split(delimiter))
+
+    ranges = iter(byte_ranges(path, chunk_size, header))
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit():
+            byte_range = next(ranges, None)
+            if byte_range is None:
+                return None
+            return executor.submit(parse_byte_range, rel, path, *byte_range, delimiter)
+
+        pending = collections.deque()
+        for _ in range(2 * workers):
+            future = submit()
+            if future is not None:
+                pending.append(future)
+
+        while pending:
+            if ordered:
+                done = pending.popleft()
+            else:
+                done = next(concurrent.futures.as_completed(pending))
+                pending.remove(done)
+            future = submit()
+            if future is not None:
+                pending.append(future)
+            yield from done.result()
@@ -0,0 +1,89 @@
+import json
+import typing
+
+from finngen_common_data_model.data import JSONifiable
+
+
+class JSONEncoder(json.JSONEncoder):
+    """
+    Encoder for objects that provide a json_rep.
+    """
+
+    def default(self, o):
+        if isinstance(o, JSONifiable):
+            return o.json_rep()
+        return super().default(o)
+
+
+ENCODER = JSONEncoder(separators=(",", ":"))
+
+
+def to_json(value: typing.Any) -> str:
+    """
+    Encode a value, calling json_rep on any JSONifiable.
+
+    :param value: value
+    :return: json
+    """
+    return ENCODER.encode(value)
+
+
+def iter_ndjson(values: typing.Iterable[JSONifiable]) -> typing.Iterator[str]:
+    """
+    Newline delimited json, one line per value.  Values
+    are encoded as they are consumed, e.g. for a streamed
+    http response.
+
+    :param values: values
+    :return: iterator of lines
+    """
+    for value in values:
+        yield to_json(value) + "\n"
+
+
+def iter_json_array(values: typing.Iterable[JSONifiable]) -> typing.Iterator[str]:
+    """
+    A json array, produced one element at a time.
+
+    :param values: values
+    :return: iterator of text fragments
+    """
+    yield "["
+    for i, value in enumerate(values):
+        yield "," + to_json(value) if i else to_json(value)
+    yield "]"
+
+
+def write_ndjson(values: typing.Iterable[JSONifiable], out: typing.TextIO) -> int:
+    """
+    Write newline delimited json to a text file object,
+    e.g. a file or socket.makefile('w').
+
+    :param values: values
+    :param out: output
+    :return: number of values written
+    """
+    count = 0
+    for line in iter_ndjson(values):
+        out.write(line)
+        count += 1
+    return count
+
+
+def write_json_array(values: typing.Iterable[JSONifiable], out: typing.TextIO) -> int:
+    """
+    Write a json array to a text file object.
+
+    :param values: values
+    :param out: output
+    :return: number of values written
+    """
+    count = 0
+    out.write("[")
+    for value in values:
+        if count:
+            out.write(",")
+        out.write(to_json(value))
+        count += 1
+    out.write("]")
+    return count
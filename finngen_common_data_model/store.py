@@ -0,0 +1,296 @@
+import collections.abc
+import heapq
+import typing
+
+import numpy as np
+
+from finngen_common_data_model.colocalization import Colocalization, read_colocalizations
+from finngen_common_data_model.dictionary import DICTIONARY_FIELDS, StringDictionary, dictionary_columns
+from finngen_common_data_model.genomics import Locus
+from finngen_common_data_model.index import LocusIndex
+
+# fields with a hash index, a tuple is a composite index
+HASH_INDEXES = ("phenotype1", "phenotype2", "source1", "source2", ("phenotype1", "phenotype2"))
+
+# fields with a sorted index
+SORTED_INDEXES = ("clpp", "clpa")
+
+
+class SortedIndex(object):
+    """
+    Positions of rows ordered by a numeric column, in
+    ascending and descending order.  Equal values keep row
+    order in both.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind="stable")
+        self.descending = np.argsort(-values, kind="stable")
+        self.values = values[self.order]
+
+    def range(self, low: typing.Optional[float] = None, high: typing.Optional[float] = None) -> np.ndarray:
+        """
+        Positions of rows with low <= value <= high, in
+        value order.  The result is a view of the index.
+
+        :param low: smallest value, unbounded if None
+        :param high: largest value, unbounded if None
+        :return: positions
+        """
+        start = 0 if low is None else np.searchsorted(self.values, low, side="left")
+        stop = len(self.values) if high is None else np.searchsorted(self.values, high, side="right")
+        return self.order[start:stop]
+
+    def count(self, low: typing.Optional[float] = None, high: typing.Optional[float] = None) -> int:
+        return len(self.range(low, high))
+
+
+class QueryResult(collections.abc.Sequence):
+    """
+    Rows matching a query as positions into the store.
+    Slicing returns another result sharing the positions
+    array, colocalizations are only looked up when an
+    element is accessed.
+    """
+
+    def __init__(self, store: "ColocalizationStore", positions: np.ndarray):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QueryResult(self.store, self.positions[index])
+        return self.store.colocalizations[self.positions[index]]
+
+    def page(self, number: int, size: int) -> "QueryResult":
+        """
+        :param number: page number starting from 0
+        :param size: rows per page
+        :return: rows of the page
+        """
+        return self[number * size:(number + 1) * size]
+
+    def pages(self, size: int) -> int:
+        return -(-len(self) // size)
+
+    def to_list(self) -> typing.List[Colocalization]:
+        return list(self)
+
+
+class ColocalizationStore(object):
+    """
+    A release held in memory with indexes for filter
+    queries.
+
+    The string fields of DICTIONARY_FIELDS are held as
+    DictionaryColumns.  Hash indexes map the codes of
+    HASH_INDEXES to sorted position arrays, the other
+    equality filters compare codes.  SORTED_INDEXES map
+    clpp and clpa ranges to positions and the locus has
+    a LocusIndex.  A query intersects the position sets
+    of its filters, smallest first, range filters that
+    would select more rows than the candidates so far
+    are applied to the candidates instead.
+    """
+
+    def __init__(self,
+                 colocalizations: typing.Iterable[Colocalization],
+                 strings: typing.Optional[StringDictionary] = None):
+        self.colocalizations = list(colocalizations)
+        self.columns = {name: np.array([getattr(c, name) for c in self.colocalizations], dtype=np.float64)
+                        for name in SORTED_INDEXES}
+        self.strings = StringDictionary() if strings is None else strings
+        self.dictionary_columns = dictionary_columns(self.colocalizations, DICTIONARY_FIELDS, self.strings)
+        # code, or tuple of codes of a composite index, to positions
+        self.hash_indexes = {}
+        for fields in HASH_INDEXES:
+            positions = collections.defaultdict(list)
+            if isinstance(fields, tuple):
+                keys = zip(*[self.dictionary_columns[name].codes.tolist() for name in fields])
+            else:
+                keys = self.dictionary_columns[fields].codes.tolist()
+            for i, key in enumerate(keys):
+                positions[key].append(i)
+            self.hash_indexes[fields] = {key: np.array(p, dtype=np.int64) for key, p in positions.items()}
+        self.sorted_indexes = {name: SortedIndex(self.columns[name]) for name in SORTED_INDEXES}
+        self.locus_index = LocusIndex(c.locus for c in self.colocalizations)
+
+    @staticmethod
+    def from_file(rel: int, source, delimiter: str = "\t", header: bool = True) -> "ColocalizationStore":
+        """
+        Build a store from a colocalization file, repeated
+        strings are interned into the store dictionary.
+
+        :param rel: release
+        :param source: path or file object
+        :param delimiter: column delimiter
+        :param header: if the first line is a header to check
+        :return: store
+        """
+        strings = StringDictionary()
+        return ColocalizationStore(read_colocalizations(rel, source, delimiter, header, strings=strings), strings)
+
+    def __len__(self) -> int:
+        return len(self.colocalizations)
+
+    def lookup(self, **equal) -> typing.Optional[np.ndarray]:
+        """
+        Sorted positions of rows equal to the given values
+        using the hash indexes, None if there are no
+        equality filters.
+        """
+        equal = {name: value for name, value in equal.items() if value is not None}
+        unknown = set(equal) - {f for f in HASH_INDEXES if isinstance(f, str)}
+        if unknown:
+            raise ValueError("no hash index on : {}".format(sorted(unknown)))
+        empty = np.empty(0, dtype=np.int64)
+        equal = {name: self.strings.code(value) for name, value in equal.items()}
+        if StringDictionary.MISSING in equal.values():
+            return empty
+        candidates = []
+        for fields in HASH_INDEXES:
+            if isinstance(fields, tuple) and all(name in equal for name in fields):
+                key = tuple(equal.pop(name) for name in fields)
+                candidates.append(self.hash_indexes[fields].get(key, empty))
+        for name, code in equal.items():
+            candidates.append(self.hash_indexes[name].get(code, empty))
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        result = candidates[0]
+        for positions in candidates[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, positions, assume_unique=True)
+        return result
+
+    def select(self,
+               phenotype1: typing.Optional[str] = None,
+               phenotype2: typing.Optional[str] = None,
+               source1: typing.Optional[str] = None,
+               source2: typing.Optional[str] = None,
+               region: typing.Optional[typing.Union[str, Locus]] = None,
+               min_clpp: typing.Optional[float] = None,
+               max_clpp: typing.Optional[float] = None,
+               min_clpa: typing.Optional[float] = None,
+               max_clpa: typing.Optional[float] = None,
+               **equal) -> np.ndarray:
+        """
+        Sorted positions of the rows matching every filter
+        given.
+
+        :param phenotype1: phenotype1 equal to
+        :param phenotype2: phenotype2 equal to
+        :param source1: source1 equal to
+        :param source2: source2 equal to
+        :param region: locus overlapping a locus or region string e.g. 15:78464464-78864464
+        :param min_clpp: smallest clpp
+        :param max_clpp: largest clpp
+        :param min_clpa: smallest clpa
+        :param max_clpa: largest clpa
+        :param equal: other fields of DICTIONARY_FIELDS equal to e.g. tissue1="Liver"
+        :return: positions
+        """
+        unknown = set(equal) - set(DICTIONARY_FIELDS)
+        if unknown:
+            raise ValueError("cannot filter on : {}".format(sorted(unknown)))
+        result = self.lookup(phenotype1=phenotype1, phenotype2=phenotype2, source1=source1, source2=source2)
+        if region is not None:
+            locus = Locus.from_str(region) if isinstance(region, str) else region
+            overlap = np.array(self.locus_index.overlap_indices(locus.chromosome, locus.start, locus.stop),
+                               dtype=np.int64)
+            result = overlap if result is None else np.intersect1d(result, overlap, assume_unique=True)
+        for name, value in equal.items():
+            if value is None:
+                continue
+            column = self.dictionary_columns[name]
+            if result is None:
+                result = np.flatnonzero(column.equal(value))
+            else:
+                result = result[column.equal(value, result)]
+
+        ranges = [(name, low, high)
+                  for name, low, high in (("clpp", min_clpp, max_clpp), ("clpa", min_clpa, max_clpa))
+                  if low is not None or high is not None]
+        ranges.sort(key=lambda r: self.sorted_indexes[r[0]].count(r[1], r[2]))
+        for name, low, high in ranges:
+            index = self.sorted_indexes[name]
+            if result is None:
+                result = np.sort(index.range(low, high))
+            elif index.count(low, high) < len(result):
+                result = np.intersect1d(result, np.sort(index.range(low, high)), assume_unique=True)
+            else:
+                values = self.columns[name][result]
+                keep = np.ones(len(result), dtype=bool)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+                result = result[keep]
+        return np.arange(len(self.colocalizations)) if result is None else result
+
+    def top(self,
+            positions: np.ndarray,
+            order_by: str,
+            k: int,
+            descending: bool = True) -> np.ndarray:
+        """
+        The k positions with the largest (or smallest)
+        value of a column using a heap, ties keep row order.
+
+        :param positions: candidate positions
+        :param order_by: clpp or clpa
+        :param k: number of rows
+        :param descending: largest first
+        :return: positions
+        """
+        values = self.columns[order_by][positions].tolist()
+        if descending:
+            best = heapq.nlargest(k, range(len(values)), key=lambda i: (values[i], -i))
+        else:
+            best = heapq.nsmallest(k, range(len(values)), key=lambda i: (values[i], i))
+        return positions[np.array(best, dtype=np.int64)]
+
+    def order(self, positions: np.ndarray, order_by: str, descending: bool = True) -> np.ndarray:
+        values = self.columns[order_by][positions]
+        order = np.lexsort((np.arange(len(values)), -values if descending else values))
+        return positions[order]
+
+    def query(self,
+              order_by: typing.Optional[str] = None,
+              descending: bool = True,
+              limit: typing.Optional[int] = None,
+              offset: int = 0,
+              **filters) -> QueryResult:
+        """
+        Rows matching the filters of select, optionally
+        ordered by clpp or clpa.  With a limit only the top
+        offset + limit rows are ordered.
+
+        e.g. query(phenotype1="X", min_clpp=0.1, order_by="clpa", limit=50)
+
+        :param order_by: clpp, clpa or None for row order
+        :param descending: largest first
+        :param limit: number of rows
+        :param offset: rows to skip
+        :param filters: arguments of select
+        :return: result
+        """
+        if order_by is not None and order_by not in SORTED_INDEXES:
+            raise ValueError("cannot order by : {}".format(order_by))
+        if order_by is not None and not any(value is not None for value in filters.values()):
+            # the sorted index is already in order
+            index = self.sorted_indexes[order_by]
+            positions = index.descending if descending else index.order
+        else:
+            positions = self.select(**filters)
+            if order_by is not None and limit is not None:
+                positions = self.top(positions, order_by, offset + limit, descending)
+            elif order_by is not None:
+                positions = self.order(positions, order_by, descending)
+        result = QueryResult(self, positions)
+        end = None if limit is None else offset + limit
+        return result[offset:end] if offset or end is not None else result
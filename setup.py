@@ -10,11 +10,13 @@ setup(name='finngen_common_data_model',
       url='https://github.com/FINNGEN/finngen-common-data-model',
       package_dir={ 'finngen_common_data_model': 'finngen_common_data_model' },
       tests_require=['pytest', 'tox', 'pytest-cov', ],
-      install_requires=[ 'attrs>=19.3.0',
+      install_requires=[ 'attrs>=21.3.0',
+                         'numpy>=1.17',
                          'SQLAlchemy>=1.3.18',
                          'pytest>=5.4.3' ],
       extras_require={
           'dev': ['pytest>=6.1.2', 'pytest-cov>=2.10.1', ],
+          'arrow': ['pyarrow>=7.0.0', ],
       }
 
 )
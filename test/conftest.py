@@ -0,0 +1,64 @@
+"""
+Sample colocalization rows shared by the tests, import
+them with `from conftest import ...`.
+"""
+import gzip
+
+from finngen_common_data_model.colocalization import Colocalization
+
+rel = 123
+
+sample_row = ["source1", "source2",
+              "phenotype1", "phenotype1_description",
+              "phenotype2", "phenotype2_description",
+              "", "",
+              "tissue1", "tissue2",
+              "1_2_C_A", "3_4_C_A",
+              "7", "8", "9",
+              "10.0", "11.0",
+              "",
+              "1", "2", "3",
+              "1_1_A_A,0.02,0.19",
+              "1_1_G_A,0.01,0.19",
+              "source2_displayname"]
+
+
+def sample_line(**columns):
+    """
+    sample_row with some columns replaced, by import column
+    name e.g. sample_line(pheno1="a", clpp=0.5).  None is
+    written as the empty string.
+    """
+    names = Colocalization.cvs_column_names()
+    row = list(sample_row)
+    for name, value in columns.items():
+        row[names.index(name)] = "" if value is None else str(value)
+    return row
+
+
+def sample_colocalization(rel=rel, colocalization_id=None, lazy=False, compact=False, **columns):
+    """
+    Colocalization of sample_line(**columns).
+    """
+    return Colocalization.from_list(rel,
+                                    sample_line(**columns),
+                                    colocalization_id=colocalization_id,
+                                    lazy=lazy,
+                                    compact=compact)
+
+
+def write_sample_file(path, rows=3, line=lambda i: sample_row):
+    """
+    Write a header and rows lines, gzipped if path ends in .gz.
+
+    :param path: path
+    :param rows: number of rows
+    :param line: function from row number to row
+    :return: path
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt") as f:
+        f.write("\t".join(Colocalization.cvs_column_names()) + "\n")
+        for i in range(rows):
+            f.write("\t".join(line(i)) + "\n")
+    return path
@@ -0,0 +1,56 @@
+import numpy as np
+
+from finngen_common_data_model.analytics import causal_variant_columns, colocalization_statistics, group_statistics
+from finngen_common_data_model.colocalization import Colocalization
+
+from conftest import rel, sample_line
+
+
+def sample(phenotype, clpp, vars1_info, vars2_info, **kwargs):
+    row = sample_line(pheno1=phenotype, clpp=clpp, vars1_info=vars1_info, vars2_info=vars2_info)
+    return Colocalization.from_list(rel, row, **kwargs)
+
+
+colocalizations = [sample("a", 0.1, "1_1_A_G,0.5,0.1;1_2_A_G,0.25,0.1", "1_2_A_G,0.75,0.1"),
+                   sample("a", 0.3, "1_3_A_G,0.1,0.1", "1_4_A_G,0.2,0.1;1_5_A_G,0.3,0.1", lazy=True),
+                   sample("b", 0.2, "1_6_A_G,0.9,0.1", "1_6_A_G,0.8,0.1", compact=True)]
+
+
+def test_causal_variant_columns():
+    columns = causal_variant_columns(colocalizations)
+    assert list(columns["owner"]) == [0, 0, 1, 1, 1, 2]
+    assert list(columns["membership"]) == [1, 3, 1, 2, 2, 3]
+    assert np.isnan(columns["pip2"][0])
+
+
+def test_colocalization_statistics():
+    actual = colocalization_statistics(colocalizations)
+    assert not colocalizations[1].variants.is_decoded()
+    for i, c in enumerate(colocalizations):
+        expected = c.json_rep()
+        assert actual["cs_size_1"][i] == expected["cs_size_1"]
+        assert actual["cs_size_2"][i] == expected["cs_size_2"]
+        assert actual["cs_size"][i] == expected["cs_size"]
+        labels = [v["membership_cs"] for v in expected["variants"]]
+        assert [actual[name][i] for name in ["count_none", "count_cs1", "count_cs2", "count_both"]] == \
+               [labels.count(label) for label in ["None", "CS1", "CS2", "Both"]]
+    assert list(actual["max_pip1"]) == [0.5, 0.1, 0.9]
+    assert list(actual["max_pip2"]) == [0.75, 0.3, 0.8]
+
+
+def test_group_statistics():
+    actual = group_statistics(colocalizations, by=["phenotype1"], quantiles=[0, 0.5, 1])
+    assert list(actual["phenotype1"]) == ["a", "b"]
+    assert list(actual["count"]) == [2, 1]
+    assert list(actual["cs_size"]) == [5, 1]
+    assert list(actual["count_both"]) == [1, 1]
+    assert list(actual["max_pip1"]) == [0.5, 0.9]
+    assert np.allclose(actual["clpp_q0.5"], [0.2, 0.2])
+    assert np.allclose(actual["pip2_q0.5"], [np.median([0.75, 0.2, 0.3]), 0.8])
+    assert np.allclose(actual["pip1_q1"], [0.5, 0.9])
+
+
+def test_group_statistics_empty():
+    actual = group_statistics([])
+    assert len(actual["count"]) == 0
+    assert len(actual["clpp_q0.5"]) == 0
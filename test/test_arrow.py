@@ -0,0 +1,40 @@
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from finngen_common_data_model.arrow import from_arrow, read_colocalizations_parquet, read_parquet, to_arrow, \
+    write_parquet
+
+from conftest import sample_colocalization
+
+
+def sample(chromosome, start, stop, clpp):
+    return sample_colocalization(colocalization_id=start, chrom=chromosome, start=start, stop=stop, clpp=clpp)
+
+
+colocalizations = [sample(1, 100 * i, 100 * i + 50, i / 10) for i in range(10)] + [sample(2, 10, 20, 0.5)]
+
+
+def test_arrow_round_trip():
+    table = to_arrow(colocalizations)
+    assert table.num_rows == len(colocalizations)
+    assert table.column("variants")[0].as_py()[0]["variant_ref"] == "A"
+    assert list(from_arrow(table)) == colocalizations
+
+
+def test_parquet_region(tmp_path):
+    path = tmp_path / "colocalization.parquet"
+    write_parquet(colocalizations, path, row_group_size=2)
+    assert pq.ParquetFile(path).num_row_groups == 6
+    actual = list(read_colocalizations_parquet(path, region="1:220-310"))
+    assert [c.colocalization_id for c in actual] == [200, 300]
+    actual = list(read_colocalizations_parquet(path, min_clpp=0.75))
+    assert [c.colocalization_id for c in actual] == [800, 900]
+
+
+def test_parquet_projection(tmp_path):
+    path = tmp_path / "colocalization.parquet"
+    write_parquet(colocalizations, path)
+    table = read_parquet(path, columns=["chromosome", "start", "stop", "clpp"], region="2:1-100")
+    assert table.column_names == ["chromosome", "start", "stop", "clpp"]
+    assert table.to_pylist() == [{"chromosome": 2, "start": 10, "stop": 20, "clpp": 0.5}]
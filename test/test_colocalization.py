@@ -1,11 +1,15 @@
 from finngen_common_data_model.genomics import Locus, Variant
 import attr
+import pytest
 import uuid
 from finngen_common_data_model.colocalization import Colocalization as BaseColocalization, \
-    CausalVariant as BaseCausalVariant
+    CausalVariant as BaseCausalVariant, ColocalizationMethods, CredibleSet, SlottedCausalVariant, SlottedColocalization, read_colocalizations, \
+    read_colocalization_chunks, read_colocalization_offsets, read_colocalization_records, to_slotted
+from finngen_common_data_model.genomics import SlottedVariant
+from finngen_common_data_model.serialize import to_json
 from finngen_common_data_model.genomics import Locus, Variant
 
-rel = 123
+from conftest import rel, sample_row, write_sample_file
 
 @attr.s(frozen=True, slots=True)
 class Colocalization(BaseColocalization):
@@ -417,3 +421,146 @@ def test_colocalization_1():
 #     sample = "\t".join(map(str,sample))
 #     actual = Colocalization.from_str(sample)
 #     assert expected == actual
+
+
+def test_read_colocalizations(tmp_path):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz")
+    actual = list(read_colocalizations(rel, path))
+    expected = BaseColocalization.from_list(rel, sample_row)
+    assert actual == [expected] * 3
+
+
+def test_read_colocalization_chunks(tmp_path):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz", rows=5)
+    actual = list(map(len, read_colocalization_chunks(rel, path, 2)))
+    assert actual == [2, 2, 1]
+
+
+def test_read_colocalizations_bad_header(tmp_path):
+    path = tmp_path / "colocalization.tsv"
+    path.write_text("source1\tsource2\n")
+    with pytest.raises(ValueError):
+        list(read_colocalizations(rel, path))
+
+
+def test_colocalization_decoder_column_order():
+    columns = list(reversed(BaseColocalization.cvs_column_names()))
+    decoder = BaseColocalization.decoder(columns)
+    actual = BaseColocalization.from_list(rel, list(reversed(sample_row)), decoder=decoder)
+    assert actual == BaseColocalization.from_list(rel, sample_row)
+
+
+def test_causal_variant_from_row():
+    decoder = BaseCausalVariant.decoder(["pip2", "beta2", "variant", "pip1", "beta1"])
+    actual = BaseCausalVariant.from_row(rel, ["0.1", "", "1_2_A_G", "", "0.3"], decoder)
+    expected = BaseCausalVariant(rel, None, 0.3, 0.1, None, None, Variant.from_str("1:2:A:G"))
+    assert expected == actual
+    with pytest.raises(ValueError):
+        BaseCausalVariant.from_row(rel, ["0.1", "", "1_2_A_G", "NA", "0.3"], decoder)
+
+
+def test_colocalization_lazy():
+    row = sample_row[:21] + ["1_1_A_A,0.02,0.19;1_1_T_A,0.02,0.19", "1_1_G_A,0.01,0.19;1_1_T_A,0.02,0.19"] + sample_row[23:]
+    eager = BaseColocalization.from_list(rel, row)
+    lazy = BaseColocalization.from_list(rel, row, lazy=True)
+    assert not lazy.variants.is_decoded()
+    assert (lazy.variants.cs_size_1(), lazy.variants.cs_size_2(), len(lazy.variants)) == (2, 2, 3)
+    assert not lazy.variants.is_decoded()
+    assert lazy == eager
+    assert lazy.variants.is_decoded()
+    assert lazy.json_rep() == eager.json_rep()
+    assert lazy.kwargs_rep() == eager.kwargs_rep()
+    assert lazy.variants[0] is lazy.variants[0]
+
+
+def test_read_colocalizations_lazy(tmp_path):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz")
+    actual = list(read_colocalizations(rel, path, lazy=True))
+    assert all(not c.variants.is_decoded() for c in actual)
+    assert actual == list(read_colocalizations(rel, path))
+
+
+def test_colocalization_projection():
+    projection = BaseColocalization.projection(["stop", "chrom", "start", "clpp"])
+    assert projection.record.__name__ == "ColocalizationRecord"
+    assert BaseColocalization.decoder().record.__name__ == "Record"
+    record = projection.decode_record(sample_row)
+    assert record == (7, 8, 9, 10.0)
+    assert (record.chrom, record.start, record.stop, record.clpp) == (7, 8, 9, 10.0)
+    # columns after clpp are never decoded
+    assert projection.decode_str("\t".join(sample_row[:16] + ["not a number"])) == record
+
+
+def test_read_colocalization_records(tmp_path):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz")
+    actual = list(read_colocalization_records(path, ["pheno1", "clpa"]))
+    assert [(r.pheno1, r.clpa) for r in actual] == [("phenotype1", 11.0)] * 3
+
+
+def test_to_slotted():
+    import pickle
+    colocalization = BaseColocalization.from_list(rel, sample_row)
+    slotted = to_slotted(colocalization)
+    assert type(slotted) is SlottedColocalization
+    assert type(slotted.locus_id1) is SlottedVariant
+    assert type(slotted.variants[0]) is SlottedCausalVariant
+    assert type(slotted.variants[0].variant) is SlottedVariant
+    for value in (slotted, slotted.locus, slotted.locus_id1, slotted.variants[0]):
+        assert not hasattr(value, "__dict__")
+        assert type(value).__dictoffset__ == 0
+    assert not isinstance(slotted, BaseColocalization)
+    assert isinstance(slotted, ColocalizationMethods)
+    attr.validate(slotted)
+    assert to_json(slotted) == to_json(colocalization)
+    assert slotted.kwargs_rep()["clpp"] == colocalization.clpp
+    assert pickle.loads(pickle.dumps(slotted)) == slotted
+
+
+def test_slotted_variant_shared():
+    variant = Variant.from_str("1_2_A_G")
+    memo = {}
+    first, second = to_slotted([variant, variant], memo)
+    assert first is second
+    assert hash(first) == hash(to_slotted(variant))
+    assert first.__composite_values__() == variant.__composite_values__()
+
+
+def test_causal_variant_composite_values():
+    causal_variant = causal_variants[0]
+    assert causal_variant.__composite_values__() == (causal_variant.variant, 0.1, 0.2, 0.11, 0.22)
+
+
+def test_credible_set():
+    credible_set = CredibleSet.from_causal_variants([BaseCausalVariant(**c.kwargs_rep()) for c in causal_variants[:1]] +
+                                                    [BaseCausalVariant(1, None, None, 0.2, 0.22, 5, Variant.from_str("1_2_A_G")),
+                                                     BaseCausalVariant(1, None, None, None, None, None, Variant.from_str("1_3_A_G"))])
+    assert list(credible_set.has_cs1()) == [True, False, False]
+    assert list(credible_set.has_cs2()) == [True, True, False]
+    assert list(credible_set.count_cs()) == [2, 1, 0]
+    assert list(credible_set.membership_cs()) == ['Both', 'CS2', 'None']
+    assert (credible_set.cs_size_1(), credible_set.cs_size_2(), len(credible_set)) == (1, 2, 3)
+    assert [c.causal_variant_id for c in credible_set] == [None, 5, None]
+    assert credible_set[-1] == BaseCausalVariant(1, None, None, None, None, None, Variant.from_str("1_3_A_G"))
+    assert credible_set[1:].to_list() == list(credible_set)[1:]
+    with pytest.raises(ValueError):
+        CredibleSet.from_causal_variants([causal_variants[0], causal_variants[1]])
+
+
+def test_colocalization_compact():
+    row = sample_row[:21] + ["1_1_A_A,0.02,0.19;1_1_T_A,0.02,0.19", "1_1_G_A,0.01,0.19;1_1_T_A,0.02,0.19"] + sample_row[23:]
+    eager = BaseColocalization.from_list(rel, row)
+    compact = BaseColocalization.from_list(rel, row, compact=True)
+    assert isinstance(compact.variants, CredibleSet)
+    assert list(compact.variants.membership_cs()) == [c.membership_cs() for c in eager.variants]
+    assert compact == eager
+    assert compact.json_rep() == eager.json_rep()
+    assert CredibleSet.from_causal_variants(eager.variants) == compact.variants
+
+
+def test_read_colocalization_offsets(tmp_path):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz")
+    actual = list(read_colocalization_offsets(rel, path))
+    assert [c for c, _ in actual] == list(read_colocalizations(rel, path))
+    # restarting at an offset skips the rows before it
+    resumed = list(read_colocalization_offsets(rel, path, actual[0][1]))
+    assert resumed == actual[1:]
@@ -1,3 +1,5 @@
+import pytest
+
 from finngen_common_data_model.data import *
 
 
@@ -11,9 +13,99 @@ def test_ascii():
     assert only_ascii("") == ""
     assert only_ascii("na") == "na"
     assert only_ascii("AlzheimerÕs disease") == "Alzheimers disease"
+    assert only_ascii("é\udc80😀a") == "a"
+
+
+def test_ascii_column():
+    memo = {}
+    values = ["AlzheimerÕs disease", None, "AlzheimerÕs disease", "asthma"]
+    actual = only_ascii_column(values, memo)
+    assert actual == ["Alzheimers disease", None, "Alzheimers disease", "asthma"]
+    assert actual[0] is actual[2]
+    assert only_ascii_column(["AlzheimerÕs disease"], memo)[0] is actual[0]
 
 
 def test_nvl():
     assert nvl(None, id) is None
     assert nvl("", int) is None
     assert nvl("1", int) == 1
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_open_text(tmp_path):
+    import gzip
+    plain = tmp_path / "plain.tsv"
+    plain.write_text("a\tb\n")
+    compressed = tmp_path / "compressed.tsv.gz"
+    with gzip.open(compressed, "wt") as f:
+        f.write("a\tb\n")
+    for path in [plain, compressed, str(compressed)]:
+        with open_text(path) as f:
+            assert f.read() == "a\tb\n"
+    with open(compressed, "rb") as raw:
+        with open_text(raw) as f:
+            assert f.read() == "a\tb\n"
+        assert not raw.closed
+
+
+def test_trusted():
+    from finngen_common_data_model.genomics import Locus
+    with pytest.raises(ValueError):
+        Locus(chromosome=30, start=2, stop=10)
+    with trusted():
+        locus = Locus(chromosome=30, start=2, stop=10)
+        with pytest.raises(ValueError):
+            validate(locus)
+    with pytest.raises(ValueError):
+        Locus(chromosome=30, start=2, stop=10)
+
+
+def test_validate_sample():
+    from finngen_common_data_model.genomics import Locus
+    with trusted(sample=2):
+        with pytest.raises(ValueError):
+            validate_sample(Locus(chromosome=30, start=2, stop=10))
+        validate_sample(Locus(chromosome=30, start=2, stop=10))
+        with pytest.raises(ValueError):
+            validate_sample([Locus(chromosome=1, start=2, stop=10), Locus(chromosome=30, start=2, stop=10)])
+    # outside of a trusted block nothing is sampled
+    assert validate_sample(1) == 1
+    with trusted(sample=1):
+        with pytest.raises(ValueError):
+            validate_sample(Locus(chromosome=30, start=2, stop=10))
+    for sample in (0, -1):
+        with pytest.raises(ValueError):
+            with trusted(sample=sample):
+                pass
+
+
+def test_compile_converter():
+    for value in [None, "", "NA", "na", "1"]:
+        assert compile_converter(str)(value) == nvl(value, str)
+        assert compile_converter(str, NA)(value) == nvl(value, na(str))
+    assert compile_converter(float, REQUIRED) is float
+
+
+def test_row_decoder():
+    schema = (("a", int, NA), ("b", None, NULL), ("c", str, NULL))
+    assert RowDecoder(schema).decode(["1", "x", ""]) == [1, None]
+    decoder = RowDecoder(schema, ["c", "a"])
+    assert decoder.fields == ["a", "c"]
+    assert decoder.decode(["c", "NA"]) == [None, "c"]
+    with pytest.raises(ValueError):
+        RowDecoder(schema, ["a"])
+
+
+def test_row_decoder_fields():
+    schema = (("a", int, NA), ("b", None, NULL), ("c", str, NULL), ("d", int, NULL))
+    decoder = RowDecoder(schema, fields=["c", "a"])
+    assert decoder.fields == ["a", "c"]
+    assert decoder.size == 3
+    record = decoder.decode_str("1\tx\ty\tnot an int")
+    assert (record.a, record.c) == (1, "y")
+    with pytest.raises(ValueError):
+        RowDecoder(schema, fields=["b"])
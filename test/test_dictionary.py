@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+
+from finngen_common_data_model.colocalization import Colocalization, read_colocalizations
+from finngen_common_data_model.dictionary import DICTIONARY_FIELDS, DictionaryColumn, StringDictionary, dictionary_columns
+
+from conftest import rel, sample_line
+
+sample_row = sample_line(quant1="quant1", quant2="quant2")
+
+
+def test_string_dictionary():
+    strings = StringDictionary(["a", "b", "a"])
+    assert len(strings) == 2
+    assert strings.encode("c") == 2
+    assert strings.code("a") == 0
+    assert strings.code("missing") == StringDictionary.MISSING
+    assert strings.decode(1) == "b"
+    assert strings.decode(StringDictionary.MISSING) is None
+    value = "".join(["a", "b"])
+    assert strings.intern(value) is value
+    assert strings.intern("".join(["a", "b"])) is value
+    assert strings.intern(None) is None
+
+
+def test_interning():
+    calls = []
+    strings = StringDictionary()
+    convert = strings.interning(lambda value: calls.append(value) or value.upper())
+    assert [convert(v) for v in ["x", "y", "x"]] == ["X", "Y", "X"]
+    assert calls == ["x", "y"]
+    assert len(strings) == 2
+
+
+def test_dictionary_column():
+    column = DictionaryColumn.from_values(["a", None, "b", "a"])
+    assert len(column) == 4
+    assert column.to_list() == ["a", None, "b", "a"]
+    assert column[1] is None
+    assert column.equal("a").tolist() == [True, False, False, True]
+    assert column.equal(None).tolist() == [False, True, False, False]
+    assert not column.equal("missing").any()
+    assert column.equal("a", np.array([2, 3])).tolist() == [False, True]
+    assert column.isin(["b", "missing", None]).tolist() == [False, True, True, False]
+
+
+def test_decoder_interns():
+    strings = StringDictionary()
+    decoder = Colocalization.decoder(strings=strings)
+    first = Colocalization.from_str(rel, "\t".join(sample_row), decoder=decoder)
+    second = Colocalization.from_str(rel, "\t".join(sample_row), decoder=decoder)
+    assert first == Colocalization.from_list(rel, sample_row)
+    assert first.phenotype1_description is second.phenotype1_description
+    assert first.tissue2 is second.tissue2
+    assert "phenotype1_description" in strings
+    assert "1_1_A_A,0.02,0.19" not in strings
+    for field in DICTIONARY_FIELDS:
+        assert getattr(first, field) is getattr(second, field)
+
+
+def test_read_colocalizations_strings():
+    text = "\t".join(Colocalization.cvs_column_names()) + "\n" + ("\t".join(sample_row) + "\n") * 3
+    strings = StringDictionary()
+    actual = list(read_colocalizations(rel, io.StringIO(text), strings=strings))
+    assert actual == list(read_colocalizations(rel, io.StringIO(text)))
+    assert actual[0].source2_displayname is actual[2].source2_displayname
+    columns = dictionary_columns(actual, dictionary=strings)
+    assert columns["quant1"].to_list() == ["quant1"] * 3
+    assert columns["source1"].codes.tolist() == [strings.code("source1")] * 3
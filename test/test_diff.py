@@ -0,0 +1,74 @@
+import attr
+import pytest
+from sqlalchemy import create_engine
+
+from finngen_common_data_model.diff import ADDED, CHANGED, REMOVED, UNCHANGED, diff, fingerprint, summary
+from finngen_common_data_model.loader import ColocalizationLoader
+
+from conftest import rel, sample_colocalization
+
+
+def sample(phenotype, clpp="10.0", rel=rel, colocalization_id=None, **kwargs):
+    return sample_colocalization(rel, colocalization_id, pheno1=phenotype, clpp=clpp, **kwargs)
+
+
+def test_fingerprint():
+    colocalization = sample("a")
+    assert len(fingerprint(colocalization)) == 16
+    # rel, ids and variant order are not content
+    other = attr.evolve(sample("a", rel=rel + 1, colocalization_id=5),
+                        variants=list(reversed(colocalization.variants)))
+    assert fingerprint(other) == fingerprint(colocalization)
+    assert fingerprint(sample("a", lazy=True)) == fingerprint(colocalization)
+    assert fingerprint(sample("a", compact=True)) == fingerprint(colocalization)
+    assert fingerprint(sample("a", clpp="10.5")) != fingerprint(colocalization)
+    changed = attr.evolve(colocalization, variants=[attr.evolve(colocalization.variants[0], pip2=0.5),
+                                                    colocalization.variants[1]])
+    assert fingerprint(changed) != fingerprint(colocalization)
+
+
+def test_diff():
+    old = [sample("a", colocalization_id=1), sample("b", colocalization_id=2), sample("c", colocalization_id=3)]
+    new = [sample("d", rel=rel + 1), sample("b", clpp="0.5", rel=rel + 1), sample("a", rel=rel + 1)]
+    changes = list(diff(old, new))
+    assert [(c.status, c.key[2], c.previous_id) for c in changes] == [(ADDED, "d", None),
+                                                                      (CHANGED, "b", 2),
+                                                                      (UNCHANGED, "a", 1),
+                                                                      (REMOVED, "c", 3)]
+    assert changes[1].colocalization is new[1]
+    assert summary(changes) == {UNCHANGED: 1, CHANGED: 1, ADDED: 1, REMOVED: 1}
+
+
+def test_load_changes():
+    engine = create_engine("sqlite://")
+    loader = ColocalizationLoader(engine)
+    loader.create_tables()
+    loader.load([sample("a"), sample("b"), sample("c")])
+    old = [sample("a", colocalization_id=1), sample("b", colocalization_id=2), sample("c", colocalization_id=3)]
+    new = [sample("d", rel=rel + 1), sample("b", clpp="0.5", rel=rel + 1), sample("a", rel=rel + 1)]
+    statistics = loader.load_changes(diff(old, new))
+    assert statistics.colocalizations == 2
+    with engine.connect() as connection:
+        rows = connection.execute(loader.colocalization.select()
+                                  .order_by(loader.colocalization.c.colocalization_id)).fetchall()
+        assert [(row.colocalization_id, row.phenotype1, row.clpp) for row in rows] == [(1, "a", 10.0),
+                                                                                       (4, "d", 10.0),
+                                                                                       (5, "b", 0.5)]
+        variants = connection.execute(loader.causal_variant.select()).fetchall()
+        assert sorted({row.colocalization_id for row in variants}) == [1, 4, 5]
+
+
+def test_load_changes_without_ids():
+    engine = create_engine("sqlite://")
+    loader = ColocalizationLoader(engine)
+    loader.create_tables()
+    loader.load([sample("a"), sample("b")])
+    old = [sample("a"), sample("b")]
+    new = [sample("a", rel=rel + 1), sample("b", clpp="0.5", rel=rel + 1), sample("c", rel=rel + 1)]
+    with pytest.raises(ValueError):
+        loader.load_changes(diff(old, new))
+    with engine.connect() as connection:
+        rows = connection.execute(loader.colocalization.select()
+                                  .order_by(loader.colocalization.c.colocalization_id)).fetchall()
+        assert [(row.colocalization_id, row.phenotype1, row.clpp) for row in rows] == [(1, "a", 10.0),
+                                                                                       (2, "b", 10.0)]
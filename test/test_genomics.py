@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 
-from finngen_common_data_model.genomics import Locus, Variant
+from finngen_common_data_model.genomics import Locus, Variant, VariantArray, VariantKeyTable, interned_variants, \
+    variant_interning_info
 
 
 def test_locus_bad_chromosome():
@@ -119,3 +121,135 @@ def test_normalize_str():
     acutal = list(map(Variant.normalize_str, ["1:2-A-G", "10:20/A/G", "3:4:C:A", "3:4:C:G", "1:2:A:A"]))
     expected = ["1:2:A:G", "10:20:A:G", "3:4:C:A", "3:4:C:G", "1:2:A:A"]
     assert acutal == expected
+
+
+def test_variant_from_strs():
+    actual = Variant.from_strs(["1:2:A:G", "chr3_4_C_A", "1_2_A/G", "chr9_96792507_T_<INS:ME:ALU>", "78864464"])
+    expected = list(map(Variant.from_str, ["1:2:A:G", "3:4:C:A", "1:2:A:G", "9:96792507:T:<INS:ME:ALU>"]))
+    assert actual[:4] == expected
+    assert isinstance(actual[4], Exception)
+
+
+def test_variant_fast_path_fallback():
+    # inputs the split fast path rejects must still behave like PARSER
+    assert Variant.from_fragments("chr1:2:A:<DEL>".split(":")) is None
+    assert str(Variant.from_str("1:2:A:G\n")) == "1:2:A:G"
+    for text in ["26:2:A:G", "1:2:A:N", "1:2:A:" + "A" * 1001, "chrchr1:2:A:G", "1:a:A:G"]:
+        with pytest.raises(Exception):
+            Variant.from_str(text)
+
+
+def test_interned_variants():
+    assert variant_interning_info() is None
+    with interned_variants(maxsize=2):
+        first = Variant.from_str("1_2_A_G")
+        assert Variant.from_str("1_2_A_G") is first
+        assert variant_interning_info() == {"hits": 1, "misses": 1, "maxsize": 2, "size": 1}
+        Variant.from_str("1_3_A_G")
+        Variant.from_str("1_4_A_G")
+        assert Variant.from_str("1_2_A_G") is not first
+        assert Variant.from_str("1_2_A_G") == first
+        with pytest.raises(Exception):
+            Variant.from_str("78864464")
+    assert variant_interning_info() is None
+
+
+variant_strs = ["1:2:A:G", "10:20:A:G", "3:4:C:A", "3:4:C:G", "1:2:A:A", "3:4:C:A", "X:5:<DEL>:T"]
+
+
+def test_variant_array_from_strs():
+    array = VariantArray.from_strs(variant_strs)
+    assert len(array) == len(variant_strs)
+    assert array.to_variants() == list(map(Variant.from_str, variant_strs))
+    assert VariantArray.from_variants(array).to_variants() == array.to_variants()
+    assert array[2] == Variant.from_str("3:4:C:A")
+    assert len(VariantArray.from_strs([])) == 0
+
+
+def test_variant_array_sort():
+    array = VariantArray.from_strs(variant_strs)
+    expected = sorted(map(Variant.from_str, variant_strs), key=Variant.sort_key)
+    assert array.sort().to_variants() == expected
+
+
+def test_variant_array_unique():
+    array = VariantArray.from_strs(variant_strs)
+    expected = sorted(set(map(Variant.from_str, variant_strs)), key=Variant.sort_key)
+    assert array.unique().to_variants() == expected
+
+
+def test_variant_array_lookup():
+    array = VariantArray.from_strs(variant_strs).unique()
+    queries = list(map(Variant.from_str, ["3:4:C:G", "1:2:A:C", "10:20:A:G", "1:1:T:T", "X:5:<DEL>:T"]))
+    assert array.lookup(queries).tolist() == [3, -1, 4, -1, 5]
+    assert array.searchsorted(queries).tolist() == [3, 1, 4, 0, 5]
+
+
+def test_variant_key_table_inline():
+    table = VariantKeyTable()
+    variants = list(map(Variant.from_str, ["1:2:A:G", "1:2:AC:G", "1:2:A:A", "X:3:T:C", "1:2:C:A"]))
+    keys = list(map(table.encode, variants))
+    assert table.hashed == {}
+    assert list(map(table.decode, keys)) == variants
+    assert [variant for _, variant in sorted(zip(keys, variants))] == sorted(variants, key=Variant.sort_key)
+
+
+def test_variant_key_table_hashed():
+    table = VariantKeyTable()
+    variant = Variant.from_str("chr9_96792507_T_<INS:ME:ALU>")
+    key = table.encode(variant)
+    assert key & VariantKeyTable.HASHED
+    assert table.encode(variant) == key
+    assert table.decode(key) == variant
+    with pytest.raises(KeyError):
+        VariantKeyTable().decode(key)
+
+
+def test_variant_key_table_collision():
+    table = VariantKeyTable()
+    first = Variant.from_str("1:2:ACGTAC:A")
+    key = table.encode(first)
+    # occupy the slot of a second variant to force a collision
+    second = Variant.from_str("1:2:ACGTAA:A")
+    occupied = table.encode(second)
+    table.hashed[occupied] = ("taken",)
+    del table.hashed_keys[Variant.sort_key(second)]
+    assert table.encode(second) != occupied
+    assert table.decode(table.encode(second)) == second
+    assert table.decode(key) == first
+
+
+def test_variant_key_table_array():
+    variants = VariantArray.from_strs(variant_strs)
+    table = VariantKeyTable()
+    keys = table.encode_array(variants)
+    assert keys.dtype == np.int64
+    assert keys.tolist() == list(map(table.encode, variants))
+    assert table.decode_array(keys).to_variants() == variants.to_variants()
+
+
+def test_variant_key_table_persistence(tmp_path):
+    from sqlalchemy import MetaData, Table, create_engine
+    table = VariantKeyTable()
+    variants = list(map(Variant.from_str, ["1:2:A:G", "chr9_96792507_T_<INS:ME:ALU>", "1:2:ACGTAC:A", "X:3:ACGTACG:T"]))
+    keys = list(map(table.encode, variants))
+    assert [key for key, _, _ in table.to_rows()] == sorted(k for k in keys if k & VariantKeyTable.HASHED)
+
+    table.save(tmp_path / "keys.npz")
+    assert list(map(VariantKeyTable.load(tmp_path / "keys.npz").decode, keys)) == variants
+
+    # keys as a database column with the table as a side table
+    engine = create_engine("sqlite://")
+    side = Table("variant_key", MetaData(), *VariantKeyTable.columns())
+    side.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(side.insert(), [dict(zip(["variant_key", "ref", "alt"], row)) for row in table.to_rows()])
+    with engine.connect() as connection:
+        loaded = VariantKeyTable.from_rows(connection.execute(side.select()).fetchall())
+    assert list(map(loaded.decode, keys)) == variants
+    assert loaded.encode(variants[2]) == keys[2]
+
+    with pytest.raises(ValueError):
+        VariantKeyTable.from_rows([(keys[0], "A", "G")])
+    VariantKeyTable().save(tmp_path / "empty.npz")
+    assert VariantKeyTable.load(tmp_path / "empty.npz").hashed == {}
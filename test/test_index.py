@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+from finngen_common_data_model.colocalization import read_colocalization_records
+from finngen_common_data_model.genomics import Locus, Variant
+from finngen_common_data_model.index import IntervalTree, LocusIndex, VariantIndex
+
+from conftest import sample_colocalization, sample_line, write_sample_file
+
+
+def test_interval_tree_overlap():
+    random.seed(1)
+    for n in [0, 1, 2, 7, 8, 9, 100, 1000]:
+        starts = np.array([random.randint(0, 1000) for _ in range(n)])
+        stops = starts + np.array([random.choice([0, 1, 10, 500]) for _ in range(n)])
+        tree = IntervalTree(starts, stops, np.arange(n))
+        for _ in range(20):
+            start = random.randint(0, 1500)
+            stop = start + random.randint(0, 50)
+            expected = [i for i in range(n) if starts[i] <= stop and stops[i] >= start]
+            assert sorted(tree.overlap(start, stop)) == expected
+
+
+loci = [Locus(1, 10, 20), Locus(1, 15, 30), Locus(2, 10, 20), Locus(1, 40, 50)]
+
+
+def test_locus_index_overlap():
+    index = LocusIndex(loci)
+    assert index.overlap(1, 18, 19) == [loci[0], loci[1]]
+    assert index.overlap(1, 21, 39) == [loci[1]]
+    assert index.overlap(3, 1, 100) == []
+    assert index.query("1:20-40") == [loci[0], loci[1], loci[3]]
+
+
+def test_locus_index_containment():
+    index = LocusIndex(loci, ["a", "b", "c", "d"])
+    assert index.within(1, 10, 30) == ["a", "b"]
+    assert index.containing(1, 16, 20) == ["a", "b"]
+    assert index.at(Variant(chromosome=2, position=20, reference="A", alternate="G")) == ["c"]
+
+
+def colocalization(colocalization_id, vars1_info, vars2_info, **kwargs):
+    return sample_colocalization(1, colocalization_id, vars1_info=vars1_info, vars2_info=vars2_info,
+                                 chrom=1, start=1, stop=100, clpp=0.5, clpa=0.5, **kwargs)
+
+
+variant_colocalizations = [colocalization(10, "1_5_A_G,0.5,0.1;1_6_ACGTAC_G,0.25,0.2", "1_5_A_G,0.75,0.3"),
+                           colocalization(3, "1_5_A_G,0.1,0.4", "1_7_A_T,0.2,0.5", lazy=True),
+                           colocalization(7, "1_6_ACGTAC_G,0.9,0.6", "1_8_A_T,0.8,0.7", compact=True)]
+
+
+def expected_postings(variant):
+    return sorted((c.colocalization_id, cv.pip1, cv.beta1, cv.pip2, cv.beta2)
+                  for c in variant_colocalizations for cv in c.variants if cv.variant == variant)
+
+
+def as_tuples(postings):
+    return [tuple(None if isinstance(x, float) and np.isnan(x) else x for x in p.tolist()) for p in postings]
+
+
+def test_locus_index_records(tmp_path):
+    path = write_sample_file(tmp_path / "colocalizations.tsv",
+                             rows=4,
+                             line=lambda i: sample_line(chrom=loci[i].chromosome,
+                                                        start=loci[i].start,
+                                                        stop=loci[i].stop))
+    records = list(read_colocalization_records(path, ["chrom", "start", "stop", "clpp"]))
+    index = LocusIndex.build(records)
+    assert index.overlap(1, 18, 19) == [records[0], records[1]]
+    assert index.at(Variant(chromosome=2, position=20, reference="A", alternate="G")) == [records[2]]
+
+
+def test_variant_index(tmp_path):
+    index = VariantIndex.build(variant_colocalizations, chunk_size=2)
+    assert len(index) == 4
+    assert [str(v) for v in index.variants()] == ["1:5:A:G", "1:6:ACGTAC:G", "1:7:A:T", "1:8:A:T"]
+    for variant in index.variants():
+        assert as_tuples(index.lookup(variant)) == expected_postings(variant)
+    assert list(index.colocalization_ids(Variant.from_str("1_5_A_G"))) == [3, 10]
+    assert len(index.lookup(Variant.from_str("1_5_A_C"))) == 0
+    assert len(index.lookup(Variant.from_str("1_5_ACGTAC_C"))) == 0
+
+    path = tmp_path / "variants.npz"
+    index.save(path)
+    loaded = VariantIndex.load(path)
+    for variant in index.variants():
+        assert as_tuples(loaded.lookup(variant)) == expected_postings(variant)
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from finngen_common_data_model import serialize
+from finngen_common_data_model.colocalization import Colocalization, ColocalizationMethods
+from finngen_common_data_model.genomics import Variant
+from finngen_common_data_model.instrumentation import instrumentation, instrumented
+
+from conftest import rel, sample_line, sample_row
+
+
+def test_instrumented():
+    from_list = ColocalizationMethods.__dict__["from_list"]
+    with instrumented() as statistics:
+        assert instrumentation() is statistics
+        colocalizations = [Colocalization.from_list(rel, sample_row) for _ in range(3)]
+        with pytest.raises(Exception):
+            Colocalization.from_list(rel, sample_row[:10] + ["not a variant"] + sample_row[11:])
+        Variant.from_strs(["1_1_A_G", "not a variant"])
+        assert serialize.write_ndjson(colocalizations, io.StringIO()) == 3
+    assert instrumentation() is None
+    assert ColocalizationMethods.__dict__["from_list"] is from_list
+
+    actual = statistics.as_dict()
+    assert actual["counters"] == {"rows": 3, "variants": 6, "na_values": 6, "parse_errors": 2}
+    assert actual["stages"]["colocalization_from_list"]["calls"] == 4
+    assert actual["stages"]["colocalization_from_list"]["errors"] == 1
+    # two lead and two causal variants per row, the failed locus_id1 and from_strs
+    assert actual["stages"]["variant_from_str"]["calls"] == 3 * 4 + 1 + 2
+    assert actual["stages"]["causal_variant_from_list"]["calls"] == 3
+    assert actual["stages"]["to_json"]["calls"] == 3
+    assert actual["stages"]["json_rep"]["calls"] == 3
+    assert actual["stages"]["decode"]["seconds"] > 0
+
+    text = statistics.prometheus()
+    assert '# TYPE finngen_cdm_stage_calls_total counter' in text
+    assert 'finngen_cdm_stage_calls_total{stage="to_json"} 3' in text
+    assert 'finngen_cdm_rows_total 3' in text
+
+
+def test_instrumented_lead_variants():
+    with instrumented() as statistics:
+        for _ in range(3):
+            Colocalization.from_list(rel, sample_line(locus_id1="1_5_C_A", locus_id2="1_6_C_A"))
+    actual = statistics.as_dict()
+    # locus_id1 and locus_id2 of each row besides the causal variants
+    assert actual["stages"]["variant_from_str"]["calls"] == 3 * 2 + actual["counters"]["variants"]
+    assert actual["stages"]["decode"]["calls"] == 3
+
+
+def test_instrumented_profile():
+    with instrumented(profile_every=2) as statistics:
+        for _ in range(4):
+            Colocalization.from_list(rel, sample_row)
+    assert statistics.profiled == 2
+    names = {function for _, _, function in statistics.profile_stats().stats}
+    assert "from_list" in names
+    statistics.reset()
+    assert statistics.profile_stats() is None
+    assert statistics.as_dict()["counters"]["rows"] == 0
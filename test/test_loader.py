@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine
+
+from finngen_common_data_model.colocalization import Colocalization
+from finngen_common_data_model.loader import ColocalizationLoader, copy_text
+
+from conftest import rel, sample_line, sample_row, write_sample_file
+
+
+def test_copy_text():
+    assert copy_text(None) == "\\N"
+    assert copy_text("a\tb\\c\n") == "a\\tb\\\\c\\n"
+    assert copy_text(1.5) == "1.5"
+
+
+def test_load():
+    engine = create_engine("sqlite://")
+    loader = ColocalizationLoader(engine, batch_size=2)
+    loader.create_tables()
+    colocalizations = [Colocalization.from_list(rel, sample_row) for _ in range(5)]
+    statistics = loader.load(colocalizations)
+    assert statistics.colocalizations == 5
+    assert statistics.causal_variants == 10
+    assert statistics.rows_per_second() > 0
+
+    # a second load continues the ids
+    loader.load(colocalizations[:1])
+    with engine.connect() as connection:
+        rows = connection.execute(loader.colocalization.select().order_by(loader.colocalization.c.colocalization_id)).fetchall()
+        assert [row.colocalization_id for row in rows] == [1, 2, 3, 4, 5, 6]
+        assert rows[0].locus_id1_chromosome == 1
+        assert rows[0].quant1 is None
+        assert rows[0].chromosome == 7
+        variants = connection.execute(loader.causal_variant.select().order_by(loader.causal_variant.c.causal_variant_id)).fetchall()
+        assert [row.causal_variant_id for row in variants] == list(range(1, 13))
+        assert [row.colocalization_id for row in variants[:4]] == [1, 1, 2, 2]
+        assert (variants[0].variant_ref, variants[0].pip1, variants[0].pip2) == ("A", 0.02, None)
+
+
+def table_rows(engine, loader):
+    with engine.connect() as connection:
+        colocalizations = connection.execute(loader.colocalization.select()
+                                             .order_by(loader.colocalization.c.colocalization_id)).fetchall()
+        variants = connection.execute(loader.causal_variant.select()
+                                      .order_by(loader.causal_variant.c.causal_variant_id)).fetchall()
+    return [tuple(row) for row in colocalizations], [tuple(row) for row in variants]
+
+
+def test_load_file_resume(tmp_path, monkeypatch):
+    path = write_sample_file(tmp_path / "colocalization.tsv.gz", 7, lambda i: sample_line(start=i))
+
+    expected_engine = create_engine("sqlite://")
+    expected_loader = ColocalizationLoader(expected_engine, batch_size=2)
+    expected_loader.create_tables()
+    assert expected_loader.load_file(rel, path).colocalizations == 7
+
+    engine = create_engine("sqlite://")
+    loader = ColocalizationLoader(engine, batch_size=2)
+    loader.create_tables()
+    insert_batch = loader.insert_batch
+    calls = []
+
+    def failing_insert_batch(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise IOError("connection lost")
+        return insert_batch(*args)
+
+    monkeypatch.setattr(loader, "insert_batch", failing_insert_batch)
+    with pytest.raises(IOError):
+        loader.load_file(rel, path)
+    monkeypatch.undo()
+    with engine.connect() as connection:
+        checkpoint = loader.read_checkpoint(connection, str(path))
+    assert (checkpoint.rows, checkpoint.colocalization_id, checkpoint.causal_variant_id) == (4, 4, 8)
+
+    statistics = loader.load_file(rel, path)
+    assert statistics.colocalizations == 3
+    assert table_rows(engine, loader) == table_rows(expected_engine, expected_loader)
+    start = loader.colocalization.c.keys().index("start")
+    assert [row[start] for row in table_rows(engine, loader)[0]] == list(range(7))
+    # the checkpoint is at the end of the file
+    assert loader.load_file(rel, path).colocalizations == 0
+    with pytest.raises(ValueError):
+        loader.load_file(rel + 1, path)
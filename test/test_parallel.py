@@ -0,0 +1,61 @@
+import pytest
+
+from finngen_common_data_model.colocalization import Colocalization, read_colocalizations
+from finngen_common_data_model.parallel import byte_ranges, parse_byte_range, parse_colocalizations
+
+from conftest import rel, sample_line, sample_row, write_sample_file
+
+
+def write_rows(path, rows):
+    return write_sample_file(path, rows, lambda i: sample_line(chrom=i % 22 + 1, start=i, stop=i + 1))
+
+
+def test_byte_ranges(tmp_path):
+    path = write_rows(tmp_path / "colocalization.tsv", 10)
+    ranges = byte_ranges(path, 100)
+    with open(path, "rb") as f:
+        content = f.read()
+    header_end = content.index(b"\n") + 1
+    assert ranges[0][0] == header_end
+    assert ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert content[end - 1:end] == b"\n"
+
+
+def test_parse_colocalizations_ordered(tmp_path):
+    path = write_rows(tmp_path / "colocalization.tsv", 50)
+    expected = list(read_colocalizations(rel, path))
+    actual = list(parse_colocalizations(rel, path, workers=2, chunk_size=300))
+    assert expected == actual
+
+
+def test_parse_colocalizations_unordered(tmp_path):
+    path = write_rows(tmp_path / "colocalization.tsv", 50)
+    expected = list(read_colocalizations(rel, path))
+    actual = list(parse_colocalizations(rel, path, workers=2, chunk_size=300, ordered=False))
+    assert sorted(expected, key=lambda c: c.locus.start) == sorted(actual, key=lambda c: c.locus.start)
+
+
+def test_parse_colocalizations_gzip(tmp_path):
+    import gzip
+    path = tmp_path / "colocalization.tsv.gz"
+    with gzip.open(path, "wt") as f:
+        f.write("\t".join(Colocalization.cvs_column_names()) + "\n")
+    with pytest.raises(ValueError):
+        list(parse_colocalizations(rel, path))
+
+
+def test_parse_byte_range_line_separators(tmp_path):
+    # only newline ends a row, as in read_colocalizations
+    path = tmp_path / "colocalization.tsv"
+    row = sample_row[:3] + ["a\x1cb\x0bc\x85d\u2028e"] + sample_row[4:]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("\t".join(Colocalization.cvs_column_names()) + "\r\n")
+        f.write("\t".join(row) + "\r\n")
+    expected = list(read_colocalizations(rel, path))
+    assert len(expected) == 1
+    with open(path, "rb") as f:
+        content = f.read()
+    assert parse_byte_range(rel, path, content.index(b"\n") + 1, len(content)) == expected
+    assert list(parse_colocalizations(rel, path, workers=2)) == expected
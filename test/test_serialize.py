@@ -0,0 +1,48 @@
+import io
+import json
+
+from finngen_common_data_model.colocalization import Colocalization
+from finngen_common_data_model.serialize import iter_json_array, iter_ndjson, to_json, write_json_array, \
+    write_ndjson
+
+from conftest import rel, sample_line
+
+sample_row = sample_line(vars1_info="1_1_A_A,0.02,0.19;1_1_T_A,0.02,0.19",
+                         vars2_info="1_1_G_A,0.01,0.19;1_1_T_A,0.02,0.19")
+
+
+def test_json_rep_does_not_mutate():
+    colocalization = Colocalization.from_list(rel, sample_row)
+    first = colocalization.json_rep()
+    assert first == colocalization.json_rep()
+    assert colocalization == Colocalization.from_list(rel, sample_row)
+    assert (first["cs_size_1"], first["cs_size_2"], first["cs_size"]) == (2, 2, 3)
+    assert first["locus_id1"] == "1:2:C:A"
+
+
+def test_to_json():
+    colocalization = Colocalization.from_list(rel, sample_row)
+    actual = json.loads(to_json(colocalization))
+    assert actual["locus"] == {"chromosome": 7, "start": 8, "stop": 9}
+    assert actual["variants"][0]["variant"] == "1:1:A:A"
+
+
+def test_ndjson():
+    colocalizations = [Colocalization.from_list(rel, sample_row) for _ in range(3)]
+    out = io.StringIO()
+    assert write_ndjson(colocalizations, out) == 3
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [json.loads(to_json(c)) for c in colocalizations]
+    assert "".join(iter_ndjson(colocalizations)) == out.getvalue()
+
+
+def test_json_array():
+    colocalizations = [Colocalization.from_list(rel, sample_row) for _ in range(3)]
+    out = io.StringIO()
+    assert write_json_array(colocalizations, out) == 3
+    assert len(json.loads(out.getvalue())) == 3
+    assert "".join(iter_json_array(colocalizations)) == out.getvalue()
+    assert "".join(iter_json_array([])) == "[]"
+    out = io.StringIO()
+    assert write_json_array([], out) == 0
+    assert out.getvalue() == "[]"
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from finngen_common_data_model.colocalization import Colocalization
+from finngen_common_data_model.store import ColocalizationStore
+
+from conftest import rel, sample_line
+
+
+def sample(i):
+    row = sample_line(source1="source{}".format(i % 2),
+                      pheno1="phenotype{}".format(i % 3), pheno1_description="description",
+                      pheno2="phenotype{}".format(i % 5), pheno2_description="description",
+                      chrom=1, start=100 * i, stop=100 * i + 50, clpp=(i * 7 % 20) / 20, clpa=(i * 11 % 20) / 20)
+    return Colocalization.from_list(rel, row, colocalization_id=i)
+
+
+colocalizations = [sample(i) for i in range(60)]
+store = ColocalizationStore(colocalizations)
+
+
+def scan(phenotype1=None, phenotype2=None, source1=None, min_clpp=None, max_clpa=None, region=None):
+    return [c for c in colocalizations
+            if (phenotype1 is None or c.phenotype1 == phenotype1) and
+            (phenotype2 is None or c.phenotype2 == phenotype2) and
+            (source1 is None or c.source1 == source1) and
+            (min_clpp is None or c.clpp >= min_clpp) and
+            (max_clpa is None or c.clpa <= max_clpa) and
+            (region is None or (c.locus.start <= region[1] and c.locus.stop >= region[0]))]
+
+
+@pytest.mark.parametrize("filters", [{},
+                                     {"phenotype1": "phenotype1"},
+                                     {"phenotype1": "phenotype1", "phenotype2": "phenotype2"},
+                                     {"phenotype1": "phenotype1", "source1": "source0", "min_clpp": 0.3},
+                                     {"min_clpp": 0.9},
+                                     {"min_clpp": 0.1, "max_clpa": 0.5},
+                                     {"phenotype2": "missing"},
+                                     {"phenotype1": "phenotype4"},
+                                     {"phenotype1": "phenotype1", "phenotype2": "source0"}])
+def test_select(filters):
+    assert [colocalizations[i] for i in store.select(**filters)] == scan(**filters)
+
+
+def test_hash_index_codes():
+    code = store.strings.code("phenotype1")
+    assert list(store.hash_indexes["phenotype1"][code]) == [c.colocalization_id for c in scan(phenotype1="phenotype1")]
+    key = (code, store.strings.code("phenotype2"))
+    assert len(store.hash_indexes[("phenotype1", "phenotype2")][key]) == len(scan("phenotype1", "phenotype2"))
+
+
+def test_select_region():
+    actual = [colocalizations[i] for i in store.select(region="1:420-1010", phenotype1="phenotype1")]
+    assert actual == scan(phenotype1="phenotype1", region=(420, 1010))
+    with pytest.raises(ValueError):
+        store.lookup(tissue1="tissue1")
+
+
+def test_query_top():
+    expected = sorted(scan(phenotype1="phenotype1", min_clpp=0.1), key=lambda c: -c.clpa)
+    assert store.query(phenotype1="phenotype1", min_clpp=0.1, order_by="clpa").to_list() == expected
+    assert store.query(phenotype1="phenotype1", min_clpp=0.1, order_by="clpa", limit=5).to_list() == expected[:5]
+    assert store.query(phenotype1="phenotype1", min_clpp=0.1, order_by="clpa", limit=5, offset=3).to_list() == \
+           expected[3:8]
+    expected = sorted(colocalizations, key=lambda c: c.clpp)
+    assert store.query(order_by="clpp", descending=False, limit=10).to_list() == expected[:10]
+    assert store.query(order_by="clpp", limit=10).to_list() == sorted(colocalizations, key=lambda c: -c.clpp)[:10]
+
+
+def test_query_pages():
+    result = store.query(source1="source0", order_by="clpp")
+    assert result.pages(7) == 5
+    page = result.page(1, 7)
+    assert np.shares_memory(page.positions, result.positions)
+    assert page.to_list() == result.to_list()[7:14]
+    assert len(result.page(4, 7)) == 2
+
+
+def test_select_dictionary_fields():
+    expected = scan(phenotype1="phenotype1")
+    assert [colocalizations[i] for i in store.select(phenotype1="phenotype1", tissue1="tissue1")] == expected
+    assert len(store.select(tissue2="tissue2")) == len(colocalizations)
+    assert len(store.select(phenotype1="phenotype1", tissue1="missing")) == 0
+    assert len(store.query(source2_displayname="source2_displayname", order_by="clpp", limit=5)) == 5
+    with pytest.raises(ValueError):
+        store.select(locus_id1="1_2_C_A")